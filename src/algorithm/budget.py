@@ -0,0 +1,83 @@
+import threading
+import time
+from typing import Optional
+from core.objective import ScheduleObjective
+
+
+class CancellationToken:
+    """
+    Cooperative cancellation flag shared between a running search and its supervisor.
+    Wraps any event object with set()/is_set(), so a multiprocessing.Event can be
+    passed in to cancel a search running in another process.
+    """
+
+    def __init__(self, event=None):
+        self._event = event if event is not None else threading.Event()
+
+    def cancel(self) -> None:
+        """Request the search to stop at its next budget check."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class SearchBudget:
+    """
+    Uniform stopping control for all search algorithms.
+    Combines a wall-clock limit, a limit on full objective evaluations and an
+    optional cancellation token. Evaluations are read from the objective's own
+    counter, so checking the budget is a couple of comparisons and one clock read.
+    """
+
+    def __init__(self, time_budget: Optional[float] = None, max_evaluations: Optional[int] = None,
+                 cancel_token: Optional[CancellationToken] = None):
+        """
+        Args:
+            time_budget: Maximum wall-clock seconds for the run (None for unlimited)
+            max_evaluations: Maximum objective evaluations for the run (None for unlimited)
+            cancel_token: Optional token checked for cooperative cancellation
+        """
+        if time_budget is not None and time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        if max_evaluations is not None and max_evaluations <= 0:
+            raise ValueError("max_evaluations must be positive")
+        self.time_budget = time_budget
+        self.max_evaluations = max_evaluations
+        self.cancel_token = cancel_token
+        self.objective: Optional[ScheduleObjective] = None
+        self.stop_reason: Optional[str] = None
+        self._deadline: Optional[float] = None
+        self._start_evaluations = 0
+
+    def start(self, objective: ScheduleObjective) -> None:
+        """Start counting time and evaluations for a new run."""
+        self.objective = objective
+        self.stop_reason = None
+        self._start_evaluations = objective.evaluations
+        self._deadline = time.monotonic() + self.time_budget if self.time_budget is not None else None
+
+    @property
+    def evaluations(self) -> int:
+        """Evaluations performed since start()."""
+        if self.objective is None:
+            return 0
+        return self.objective.evaluations - self._start_evaluations
+
+    def exhausted(self) -> bool:
+        """
+        Check whether the run must stop.
+
+        Returns:
+            True once any limit has been reached; stop_reason records which one
+        """
+        if self.stop_reason is not None:
+            return True
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            self.stop_reason = "max_evaluations"
+        elif self._deadline is not None and time.monotonic() >= self._deadline:
+            self.stop_reason = "time_budget"
+        elif self.cancel_token is not None and self.cancel_token.cancelled:
+            self.stop_reason = "cancelled"
+        return self.stop_reason is not None
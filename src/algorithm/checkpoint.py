@@ -0,0 +1,141 @@
+import os
+import pickle
+import tempfile
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple
+from core.models import DAY
+from core.schedule import Schedule
+
+CHECKPOINT_VERSION = 1
+
+_DAYS = list(DAY)
+
+
+# ---------- Schedule encoding ----------
+def schedule_dims(schedule: Schedule) -> Tuple[List[str], List[int], List[str]]:
+    """
+    Canonical dimensions of a schedule: day names in week order, sorted hours, room codes.
+    (Some operators shuffle schedule.days/hours in place, so the stored order is not used.)
+    """
+    days = [d.name for d in _DAYS if d in schedule._day_set]
+    return days, sorted(schedule.hours), list(schedule.classroom_codes)
+
+
+def encode_schedule(schedule: Schedule) -> bytes:
+    """
+    Encode meeting positions as packed int32 quadruples (meeting_id, day_index, hour, room_index).
+
+    Args:
+        schedule: Schedule to encode
+
+    Returns:
+        Compact byte string (16 bytes per placed meeting)
+    """
+    room_index = {code: i for i, code in enumerate(schedule.classroom_codes)}
+    flat = array("i")
+    for mid, (day, hour, room) in schedule.where_is.items():
+        flat.extend((mid, _DAYS.index(day), hour, room_index[room]))
+    return flat.tobytes()
+
+
+def decode_schedule(data: bytes, dims: Tuple[List[str], List[int], List[str]]) -> Schedule:
+    """
+    Rebuild a Schedule from encode_schedule() output.
+
+    Args:
+        data: Encoded positions
+        dims: Dimensions returned by schedule_dims() for the encoded schedule
+
+    Returns:
+        New Schedule with every meeting placed
+    """
+    day_names, hours, rooms = dims
+    schedule = Schedule([DAY[name] for name in day_names], hours, rooms)
+    flat = array("i")
+    flat.frombytes(data)
+    for k in range(0, len(flat), 4):
+        mid, day_idx, hour, room_idx = flat[k:k + 4]
+        schedule.place(mid, _DAYS[day_idx], hour, rooms[room_idx])
+    return schedule
+
+
+# ---------- Checkpoint files ----------
+class Checkpointer:
+    """
+    Periodically writes algorithm state to a binary file and reads it back on resume.
+    Writes go to a temporary file in the same directory followed by os.replace(), so a
+    crash mid-write always leaves either the previous or the new checkpoint intact.
+    """
+
+    def __init__(self, path: str, interval: float = 5.0, fsync: bool = False):
+        """
+        Args:
+            path: Checkpoint file path
+            interval: Minimum seconds between periodic saves
+            fsync: Flush to disk before renaming (survives power loss, costs a few ms)
+        """
+        if interval < 0:
+            raise ValueError("interval must be non-negative")
+        self.path = path
+        self.interval = interval
+        self.fsync = fsync
+        self.saves = 0
+        self._last_save = time.monotonic()
+
+    def due(self) -> bool:
+        """Check whether `interval` seconds have passed since the last save."""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, algorithm: str, state: Dict[str, Any]) -> None:
+        """
+        Atomically write a checkpoint.
+
+        Args:
+            algorithm: Name of the algorithm owning the state (checked on load)
+            state: Picklable state dictionary
+        """
+        payload = {"version": CHECKPOINT_VERSION, "algorithm": algorithm, "state": state}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".ckpt-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                pickle.dump(payload, file, protocol=pickle.HIGHEST_PROTOCOL)
+                if self.fsync:
+                    file.flush()
+                    os.fsync(file.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.saves += 1
+        self._last_save = time.monotonic()
+
+    def load(self, algorithm: str) -> Optional[Dict[str, Any]]:
+        """
+        Read the checkpoint if one exists.
+
+        Args:
+            algorithm: Expected algorithm name
+
+        Returns:
+            The saved state dictionary, or None when there is no checkpoint
+
+        Raises:
+            ValueError: If the checkpoint belongs to another algorithm or version
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "rb") as file:
+            payload = pickle.load(file)
+        if payload.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version in {self.path}")
+        if payload.get("algorithm") != algorithm:
+            raise ValueError(f"Checkpoint {self.path} was written by {payload.get('algorithm')}, not {algorithm}")
+        return payload["state"]
+
+    def clear(self) -> None:
+        """Remove the checkpoint file (called when a run completes)."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
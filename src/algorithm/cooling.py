@@ -0,0 +1,191 @@
+import math
+from typing import Optional
+
+
+class CoolingSchedule:
+    """
+    Base class for Simulated Annealing temperature schedules.
+    A schedule is started with an initial temperature and then asked for the
+    next temperature after every iteration.
+    """
+
+    def __init__(self, min_temp: float = 1e-3):
+        self.min_temp = min_temp
+        self.initial_temp = 0.0
+        self.step_count = 0
+
+    def start(self, initial_temp: float) -> float:
+        """
+        (Re)start the schedule from the given temperature.
+        Called once before the search and again on every reheat.
+
+        Args:
+            initial_temp: Temperature to start from
+
+        Returns:
+            The starting temperature
+        """
+        self.initial_temp = initial_temp
+        self.step_count = 0
+        return initial_temp
+
+    def next_temp(self, temp: float, accepted: bool) -> float:
+        """
+        Compute the temperature for the next iteration.
+
+        Args:
+            temp: Current temperature
+            accepted: Whether the last proposed move was accepted
+
+        Returns:
+            New temperature (never below min_temp)
+        """
+        self.step_count += 1
+        return max(self._cool(temp, accepted), self.min_temp)
+
+    def _cool(self, temp: float, accepted: bool) -> float:
+        raise NotImplementedError
+
+
+class GeometricCooling(CoolingSchedule):
+    """T(k+1) = rate * T(k)."""
+
+    def __init__(self, rate: float = 0.99, min_temp: float = 1e-3):
+        super().__init__(min_temp)
+        if not 0 < rate < 1:
+            raise ValueError("rate must be in (0, 1)")
+        self.rate = rate
+
+    def _cool(self, temp: float, accepted: bool) -> float:
+        return temp * self.rate
+
+
+class LinearCooling(CoolingSchedule):
+    """T(k) = T0 - k * decrement."""
+
+    def __init__(self, decrement: float = 0.1, min_temp: float = 1e-3):
+        super().__init__(min_temp)
+        if decrement <= 0:
+            raise ValueError("decrement must be positive")
+        self.decrement = decrement
+
+    def _cool(self, temp: float, accepted: bool) -> float:
+        return self.initial_temp - self.step_count * self.decrement
+
+
+class LogarithmicCooling(CoolingSchedule):
+    """T(k) = T0 / (1 + c * ln(1 + k))."""
+
+    def __init__(self, c: float = 1.0, min_temp: float = 1e-3):
+        super().__init__(min_temp)
+        if c <= 0:
+            raise ValueError("c must be positive")
+        self.c = c
+
+    def _cool(self, temp: float, accepted: bool) -> float:
+        return self.initial_temp / (1 + self.c * math.log(1 + self.step_count))
+
+
+class LundyMeesCooling(CoolingSchedule):
+    """T(k+1) = T(k) / (1 + beta * T(k))."""
+
+    def __init__(self, beta: float = 1e-3, min_temp: float = 1e-3):
+        super().__init__(min_temp)
+        if beta <= 0:
+            raise ValueError("beta must be positive")
+        self.beta = beta
+
+    def _cool(self, temp: float, accepted: bool) -> float:
+        return temp / (1 + self.beta * temp)
+
+
+class AdaptiveCooling(CoolingSchedule):
+    """
+    Acceptance-rate targeted cooling.
+    Every `window` iterations the observed acceptance rate is compared with a
+    target rate; the temperature is lowered when too many moves are accepted
+    and raised when too few are. The target itself decays geometrically from
+    `initial_acceptance` towards `final_acceptance`, so the search still cools.
+    """
+
+    def __init__(self, initial_acceptance: float = 0.5, final_acceptance: float = 0.01,
+                 target_decay: float = 0.95, window: int = 50, gain: float = 2.0,
+                 min_temp: float = 1e-3):
+        super().__init__(min_temp)
+        if not 0 < final_acceptance <= initial_acceptance < 1:
+            raise ValueError("acceptance targets must satisfy 0 < final <= initial < 1")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.initial_acceptance = initial_acceptance
+        self.final_acceptance = final_acceptance
+        self.target_decay = target_decay
+        self.window = window
+        self.gain = gain
+        self.target = initial_acceptance
+        self._accepted_in_window = 0
+
+    def start(self, initial_temp: float) -> float:
+        self.target = self.initial_acceptance
+        self._accepted_in_window = 0
+        return super().start(initial_temp)
+
+    def _cool(self, temp: float, accepted: bool) -> float:
+        if accepted:
+            self._accepted_in_window += 1
+        if self.step_count % self.window != 0:
+            return temp
+
+        rate = self._accepted_in_window / self.window
+        self._accepted_in_window = 0
+        new_temp = temp * math.exp(self.gain * (self.target - rate))
+        self.target = max(self.target * self.target_decay, self.final_acceptance)
+        return new_temp
+
+
+COOLING_SCHEDULES = {
+    "geometric": GeometricCooling,
+    "linear": LinearCooling,
+    "logarithmic": LogarithmicCooling,
+    "lundy_mees": LundyMeesCooling,
+    "adaptive": AdaptiveCooling,
+}
+
+
+def create_cooling_schedule(name: str, cooling_rate: Optional[float] = None) -> CoolingSchedule:
+    """
+    Factory for cooling schedules by name.
+
+    Args:
+        name: One of the keys of COOLING_SCHEDULES
+        cooling_rate: Rate passed to geometric cooling (ignored by the others)
+
+    Returns:
+        A fresh CoolingSchedule instance
+    """
+    if name not in COOLING_SCHEDULES:
+        raise ValueError(f"Unknown cooling schedule: {name}")
+    if name == "geometric" and cooling_rate is not None:
+        return GeometricCooling(rate=cooling_rate)
+    return COOLING_SCHEDULES[name]()
+
+
+def calibrate_initial_temp(deltas: list, initial_acceptance: float = 0.8, default: float = 1.0) -> float:
+    """
+    Pick a starting temperature so that an average worsening move is accepted
+    with probability `initial_acceptance`: T0 = -mean(delta+) / ln(p0).
+
+    Args:
+        deltas: Sampled objective deltas (neighbor score - current score)
+        initial_acceptance: Desired acceptance probability of worsening moves
+        default: Temperature returned when no worsening move was sampled
+
+    Returns:
+        Calibrated initial temperature
+    """
+    if not 0 < initial_acceptance < 1:
+        raise ValueError("initial_acceptance must be in (0, 1)")
+    worsening = [d for d in deltas if d > 0]
+    if not worsening:
+        return default
+    mean_delta = sum(worsening) / len(worsening)
+    return -mean_delta / math.log(initial_acceptance)
@@ -0,0 +1,113 @@
+from collections import deque
+from typing import Tuple
+import numpy as np
+from core.encoding import ScheduleEncoding
+
+CROSSOVER_TYPES = ("one_point", "uniform", "course_block")
+
+
+# ---------- Inheritance masks ----------
+# A mask is a bool array over meetings: True means the child takes that meeting's
+# cell from the donor parent, False means it keeps the base parent's cell.
+
+def one_point_mask(encoding: ScheduleEncoding, rng: np.random.Generator) -> np.ndarray:
+    """Courses (in sorted order) after a random cut point come from the donor."""
+    if encoding.n_courses <= 1:
+        return np.zeros(encoding.n_meetings, dtype=bool)
+    point = rng.integers(1, encoding.n_courses)
+    return encoding.course_of_meeting >= point
+
+
+def uniform_mask(encoding: ScheduleEncoding, rng: np.random.Generator) -> np.ndarray:
+    """Every meeting independently comes from either parent."""
+    return rng.random(encoding.n_meetings) < 0.5
+
+
+def course_block_mask(encoding: ScheduleEncoding, rng: np.random.Generator) -> np.ndarray:
+    """A random contiguous block of courses comes from the donor (all meetings of a course move together)."""
+    if encoding.n_courses <= 1:
+        return np.zeros(encoding.n_meetings, dtype=bool)
+    start, stop = np.sort(rng.choice(encoding.n_courses + 1, size=2, replace=False))
+    return (encoding.course_of_meeting >= start) & (encoding.course_of_meeting < stop)
+
+
+_MASKS = {
+    "one_point": one_point_mask,
+    "uniform": uniform_mask,
+    "course_block": course_block_mask,
+}
+
+
+def crossover_mask(kind: str, encoding: ScheduleEncoding, rng: np.random.Generator) -> np.ndarray:
+    """Draw an inheritance mask of the given crossover kind; locked meetings are never exchanged."""
+    if kind not in _MASKS:
+        raise ValueError(f"Unknown crossover type: {kind}")
+    return _MASKS[kind](encoding, rng) & ~encoding.locked
+
+
+# ---------- Child construction ----------
+def combine(base: np.ndarray, donor: np.ndarray, mask: np.ndarray, encoding: ScheduleEncoding,
+            rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Build a child from two encoded parents and repair cell collisions.
+    Each parent is collision-free, so a collision is always one base meeting and one
+    donor meeting in the same cell; the base meeting keeps the cell and the donor
+    meeting is moved to a random free cell in one of its legal rooms. If there is none,
+    a pinned meeting goes back to its base parent's cell (moving whichever meeting took
+    it) so its pin still holds; other meetings go to any free cell.
+
+    Args:
+        base: Meeting -> cell array of the base parent
+        donor: Meeting -> cell array of the donor parent
+        mask: Meetings inherited from the donor
+        encoding: Encoding both parents use
+        rng: Random generator for relocation
+
+    Returns:
+        (cells, grid) of the child
+    """
+    child = np.where(mask, donor, base).astype(np.int32)
+    grid = np.full(encoding.n_cells, -1, dtype=np.int32)
+
+    kept = np.flatnonzero(~mask & (child >= 0))
+    grid[child[kept]] = kept
+
+    donated = np.flatnonzero(mask & (child >= 0))
+    collides = grid[child[donated]] != -1
+    placed = donated[~collides]
+    grid[child[placed]] = placed
+
+    evicted = deque(donated[collides].tolist())
+    free = grid == -1
+    while evicted:
+        mid = evicted.popleft()
+        candidates = np.flatnonzero(free & encoding.legal_cells[mid])
+        if candidates.size:
+            cell = candidates[rng.integers(candidates.size)]
+        elif encoding.pinned[mid] and base[mid] >= 0:
+            # Base cells are distinct and only this meeting's occupant can be displaced from it, so
+            # every pinned meeting ends up in a cell its pin allows and the queue runs dry
+            cell = base[mid]
+            if grid[cell] != -1:
+                evicted.append(int(grid[cell]))
+        else:
+            candidates = np.flatnonzero(free)
+            cell = candidates[rng.integers(candidates.size)]
+        child[mid] = cell
+        grid[cell] = mid
+        free[cell] = False
+    return child, grid
+
+
+def crossover_pair(parent1: np.ndarray, parent2: np.ndarray, kind: str, encoding: ScheduleEncoding,
+                   rng: np.random.Generator) -> Tuple[Tuple[np.ndarray, np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+    """
+    Produce two complementary children: child1 is parent1 with the masked meetings
+    taken from parent2, child2 the reverse.
+
+    Returns:
+        ((cells1, grid1), (cells2, grid2))
+    """
+    mask = crossover_mask(kind, encoding, rng)
+    return (combine(parent1, parent2, mask, encoding, rng),
+            combine(parent2, parent1, mask, encoding, rng))
@@ -0,0 +1,314 @@
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from core.models import DAY, Student
+from core.registry import Registry
+from core.schedule import Schedule
+from core.objective import ScheduleObjective, ObjectiveWeights
+from core.bounds import objective_lower_bound
+from core.rng import RandomStreams, Seed, as_streams
+from algorithm.stimulated_annealing import SimulatedAnnealing
+from algorithm.portfolio import SolverConfig
+from algorithm.reoptimize import WARM_START_ALGORITHMS, carry_over
+from algorithm.exact import ExactSolver, auto_config
+
+# Course conflict graph: course code -> {neighbouring course code: shared students}
+ConflictGraph = Dict[str, Dict[str, int]]
+
+
+# ---------- Conflict graph ----------
+def conflict_graph(registry: Registry) -> ConflictGraph:
+    """
+    Course-level conflict graph from the student <-> meeting indices. Two courses are
+    adjacent when a student takes both; the edge weight is the number of such students.
+    Cost is the sum over students of (courses per student)^2.
+    """
+    graph: ConflictGraph = {code: {} for code in registry.meetings_of_course}
+    for nim, mids in registry.meetings_of_student.items():
+        courses = sorted({registry.meetings[mid].course_code for mid in mids})
+        for i, a in enumerate(courses):
+            for b in courses[i + 1:]:
+                graph[a][b] = graph[a].get(b, 0) + 1
+                graph[b][a] = graph[b].get(a, 0) + 1
+    return graph
+
+
+def _stream_order(graph: ConflictGraph) -> List[str]:
+    """Breadth-first order, each component starting at its highest-degree course, heaviest edges first."""
+    order, seen = [], set()
+    for root in sorted(graph, key=lambda code: (-len(graph[code]), code)):
+        if root in seen:
+            continue
+        seen.add(root)
+        queue = [root]
+        for code in queue:
+            order.append(code)
+            for neighbour in sorted(graph[code], key=lambda n: (-graph[code][n], n)):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+    return order
+
+
+def _room_pin_groups(registry: Registry) -> Dict[str, str]:
+    """Course -> representative course of its group, for courses linked (transitively) by a shared pinned room."""
+    parent: Dict[str, str] = {}
+
+    def find(code: str) -> str:
+        while parent.setdefault(code, code) != code:
+            parent[code] = parent[parent[code]]
+            code = parent[code]
+        return code
+
+    first_course: Dict[str, str] = {}
+    for mid, pin in registry.pins.items():
+        if pin.classroom is not None:
+            code = registry.meetings[mid].course_code
+            parent[find(code)] = find(first_course.setdefault(pin.classroom, code))
+    return {code: find(code) for code in parent}
+
+
+def partition_courses(registry: Registry, graph: ConflictGraph, n_clusters: int, slack: float = 0.1) -> List[List[str]]:
+    """
+    Split courses into n_clusters weakly connected clusters of balanced meeting counts.
+    Linear deterministic greedy streaming: courses arrive in breadth-first order and each
+    joins the cluster holding most of its conflict weight, discounted by how full the
+    cluster is; a cluster never exceeds (1 + slack) times the average meeting count.
+    Courses linked by a shared pinned room always join one cluster (which then owns
+    those rooms, see split_rooms), past the limit if need be. Runs in O(edges), so it
+    scales with the dataset.
+
+    Returns:
+        Course codes of every non-empty cluster
+    """
+    size = {code: len(registry.meetings_of_course.get(code, [])) for code in graph}
+    capacity = max((1 + slack) * sum(size.values()) / n_clusters, max(size.values(), default=1))
+    assignment: Dict[str, int] = {}
+    loads = [0] * n_clusters
+    group = _room_pin_groups(registry)
+    group_cluster: Dict[str, int] = {}
+
+    for code in _stream_order(graph):
+        if code in group and group[code] in group_cluster:
+            best = group_cluster[group[code]]
+        else:
+            affinity = [0.0] * n_clusters
+            for neighbour, weight in graph[code].items():
+                cluster = assignment.get(neighbour)
+                if cluster is not None:
+                    affinity[cluster] += weight
+            fits = [c for c in range(n_clusters) if loads[c] + size[code] <= capacity] or list(range(n_clusters))
+            best = max(fits, key=lambda c: (affinity[c] * (1 - loads[c] / capacity), -loads[c]))
+            if code in group:
+                group_cluster[group[code]] = best
+        assignment[code] = best
+        loads[best] += size[code]
+
+    clusters: List[List[str]] = [[] for _ in range(n_clusters)]
+    for code, cluster in assignment.items():
+        clusters[cluster].append(code)
+    return [sorted(cluster) for cluster in clusters if cluster]
+
+
+def cut_weight(graph: ConflictGraph, clusters: List[List[str]]) -> int:
+    """Shared students on edges between different clusters (conflicts the clusters cannot see)."""
+    cluster_of = {code: i for i, cluster in enumerate(clusters) for code in cluster}
+    return sum(weight for a, edges in graph.items() for b, weight in edges.items()
+               if a < b and cluster_of[a] != cluster_of[b])
+
+
+# ---------- Sub-problems ----------
+def split_rooms(registry: Registry, clusters: List[List[str]]) -> List[List[str]]:
+    """
+    Give every cluster a disjoint share of the rooms, so cluster solutions merge without
+    cell collisions. Rooms are dealt in descending capacity in snake order (each cluster
+    gets a similar capacity mix); rooms pinned by a course go to that course's cluster.
+
+    Raises:
+        ValueError: If courses of two clusters pin the same room, or a cluster would be
+            left without a room that no other cluster has pinned
+    """
+    cluster_of = {code: i for i, cluster in enumerate(clusters) for code in cluster}
+    owner: Dict[str, int] = {}
+    for mid, pin in registry.pins.items():
+        if pin.classroom is not None:
+            cluster = cluster_of[registry.meetings[mid].course_code]
+            if owner.setdefault(pin.classroom, cluster) != cluster:
+                raise ValueError(f"Room {pin.classroom} is pinned by courses in clusters {owner[pin.classroom]} and {cluster}")
+
+    n = len(clusters)
+    rooms: List[List[str]] = [[] for _ in range(n)]
+    free = [code for code in sorted(registry.classrooms, key=lambda c: (-registry.classrooms[c].capacity, c)) if code not in owner]
+    for i, code in enumerate(free):
+        turn, offset = divmod(i, n)
+        rooms[offset if turn % 2 == 0 else n - 1 - offset].append(code)
+    for code, cluster in owner.items():
+        rooms[cluster].append(code)
+    # A cluster left without rooms borrows an unpinned one from the cluster with the most
+    for i, cluster in enumerate(rooms):
+        if not cluster:
+            donors = [r for r in rooms if len(r) > 1 and any(code not in owner for code in r)]
+            if not donors:
+                raise ValueError(f"Cluster {i} has no room and no other cluster has an unpinned room to spare (use fewer clusters)")
+            donor = max(donors, key=lambda r: sum(code not in owner for code in r))
+            room = [code for code in donor if code not in owner][-1]
+            donor.remove(room)
+            cluster.append(room)
+    return rooms
+
+
+def cluster_registry(registry: Registry, courses: List[str], rooms: List[str]) -> Tuple[Registry, List[int]]:
+    """
+    Registry restricted to some courses and rooms: students keep only their courses in
+    the cluster, and pins are carried over (room pins only when the room is in the cluster,
+    which split_rooms guarantees for clusters from partition_courses).
+
+    Returns:
+        (sub-registry, original meeting id of every sub-registry meeting id)
+    """
+    sub = Registry()
+    in_cluster = set(courses)
+    sub.courses = {code: registry.courses[code] for code in sorted(courses)}
+    sub.classrooms = {code: registry.classrooms[code] for code in rooms}
+    for nim, student in registry.students.items():
+        keep = [i for i, code in enumerate(student.course_list) if code in in_cluster]
+        if keep:
+            sub.students[nim] = Student(nim, [student.course_list[i] for i in keep], [student.priority[i] for i in keep])
+    sub.generate_meetings(verbose=False)
+    sub.build_indices(verbose=False)
+
+    origin = [0] * len(sub.meetings)
+    for code, mids in sub.meetings_of_course.items():
+        for index, mid in enumerate(mids):
+            origin[mid] = registry.meetings_of_course[code][index]
+    for mid, original in enumerate(origin):
+        pin = registry.pins.get(original)
+        if pin is not None:
+            classroom = pin.classroom if pin.classroom in sub.classrooms else None
+            if pin.day is not None or pin.hour is not None or classroom is not None:
+                sub.pin(mid, pin.day, pin.hour, classroom)
+    return sub, origin
+
+
+# ---------- Worker side ----------
+def _solve_cluster(task: Tuple[Registry, SolverConfig, float, Optional[ObjectiveWeights], RandomStreams]) -> Tuple[float, Dict[int, Tuple[DAY, int, str]]]:
+    sub, config, seconds, weights, streams = task
+    params = dict(config.params, time_budget=seconds, objective_weights=weights, seed=streams)
+    if config.algorithm is ExactSolver:
+        params.setdefault("workers", 1)  # One CP-SAT thread per worker process
+    result = config.algorithm(sub, **params).run(**config.run_params)
+    best = result[1]
+    return float(result[2]), dict(best.where_is) if best is not None else {}
+
+
+# ---------- Solver ----------
+@dataclass
+class DecompositionResult:
+    """Outcome of a decomposed solve."""
+    best_schedule: Schedule
+    best_score: float
+    clusters: List[List[str]]                                   # Course codes per cluster
+    cut_weight: int                                             # Shared students between clusters
+    cluster_scores: List[float] = field(default_factory=list)   # Best score of every cluster on its own
+    merged_score: float = 0.0                                   # Score of the merged schedule before repair
+    repaired_meetings: int = 0                                  # Meetings the repair phase could move
+    duration: float = 0.0
+
+
+class DecompositionSolver:
+    """
+    Solves large instances by partitioning the course conflict graph.
+
+    Courses are split into weakly connected clusters (partition_courses), each cluster
+    gets a disjoint share of the rooms over all timeslots (split_rooms), and the clusters
+    are solved in parallel worker processes with any algorithm. The merged schedule is
+    collision-free by construction; a repair phase then re-optimizes it on the full
+    registry with only the boundary meetings (courses with conflict edges between
+    clusters) movable, using a warm-start algorithm (see algorithm.reoptimize).
+    """
+
+    def __init__(self, registry: Registry, time_budget: float, n_clusters: Optional[int] = None,
+                 config: Optional[SolverConfig] = None, repair_config: Optional[SolverConfig] = None,
+                 repair_share: float = 0.3, workers: Optional[int] = None, slack: float = 0.1,
+                 objective_weights: Optional[ObjectiveWeights] = None, seed: Seed = None):
+        """
+        Args:
+            registry: Registry to schedule
+            time_budget: Total wall-clock seconds (cluster solves plus repair)
+            n_clusters: Number of clusters (default: one per worker, about 100 meetings each at least)
+            config: Algorithm solving each cluster (default: exact backend for clusters small
+                enough, see algorithm.exact.auto_config, simulated annealing otherwise)
+            repair_config: Warm-start algorithm of the repair phase (default: simulated annealing)
+            repair_share: Fraction of time_budget reserved for the repair phase
+            workers: Worker processes (default: os.cpu_count())
+            slack: Allowed cluster imbalance, see partition_courses
+            objective_weights: Soft-constraint weights, see core.objective.ObjectiveWeights (None = ObjectiveWeights.for_registry)
+            seed: Seed of the run; every cluster solve and the repair get spawned child streams, see core.rng
+        """
+        if time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        if not 0 <= repair_share < 1:
+            raise ValueError("repair_share must be in [0, 1)")
+        self.config = config
+        self.repair_config = repair_config or SolverConfig("sa_repair", SimulatedAnnealing)
+        if self.repair_config.algorithm.__name__ not in WARM_START_ALGORITHMS:
+            raise ValueError(f"{self.repair_config.algorithm.__name__} does not support warm starts")
+        self.registry = registry
+        self.time_budget = time_budget
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        if n_clusters is None:
+            n_clusters = min(self.workers, math.ceil(len(registry.meetings) / 100))
+        self.n_clusters = max(1, min(n_clusters, len(registry.classrooms)))
+        self.repair_share = repair_share
+        self.slack = slack
+        self.objective_weights = objective_weights or ObjectiveWeights.for_registry(registry)  # Clusters inherit the full registry's defaults
+        self.rng = as_streams(seed)
+
+    def run(self) -> DecompositionResult:
+        start = time.monotonic()
+        registry = self.registry
+        graph = conflict_graph(registry)
+        clusters = partition_courses(registry, graph, self.n_clusters, self.slack)
+        rooms = split_rooms(registry, clusters)
+        subproblems = [cluster_registry(registry, courses, cluster_rooms) for courses, cluster_rooms in zip(clusters, rooms)]
+
+        # Cluster solves: clusters beyond the worker count queue up, so the time is split in waves
+        solve_time = self.time_budget * (1 - self.repair_share) - (time.monotonic() - start)
+        seconds = max(solve_time, 0.1) / math.ceil(len(clusters) / self.workers)
+        tasks = [(sub, self.config or auto_config(sub, self.objective_weights), seconds, self.objective_weights, streams)
+                 for (sub, _), streams in zip(subproblems, self.rng.spawn(len(subproblems)))]
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks))) as executor:
+            solved = list(executor.map(_solve_cluster, tasks))
+
+        # Merge: rooms are disjoint, so only pins broken by a room split need re-placing
+        merged = Schedule(list(DAY), list(range(7, 18)), list(registry.classrooms.keys()))
+        for (_, origin), (_, positions) in zip(subproblems, solved):
+            for mid, (day, hour, room) in positions.items():
+                merged.place(origin[mid], day, hour, room)
+        for mid in merged.pin_violations(registry):
+            merged.remove(*merged.get_position(mid))
+        merged, placed = carry_over(merged, registry, rng=self.rng.random)
+
+        objective = ScheduleObjective(registry, self.objective_weights)
+        merged_score = objective.evaluate(merged)
+        cluster_of = {code: i for i, cluster in enumerate(clusters) for code in cluster}
+        boundary: Set[int] = set(placed)
+        for code, edges in graph.items():
+            if any(cluster_of[code] != cluster_of[other] for other in edges):
+                boundary.update(registry.meetings_of_course[code])
+        boundary -= registry.locked_meetings
+
+        best, best_score = merged, merged_score
+        remaining = self.time_budget - (time.monotonic() - start)
+        if boundary and merged_score > objective_lower_bound(registry, objective.weights) and remaining > 0:
+            params: Dict[str, Any] = dict(self.repair_config.params, time_budget=remaining, objective_weights=self.objective_weights,
+                                          initial_schedule=merged, movable_meetings=boundary, seed=self.rng.spawn(1)[0])
+            result = self.repair_config.algorithm(registry, **params).run(**self.repair_config.run_params)
+            if result[2] < best_score:
+                best, best_score = result[1], result[2]
+
+        return DecompositionResult(best, best_score, clusters, cut_weight(graph, clusters), [score for score, _ in solved],
+                                   merged_score, len(boundary), time.monotonic() - start)
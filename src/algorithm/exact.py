@@ -0,0 +1,258 @@
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from core.models import DAY
+from core.registry import Registry
+from core.schedule import Schedule
+from core.objective import ScheduleObjective, ObjectiveWeights
+from core.rng import Seed, as_streams
+from algorithm.stimulated_annealing import SimulatedAnnealing
+from algorithm.portfolio import SolverConfig
+
+try:  # Optional dependency: pip install ortools
+    from ortools.sat.python import cp_model
+except ImportError:  # pragma: no cover - depends on the environment
+    cp_model = None
+
+ORTOOLS_AVAILABLE = cp_model is not None
+
+# Objective components the exact model expresses
+EXACT_COMPONENTS = ("student_conflicts", "priority_conflicts", "room_over_capacity")
+
+# Largest model (placement variables) chosen automatically, see use_exact(). Measured on one
+# core with the default 10 s limit: 935 variables solve to optimality in 0.4 s, 5,445 need
+# 8.5 s and 8,360 (76 meetings in 110 cells) are not proven optimal in 20 s
+EXACT_SIZE_LIMIT = 2_000
+
+
+def _dims() -> Tuple[List[DAY], List[int]]:
+    # Same grid as Schedule.random_initial_assignment
+    return list(DAY), list(range(7, 18))
+
+
+def model_size(registry: Registry) -> int:
+    """Number of placement variables: allowed (meeting, timeslot, legal room) triples."""
+    days, hours = _dims()
+    size = 0
+    for mid in registry.meetings:
+        pin = registry.pins.get(mid)
+        n_times = sum(1 for day in days for hour in hours if pin is None or pin.allows(day, hour))
+        size += n_times * len(registry.legal_classrooms_by_meeting.get(mid, []))
+    return size
+
+
+def use_exact(registry: Registry, weights: Optional[ObjectiveWeights] = None, size_limit: int = EXACT_SIZE_LIMIT) -> bool:
+    """Whether the exact backend is installed, models these weights and the instance is small enough."""
+    weights = weights or ObjectiveWeights.for_registry(registry)
+    return ORTOOLS_AVAILABLE and set(weights.active()) <= set(EXACT_COMPONENTS) and model_size(registry) <= size_limit
+
+
+def auto_config(registry: Registry, weights: Optional[ObjectiveWeights] = None, size_limit: int = EXACT_SIZE_LIMIT) -> SolverConfig:
+    """The exact backend for small instances (see use_exact), simulated annealing otherwise."""
+    if use_exact(registry, weights, size_limit):
+        return SolverConfig("exact", ExactSolver)
+    return SolverConfig("sa", SimulatedAnnealing)
+
+
+class _SolutionRecorder(cp_model.CpSolverSolutionCallback if ORTOOLS_AVAILABLE else object):
+    """Records the objective value of every improving solution."""
+
+    def __init__(self):
+        super().__init__()
+        self.values: List[float] = []
+
+    def on_solution_callback(self) -> None:
+        self.values.append(self.ObjectiveValue())
+
+
+class ExactSolver:
+    """
+    Exact CP-SAT formulation of the scheduling problem (requires OR-Tools).
+
+    One boolean per allowed (meeting, timeslot, legal room); every meeting takes exactly
+    one, every (timeslot, room) cell holds at most one meeting, and pins restrict the
+    timeslots. For each group of students with the same meetings and each timeslot, an
+    indicator switches the conflict term on when the group attends two or more meetings
+    there, so the objective equals ScheduleObjective exactly. Meetings of the same
+    unpinned course are interchangeable and are ordered by timeslot to break symmetry.
+
+    A short simulated annealing run first provides a solution hint, and its schedule
+    is returned whenever CP-SAT finds nothing better within the time limit, so a run
+    always yields a schedule.
+    """
+
+    def __init__(self, registry: Registry, time_budget: Optional[float] = 10.0, workers: Optional[int] = None,
+                 seed: Seed = 0, objective_weights: Optional[ObjectiveWeights] = None, log: bool = False,
+                 warm_start: float = 0.2):
+        """
+        Args:
+            registry: Registry to schedule
+            time_budget: Solver time limit in seconds (None = until proven optimal)
+            workers: CP-SAT search workers (default: os.cpu_count())
+            seed: CP-SAT random seed (streams and SeedSequences are reduced to one)
+            objective_weights: Soft-constraint weights; only EXACT_COMPONENTS are supported
+            log: Print the CP-SAT search log
+            warm_start: Share of time_budget spent in simulated annealing for the solution
+                hint and fallback (1 second when time_budget is None; 0 disables it)
+        """
+        if not ORTOOLS_AVAILABLE:
+            raise ImportError("The exact backend needs OR-Tools: pip install ortools")
+        self.registry = registry
+        self.time_budget = time_budget
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.seed = (seed if isinstance(seed, int) else as_streams(seed).random.getrandbits(31)) % 2**31
+        self.weights = objective_weights or ObjectiveWeights.for_registry(registry)
+        unsupported = set(self.weights.active()) - set(EXACT_COMPONENTS)
+        if unsupported:
+            raise ValueError(f"The exact backend does not model {sorted(unsupported)}")
+        self.objective = ScheduleObjective(registry, self.weights)
+        self.log = log
+        self.warm_start = warm_start
+        self.status: Optional[str] = None
+
+    def build_model(self) -> Tuple['cp_model.CpModel', Dict[Tuple[int, int, str], 'cp_model.IntVar'], List[Tuple[DAY, int]]]:
+        """
+        Returns:
+            (model, placement variables keyed by (meeting_id, timeslot index, room), timeslots)
+        """
+        registry = self.registry
+        days, hours = _dims()
+        slots = [(day, hour) for day in days for hour in hours]
+        model = cp_model.CpModel()
+        x: Dict[Tuple[int, int, str], cp_model.IntVar] = {}
+        at_slot: Dict[Tuple[int, int], list] = {}       # (meeting, timeslot) -> placement variables
+        in_cell: Dict[Tuple[int, str], list] = {}       # (timeslot, room) -> placement variables
+        start: Dict[int, list] = {}                     # meeting -> timeslot index terms
+
+        for mid in sorted(registry.meetings):
+            pin = registry.pins.get(mid)
+            rooms = registry.legal_classrooms_by_meeting.get(mid, [])
+            choices = []
+            for s, (day, hour) in enumerate(slots):
+                if pin is not None and not pin.allows(day, hour):
+                    continue
+                for room in rooms:
+                    var = model.NewBoolVar(f"x_{mid}_{s}_{room}")
+                    x[mid, s, room] = var
+                    choices.append(var)
+                    at_slot.setdefault((mid, s), []).append(var)
+                    in_cell.setdefault((s, room), []).append(var)
+                    start.setdefault(mid, []).append(s * var)
+            if not choices:
+                raise ValueError(f"Meeting {mid} has no allowed position")
+            model.AddExactlyOne(choices)
+        for cell in in_cell.values():
+            if len(cell) > 1:
+                model.AddAtMostOne(cell)
+
+        # Symmetry: interchangeable meetings of a course take increasing timeslots
+        for mids in registry.meetings_of_course.values():
+            free = [mid for mid in mids if mid not in registry.pins]
+            for a, b in zip(free, free[1:]):
+                model.Add(sum(start[a]) <= sum(start[b]))
+
+        terms = []
+        # Conflicts, per group of students with identical meetings (and priority weights)
+        priority = self.objective.priority_weights
+        groups: Dict[Tuple[Tuple[int, ...], Tuple[int, ...]], int] = {}
+        for nim, mids in registry.meetings_of_student.items():
+            if len(mids) < 2:
+                continue
+            ordered = sorted(mids)
+            weights = tuple(priority[mid][registry.students_of_meeting[mid].index(nim)] for mid in ordered) \
+                if self.weights.priority_conflicts else ()
+            key = (tuple(ordered), weights)
+            groups[key] = groups.get(key, 0) + 1
+        for (mids, weights), count in groups.items():
+            for s in range(len(slots)):
+                present = [(i, at_slot[mid, s]) for i, mid in enumerate(mids) if (mid, s) in at_slot]
+                if len(present) < 2:
+                    continue
+                load = sum(sum(vars_) for _, vars_ in present)
+                clash = model.NewBoolVar("")
+                model.Add(load <= 1).OnlyEnforceIf(clash.Not())
+                model.Add(load >= 2).OnlyEnforceIf(clash)
+                if self.weights.student_conflicts:
+                    conflicts = model.NewIntVar(0, len(present), "")
+                    model.Add(conflicts == load).OnlyEnforceIf(clash)
+                    model.Add(conflicts == 0).OnlyEnforceIf(clash.Not())
+                    terms.append(self.weights.student_conflicts * count * conflicts)
+                if self.weights.priority_conflicts:
+                    weighted = sum(weights[i] * sum(vars_) for i, vars_ in present)
+                    cost = model.NewIntVar(0, sum(weights[i] * len(vars_) for i, vars_ in present), "")
+                    model.Add(cost == weighted).OnlyEnforceIf(clash)
+                    model.Add(cost == 0).OnlyEnforceIf(clash.Not())
+                    terms.append(self.weights.priority_conflicts * count * cost)
+
+        if self.weights.room_over_capacity:
+            excess = self.objective.room_excess
+            terms.extend(self.weights.room_over_capacity * excess[mid][room] * var
+                         for (mid, _, room), var in x.items() if excess[mid][room])
+
+        model.Minimize(sum(terms))
+        return model, x, slots
+
+    def run(self) -> Tuple[Optional[Schedule], Optional[Schedule], float, List[float], float, bool]:
+        """
+        Returns:
+            (best solution, best solution again (there is no starting state), its score,
+            objective value of every improving solution, duration, whether the best is proven optimal)
+        """
+        start_time = time.time()
+        fallback = self._warm_start()
+        if fallback is not None and fallback[2]:
+            # Annealing reached the objective's lower bound (see core.bounds): already optimal
+            self.status = "OPTIMAL (lower bound reached by simulated annealing)"
+            schedule, score = fallback[0], fallback[1]
+            return schedule, schedule, score, [score], time.time() - start_time, True
+        model, x, slots = self.build_model()
+        if fallback is not None:
+            self._hint(model, x, slots, fallback[0])
+        solver = cp_model.CpSolver()
+        if self.time_budget is not None:
+            solver.parameters.max_time_in_seconds = max(0.1, self.time_budget - (time.time() - start_time))
+        solver.parameters.num_workers = self.workers
+        solver.parameters.random_seed = self.seed
+        solver.parameters.log_search_progress = self.log
+        recorder = _SolutionRecorder()
+        status = solver.Solve(model, recorder)
+        self.status = solver.StatusName(status)
+        duration = time.time() - start_time
+        best, best_score, proven = None, float("inf"), status == cp_model.OPTIMAL
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            days, hours = _dims()
+            best = Schedule(days, hours, list(self.registry.classrooms.keys()))
+            for (mid, s, room), var in x.items():
+                if solver.Value(var):
+                    best.place(mid, slots[s][0], slots[s][1], room)
+            best_score = self.objective.evaluate(best)
+        if fallback is not None and fallback[1] < best_score:
+            # CP-SAT found nothing better than the warm start in time
+            best, best_score, proven = fallback[0], fallback[1], False
+            self.status = f"{self.status} (simulated annealing fallback)"
+        if best is None:
+            return None, None, float("inf"), recorder.values, duration, False
+        history = recorder.values or [best_score]
+        return best, best, best_score, history, duration, proven
+
+    def _warm_start(self) -> Optional[Tuple[Schedule, float, bool]]:
+        """Run simulated annealing briefly; returns (schedule, score, whether it reached the lower bound)."""
+        if self.warm_start <= 0:
+            return None
+        seconds = self.warm_start * self.time_budget if self.time_budget is not None else 1.0
+        annealing = SimulatedAnnealing(self.registry, time_budget=seconds, objective_weights=self.weights, seed=self.seed)
+        _, schedule, score, *_ = annealing.run()
+        return schedule, score, score <= annealing.lower_bound
+
+    def _hint(self, model: 'cp_model.CpModel', x: Dict[Tuple[int, int, str], 'cp_model.IntVar'],
+              slots: List[Tuple[DAY, int]], schedule: Schedule) -> None:
+        """Hint a schedule to the model as its starting solution."""
+        # Relabel interchangeable meetings so the hint satisfies the symmetry-breaking order
+        slot_index = {slot: s for s, slot in enumerate(slots)}
+        position = {mid: (slot_index[(day, hour)], room) for mid, (day, hour, room) in schedule.where_is.items()}
+        for mids in self.registry.meetings_of_course.values():
+            free = [mid for mid in mids if mid not in self.registry.pins]
+            for mid, placed in zip(free, sorted(position[mid] for mid in free)):
+                position[mid] = placed
+        for (mid, s, room), var in x.items():
+            model.AddHint(var, position[mid] == (s, room))
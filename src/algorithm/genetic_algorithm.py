@@ -1,160 +1,248 @@
 from core.registry import Registry
 from core.schedule import Schedule
-from core.objective import ScheduleObjective
+from core.objective import ScheduleObjective, ConflictState, ObjectiveWeights
+from core.bounds import objective_lower_bound
+from core.rng import Seed, as_streams
+from core.encoding import ScheduleEncoding
+from core.models import DAY
+from algorithm.budget import SearchBudget, CancellationToken
+from algorithm.progress import ProgressReporter, ProgressEvent, drain
+from algorithm.history import new_history
+from algorithm.profiling import HotPathProfiler, create_profiler, profiled
+from algorithm.telemetry import SearchTelemetry, create_telemetry
+from algorithm.checkpoint import Checkpointer
+from algorithm.crossover import CROSSOVER_TYPES, crossover_pair
+from algorithm.memetic import LocalSearchPool, local_search
+from algorithm.selection import SELECTION_METHODS, select_indices
 from typing import Optional
-from typing import Tuple, List, Optional
-import random
+from typing import Callable, Generator, Tuple, List, Optional, Union
+import numpy as np
 import time
 
+REPLACEMENT_MODES = ("generational", "elitist", "steady_state")
+
+
+class Individual:
+    """
+    A GA population member in array form: the meeting -> cell array, its cell
+    occupancy grid, and a ConflictState caching the fitness.
+    Every change made through these methods updates the fitness by delta instead
+    of re-evaluating, and copying is three flat array copies.
+    """
+    __slots__ = ("cells", "grid", "state", "encoding")
+
+    def __init__(self, cells: np.ndarray, grid: np.ndarray, state: ConflictState, encoding: ScheduleEncoding):
+        self.cells = cells
+        self.grid = grid
+        self.state = state
+        self.encoding = encoding
+
+    @property
+    def fitness(self) -> float:
+        return self.state.score
+
+    @property
+    def schedule(self) -> Schedule:
+        """Decode into a Schedule (only needed for results and display)."""
+        return self.encoding.decode(self.cells)
+
+    def copy(self) -> 'Individual':
+        return Individual(self.cells.copy(), self.grid.copy(), self.state.copy(), self.encoding)
+
+    def move(self, meeting_id: int, cell: int) -> bool:
+        """Move a meeting to an empty cell; returns False if the cell is occupied."""
+        if self.grid[cell] != -1:
+            return False
+        old = int(self.cells[meeting_id])
+        self.grid[old] = -1
+        self.grid[cell] = meeting_id
+        self.cells[meeting_id] = cell
+        n_rooms = self.encoding.n_rooms
+        rooms = self.encoding.classroom_codes
+        self.state.move(meeting_id, old // n_rooms, cell // n_rooms, rooms[old % n_rooms], rooms[cell % n_rooms])
+        return True
+
+    def swap(self, mid1: int, mid2: int) -> None:
+        """Exchange the cells of two meetings."""
+        c1 = int(self.cells[mid1])
+        c2 = int(self.cells[mid2])
+        self.cells[mid1], self.cells[mid2] = c2, c1
+        self.grid[c1], self.grid[c2] = mid2, mid1
+        n_rooms = self.encoding.n_rooms
+        room1, room2 = self.encoding.classroom_codes[c1 % n_rooms], self.encoding.classroom_codes[c2 % n_rooms]
+        self.state.move(mid1, c1 // n_rooms, c2 // n_rooms, room1, room2)
+        self.state.move(mid2, c2 // n_rooms, c1 // n_rooms, room2, room1)
+
 
 class Genetic_Algorithm:
-    def __init__(self, registry: Registry, population_size: int, max_iteration: int):
+    def __init__(self, registry: Registry, population_size: int, max_iteration: int,
+                 time_budget: Optional[float] = None, max_evaluations: Optional[int] = None, cancel_token: Optional[CancellationToken] = None,
+                 progress_every: int = 1, on_progress: Optional[Callable[[ProgressEvent], None]] = None, history_size: Optional[int] = None, history_strategy: str = "recent",
+                 checkpoint_path: Optional[str] = None, checkpoint_interval: float = 5.0, resume: bool = False,
+                 crossover_type: str = "one_point", local_search_steps: int = 0, local_search_workers: int = 1,
+                 replacement: str = "generational", elite_count: int = 1, steady_state_children: int = 2, dedup: bool = False,
+                 selection: str = "tournament", tournament_size: Optional[int] = None,
+                 objective_weights: Optional[ObjectiveWeights] = None, profile: Union[bool, HotPathProfiler] = False,
+                 telemetry: Union[bool, SearchTelemetry] = False, seed: Seed = None):
+        """
+        Args:
+            crossover_type: Recombination operator, see algorithm.crossover.CROSSOVER_TYPES
+            local_search_steps: Memetic mode: first-improvement moves tried on every child
+                after mutation (0 disables local search)
+            local_search_workers: Processes running the local search (1 runs it in-process)
+            replacement: "generational" replaces the whole population, "elitist" carries the
+                best elite_count individuals over, "steady_state" breeds steady_state_children
+                per iteration and lets each replace the current worst individual if not worse
+            elite_count: Individuals kept unchanged by elitist replacement
+            steady_state_children: Children bred per steady-state iteration
+            dedup: Keep the population free of clones (detected by 64-bit position fingerprints)
+            selection: Parent selection method, see algorithm.selection.SELECTION_METHODS
+            tournament_size: Contestants per tournament (None picks one from population_size)
+            objective_weights: Soft-constraint weights, see core.objective.ObjectiveWeights (None = ObjectiveWeights.for_registry)
+            profile: Instrument hot paths during run(): True or a configured algorithm.profiling.HotPathProfiler
+            telemetry: Record per-generation search analytics: True or a configured algorithm.telemetry.SearchTelemetry.
+                Mutations and in-process local search moves are classified; pooled local search is not
+            seed: Integer seed, SeedSequence or RandomStreams of the run's random streams (None = drawn from
+                the random module), see core.rng; local search workers get spawned child seeds
+        """
+        if crossover_type not in CROSSOVER_TYPES:
+            raise ValueError(f"Unknown crossover type: {crossover_type}")
+        if replacement not in REPLACEMENT_MODES:
+            raise ValueError(f"Unknown replacement mode: {replacement}")
+        if selection not in SELECTION_METHODS:
+            raise ValueError(f"Unknown selection method: {selection}")
         self.registry = registry
         self.population_size = population_size
         self.max_iteration = max_iteration
         self.population = []
+        self.positions = np.empty((0, 0), dtype=np.int32)  # individuals x meetings, row i is population[i].cells
+        self.fitness = np.empty(0)                           # fitness of population[i]
         self.parents = []
-        self.objective = ScheduleObjective(self.registry)
+        self.selection = selection
+        self.tournament_size = tournament_size
+        self.objective = ScheduleObjective(self.registry, objective_weights)
+        self.lower_bound = objective_lower_bound(registry, self.objective.weights)  # Searches stop once they reach it
+        self.budget = SearchBudget(time_budget, max_evaluations, cancel_token)
+        self.progress = ProgressReporter(type(self).__name__, progress_every, on_progress)
+        self.profiler = create_profiler(profile, type(self).__name__)
+        self.telemetry = create_telemetry(telemetry)
+        self.history_size = history_size
+        self.history_strategy = history_strategy
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+        self.resume = resume
+        self.crossover_type = crossover_type
+        self.local_search_steps = local_search_steps
+        self.local_search_workers = local_search_workers
+        self.replacement = replacement
+        self.elite_count = min(elite_count, population_size)
+        self.steady_state_children = max(1, steady_state_children)
+        self.dedup = dedup
+        self.duplicates_rejected = 0
+        self.generations_per_second = 0.0
+        self.encoding: Optional[ScheduleEncoding] = None
+        self.rng = as_streams(seed)
+        self.np_rng = self.rng.numpy
+
+    def _individual(self, cells: np.ndarray) -> Individual:
+        """Wrap an encoded schedule, fully evaluating it once."""
+        state = self.objective.build_cell_state(cells.tolist(), self.encoding)
+        return Individual(cells, self.encoding.grid(cells), state, self.encoding)
+
+    def set_population(self, population: list[Individual]) -> None:
+        """
+        Install a new population and rebuild the position matrix and fitness vector.
+        Each individual's cells become a view of its matrix row, so the matrix stays in sync.
+        """
+        self.population = population
+        if not population:
+            self.positions = np.empty((0, 0), dtype=np.int32)
+            self.fitness = np.empty(0)
+            return
+        self.positions = np.stack([individual.cells for individual in population])
+        for i, individual in enumerate(population):
+            individual.cells = self.positions[i]
+        self.fitness = np.fromiter((individual.fitness for individual in population), dtype=np.float64, count=len(population))
+
+    def replace_member(self, index: int, individual: Individual) -> None:
+        """Put an individual at one population index, keeping the matrix and fitness vector in sync."""
+        self.positions[index] = individual.cells
+        individual.cells = self.positions[index]
+        self.population[index] = individual
+        self.fitness[index] = individual.fitness
 
 # Step 1: Initialize Population
     def init_population(self):
         """
-        Generate initial population of total = population_size random schedules
+        Generate initial population of total = population_size random schedules.
+        This is the only place individuals are fully evaluated; offspring inherit
+        their parents' cached fitness and update it by delta (each child and mutant
+        still counts as one evaluation against max_evaluations).
         """
-        self.population = [] # Reset population
+        population = [] # Reset population
         for i in range (self.population_size):
-            schedule = Schedule.random_initial_assignment(self.registry)
-            self.population.append(schedule)
+            schedule = Schedule.random_initial_assignment(self.registry, self.rng.random)
+            if self.encoding is None:
+                self.encoding = ScheduleEncoding.from_schedule(self.registry, schedule)
+            population.append(self._individual(self.encoding.encode(schedule)))
         # print("Successfully initialized population")
         schedule.display(self.registry)
+        self.set_population(population)
         return self.population
 
 # Step 2: Choose Parents
 # Choose a total of [total_population] parents.
-
-    def tournament_selection(self, tournament_size: Optional[int] = None):
-        # Determine tournament size
-        if not (tournament_size):
-            if self.population_size < 5:
-                tournament_size = 1
-            elif self.population_size < 10:
-                tournament_size = 2
-            elif self.population_size < 20:
-                tournament_size = 3
-            else:
-                tournament_size = 5
-        
-        population_scored = {}
-        for schedule in self.population:
-            score = self.objective.evaluate(schedule)
-            population_scored[schedule] = score # Map candidates with score
-
-        parents = []
-        # Select [num of parents] population
-        for i in range(self.population_size):
-            candidates = random.sample(self.population, tournament_size)
-            
-            best_candidate = None
-            best_score = float('inf')
-
-            for candidate in candidates:
-                score = population_scored[candidate]
-                if score < best_score:
-                    best_candidate = candidate
-                    best_score = score
-            
-            parents.append(best_candidate)
-
-        # Clear old parents
-        self.parents = parents
-
+# All tournaments (or rank/roulette draws) are drawn at once on the fitness vector.
+
+    def _default_tournament_size(self) -> int:
+        if self.population_size < 5:
+            return 1
+        elif self.population_size < 10:
+            return 2
+        elif self.population_size < 20:
+            return 3
+        return 5
+
+    def select_parents(self, num_parents: Optional[int] = None, method: Optional[str] = None,
+                       tournament_size: Optional[int] = None) -> list[Individual]:
+        """Select parents with the configured (or given) selection method."""
+        tournament_size = tournament_size or self.tournament_size or self._default_tournament_size()
+        indices = select_indices(method or self.selection, self.fitness, num_parents or self.population_size,
+                                 self.np_rng, tournament_size)
+        population = self.population
+        self.parents = [population[i] for i in indices.tolist()]
         return self.parents
 
+    def tournament_selection(self, tournament_size: Optional[int] = None, num_parents: Optional[int] = None):
+        return self.select_parents(num_parents, "tournament", tournament_size)
+
 # Step 3: Crossover (Recombination)
-# One-point crossover func, split by sorted index (day + timeslots).
+# Children are built directly on the meeting -> cell arrays (see algorithm.crossover):
+# one_point splits by sorted course order, uniform mixes single meetings and
+# course_block takes a contiguous block of courses from the other parent.
 
-    def _find_and_place(self, schedule: Schedule, meeting_id: int, preferred_room: str) -> bool:
-        """Helper to find any free spot for a meeting and place it."""
-        legal_rooms = self.registry.legal_classrooms_by_meeting.get(meeting_id, [preferred_room])
-        if not legal_rooms:
-            return False
-            
-        random.shuffle(schedule.days)
-        random.shuffle(schedule.hours)
-        random.shuffle(legal_rooms)
-
-        for day in schedule.days:
-            for hour in schedule.hours:
-                for room in legal_rooms:
-                    if schedule.is_empty(day, hour, room):
-                        schedule.place(meeting_id, day, hour, room)
-                        return True
-        return False # No free spot found
-
-    def one_point_crossover(self, parent1: Schedule, parent2: Schedule):
-        # 1) Collect ALL meeting IDs from both parents
-        all_meeting_ids = set(parent1.where_is.keys()) | set(parent2.where_is.keys())
-        
-        # Group by course code
-        meetings_by_course = {}
-        for meeting_id in all_meeting_ids:
-            meeting = self.registry.meetings[meeting_id]
-            course_code = meeting.course_code
-            if course_code not in meetings_by_course:
-                meetings_by_course[course_code] = []
-            meetings_by_course[course_code].append(meeting_id)
-
-        # 2) Sort courses for a consistent crossover point
-        sorted_courses = sorted(meetings_by_course.keys())
-
-        if len(sorted_courses) <= 1:
-            import copy
-            return copy.deepcopy(parent1), copy.deepcopy(parent2)
-
-        # 3) Select crossover point
-        crossover_point = random.randint(1, len(sorted_courses) - 1)
-
-        # 4) Create children as deep copies of parents
-        import copy
-        child1 = copy.deepcopy(parent1)
-        child2 = copy.deepcopy(parent2)
-
-        # 5) Crossover by swapping courses after the crossover point
-        for i, course_code in enumerate(sorted_courses):
-            if i >= crossover_point:
-                meeting_ids_to_swap = meetings_by_course[course_code]
-                
-                # Clear all meetings for this course from both children
-                # This creates a clean slate to prevent duplicates or lost meetings.
-                for mid in meeting_ids_to_swap:
-                    pos1 = child1.get_position(mid)
-                    if pos1:
-                        child1.remove(*pos1)
-                    pos2 = child2.get_position(mid)
-                    if pos2:
-                        child2.remove(*pos2)
-
-                # Re populate from the opposite parent's genes
-                for mid in meeting_ids_to_swap:
-                    # Give child1 the genes from parent2
-                    p2_pos = parent2.get_position(mid)
-                    if p2_pos:
-                        # Try to place at the exact same position
-                        was_placed = child1.place(mid, *p2_pos)
-                        if not was_placed:
-                            # If that spot is taken, find any other free spot
-                            self._find_and_place(child1, mid, p2_pos[2])
-
-                    # Give child2 the genes from parent1
-                    p1_pos = parent1.get_position(mid)
-                    if p1_pos:
-                        # Try to place at the exact same position
-                        was_placed = child2.place(mid, *p1_pos)
-                        if not was_placed:
-                            # If that spot is taken, find any other free spot
-                            self._find_and_place(child2, mid, p1_pos[2])
-                            
-        return child1, child2
+    def _make_child(self, base: Individual, cells: np.ndarray, grid: np.ndarray) -> Individual:
+        """
+        Wrap crossover output; the fitness cache is base's, moved only for meetings that changed cell.
+        Counts as one evaluation against max_evaluations.
+        """
+        self.objective.count_evaluations()
+        state = base.state.copy()
+        n_rooms = self.encoding.n_rooms
+        rooms = self.encoding.classroom_codes
+        for mid in np.flatnonzero(base.cells != cells).tolist():
+            old_slot, old_room = divmod(int(base.cells[mid]), n_rooms)
+            new_slot, new_room = divmod(int(cells[mid]), n_rooms)
+            state.move(mid, old_slot, new_slot, rooms[old_room], rooms[new_room])
+        return Individual(cells, grid, state, self.encoding)
+
+    def crossover(self, parent1: Individual, parent2: Individual, kind: Optional[str] = None) -> Tuple[Individual, Individual]:
+        """Recombine two parents with the configured (or given) crossover type."""
+        (cells1, grid1), (cells2, grid2) = crossover_pair(
+            parent1.cells, parent2.cells, kind or self.crossover_type, self.encoding, self.np_rng)
+        return self._make_child(parent1, cells1, grid1), self._make_child(parent2, cells2, grid2)
+
+    def one_point_crossover(self, parent1: Individual, parent2: Individual) -> Tuple[Individual, Individual]:
+        return self.crossover(parent1, parent2, "one_point")
     
     def crossover_population(self):
         offspring = []
@@ -163,136 +251,228 @@ class Genetic_Algorithm:
             parent1 = self.parents[i]
             parent2 = self.parents[i+1]
 
-            child1, child2 = self.one_point_crossover(parent1, parent2)
+            child1, child2 = self.crossover(parent1, parent2)
             
             # Validate 
             try:
-                self._validate_schedule_credits(child1)
-                self._validate_schedule_credits(child2)
+                self._validate_cells(child1.cells)
+                self._validate_cells(child2.cells)
                 offspring.extend([child1, child2])
             except ValueError as e:
                 print(f"Unexpected validation failure: {e}")
                 # Fallback to parents
-                import copy
-                offspring.extend([copy.deepcopy(parent1), copy.deepcopy(parent2)])
+                offspring.extend([parent1.copy(), parent2.copy()])
 
         if len(self.parents) % 2 == 1:
-            import copy
-            offspring.append(copy.deepcopy(self.parents[-1]))
+            offspring.append(self.parents[-1].copy())
 
         return offspring
 
-    def _validate_schedule_credits(self, schedule: Schedule):
-        meetings_per_course = {} 
-        for meeting_id in schedule.where_is.keys():
-            meeting = self.registry.meetings[meeting_id]
-            course_code = meeting.course_code
-            meetings_per_course[course_code] = meetings_per_course.get(course_code, 0) + 1
-        
-        # Check against expected credits
-        for course_code, count in meetings_per_course.items():
-            expected_credits = self.registry.courses[course_code].credits
-            if count != expected_credits:
-                print(f"Schedule: Course {course_code} has {count} meetings, expected {expected_credits}")
-                raise ValueError(f"Credit validation failed for {course_code}")
+    def _validate_cells(self, cells: np.ndarray):
+        # Every meeting placed, and no two meetings sharing a cell
+        if (cells < 0).any():
+            mid = int(np.flatnonzero(cells < 0)[0])
+            course_code = self.registry.meetings[mid].course_code
+            print(f"Schedule: Meeting {mid} of course {course_code} is not placed")
+            raise ValueError(f"Credit validation failed for {course_code}")
+        if np.unique(cells).size != cells.size:
+            raise ValueError("Cell validation failed: two meetings share a cell")
     
 # Step 4: Mutation
 # Change a random room in legal_classrooms_by_meeting
 # Use a randomizer func to change which meetings get's moved to a different slot.
-    def mutate_schedule(self, schedule: Schedule, mutation_rate: float = 0.1):
+    def mutate_schedule(self, individual: Individual, mutation_rate: float = 0.1) -> Optional[Tuple[str, int, int]]:
+        """
+        Apply at most one random mutation in place (fitness is updated by delta).
+
+        Returns:
+            The applied operation as (kind, a, b) so it can be undone, or None
+        """
+        encoding = self.encoding
+        # Locked meetings never mutate; pinned ones only into cells their pin allows
+        free_meetings = encoding.free_meetings
+        n_meetings = free_meetings.size
         # 1) Decide mutation action randomly
-        mutation_type = random.choice(['swap', 'move', 'time_shift'])
+        rng = self.rng.random
+        mutation_type = rng.choice(['swap', 'move', 'time_shift'])
 
-        if random.random() > mutation_rate:
-            return schedule  # No mutation
+        if rng.random() > mutation_rate:
+            return None  # No mutation
     
         if mutation_type == 'swap':
             # Swap two random meetings
-            meeting_ids = list(schedule.where_is.keys())
-            if len(meeting_ids) >= 2:
-                mid1, mid2 = random.sample(meeting_ids, 2)
-                pos1 = schedule.get_position(mid1)
-                pos2 = schedule.get_position(mid2)
-                
-                if pos1 and pos2:
-                    schedule.swap(pos1, pos2)
+            if n_meetings >= 2:
+                mid1, mid2 = (int(free_meetings[i]) for i in rng.sample(range(n_meetings), 2))
+                if (encoding.pinned[mid1] and not encoding.legal_cells[mid1, individual.cells[mid2]]) or \
+                        (encoding.pinned[mid2] and not encoding.legal_cells[mid2, individual.cells[mid1]]):
+                    return None
+                individual.swap(mid1, mid2)
+                return ('swap', mid1, mid2)
     
         elif mutation_type == 'move':
         # Move one meeting to a free position
-            meeting_ids = list(schedule.where_is.keys())
-            if meeting_ids:
-                mid = random.choice(meeting_ids)
-                old_pos = schedule.get_position(mid)
+            if n_meetings:
+                mid = int(free_meetings[rng.randrange(n_meetings)])
+                old_cell = int(individual.cells[mid])
                 
                 # Get legal classrooms for this meeting
-                meeting = self.registry.meetings[mid]
-                legal_rooms = self.registry.legal_classrooms_by_meeting.get(mid, [])
+                legal_rooms = np.flatnonzero(encoding.legal_rooms[mid])
                 
-                if legal_rooms and old_pos:
+                if legal_rooms.size:
                     # Try random new position
-                    new_day = random.choice(schedule.days)
-                    new_hour = random.choice(schedule.hours)
-                    new_room = random.choice(legal_rooms)
-                    new_pos = (new_day, new_hour, new_room)
+                    if encoding.pinned[mid]:
+                        legal_slots = np.flatnonzero(encoding.legal_slots[mid])
+                        new_slot = int(legal_slots[rng.randrange(legal_slots.size)])
+                    else:
+                        new_slot = rng.randrange(encoding.n_slots)
+                    new_room = int(legal_rooms[rng.randrange(legal_rooms.size)])
                     
                     # Only move if new position is free
-                    if schedule.is_empty(new_day, new_hour, new_room):
-                        schedule.move(old_pos, new_pos)
+                    if individual.move(mid, new_slot * encoding.n_rooms + new_room):
+                        return ('move', mid, old_cell)
 
         elif mutation_type == 'time_shift':
         # Shift one meeting to adjacent time slot
-            meeting_ids = list(schedule.where_is.keys())
-            if meeting_ids:
-                mid = random.choice(meeting_ids)
-                old_pos = schedule.get_position(mid)
-                
-                if old_pos:
-                    day, hour, room = old_pos
-                    # Try shift +1 or -1 hour
-                    new_hour = hour + random.choice([-1, 1])
-                    if new_hour in schedule.hours:
-                        new_pos = (day, new_hour, room)
-                        if schedule.is_empty(day, new_hour, room):
-                            schedule.move(old_pos, new_pos)
-        return schedule
-
-    def mutate_population(self, offspring: list[Schedule], mutation_rate: float = 0.1):
+            if n_meetings:
+                mid = int(free_meetings[rng.randrange(n_meetings)])
+                old_cell = int(individual.cells[mid])
+                hour_index = (old_cell // encoding.n_rooms) % encoding.n_hours
+                # Try shift +1 or -1 hour (same day, same room)
+                shift = rng.choice([-1, 1])
+                new_cell = old_cell + shift * encoding.n_rooms
+                if 0 <= hour_index + shift < encoding.n_hours and (not encoding.pinned[mid] or encoding.legal_cells[mid, new_cell]):
+                    if individual.move(mid, new_cell):
+                        return ('move', mid, old_cell)
+        return None
+
+    def _undo_mutation(self, individual: Individual, applied: Tuple[str, int, int]):
+        kind, a, b = applied
+        if kind == 'swap':
+            individual.swap(a, b)
+        else:
+            individual.move(a, b)
+
+    def mutate_population(self, offspring: list[Individual], mutation_rate: float = 0.1):
         mutated = []
         mutation_count = 0
         
-        for schedule in offspring:
-            original_fitness = self.objective.evaluate(schedule)
-            mutated_schedule = self.mutate_schedule(schedule, mutation_rate)
-            new_fitness = self.objective.evaluate(mutated_schedule)
+        for individual in offspring:
+            if self.budget.exhausted():
+                mutated.append(individual)  # Out of budget: pass through unmutated
+                continue
+            original_fitness = individual.fitness
+            applied = self.mutate_schedule(individual, mutation_rate)
+            if applied is None:
+                mutated.append(individual)
+                continue
+            self.objective.count_evaluations()
+            new_fitness = individual.fitness  # Updated by delta, no re-evaluation
+            if self.telemetry is not None:
+                self.telemetry.observe(new_fitness - original_fitness)
             
             # Accept mutation if it improves or with small probability if worse
-            if new_fitness <= original_fitness or random.random() < 0.1:
-                mutated.append(mutated_schedule)
+            if new_fitness <= original_fitness or self.rng.random.random() < 0.1:
                 if new_fitness < original_fitness:
                     mutation_count += 1
             else:
-                mutated.append(schedule)  # Keep original
+                self._undo_mutation(individual, applied)  # Keep original
+            mutated.append(individual)
         
         return mutated
 
 
+    # Step 4b: Local search (memetic mode)
+    def improve_population(self, offspring: list[Individual], pool: Optional[LocalSearchPool] = None) -> list[Individual]:
+        """Run a bounded local search on every child, in a process pool if one is given."""
+        if pool is None:
+            for individual in offspring:
+                local_search(individual.cells, individual.grid, individual.state, self.encoding,
+                             self.local_search_steps, self.np_rng, self.telemetry, self.lower_bound)
+            return offspring
+
+        seeds = self.rng.spawn_seeds(len(offspring))
+        improved = pool.improve([individual.cells for individual in offspring], self.local_search_steps, seeds)
+        return [self._make_child(individual, cells, self.encoding.grid(cells))
+                for individual, cells in zip(offspring, improved)]
+
+    # Step 4c: Duplicate detection
+    def diversify(self, offspring: list[Individual], seen: Optional[set] = None, attempts: int = 5) -> list[Individual]:
+        """
+        Perturb children whose positions duplicate an earlier child (or a fingerprint in `seen`)
+        with forced mutations, so no local search or selection effort goes to clones.
+        Children still duplicated after `attempts` mutations are counted in duplicates_rejected.
+        """
+        seen = set() if seen is None else seen
+        for individual in offspring:
+            fingerprint = self.encoding.fingerprint(individual.cells)
+            for attempt in range(attempts):
+                if fingerprint not in seen:
+                    break
+                if self.mutate_schedule(individual, 1.0) is not None:
+                    self.objective.count_evaluations()
+                    fingerprint = self.encoding.fingerprint(individual.cells)
+            if fingerprint in seen:
+                self.duplicates_rejected += 1
+            seen.add(fingerprint)
+        return offspring
+
+    # Step 4d: Replacement
+    def elitist_replacement(self, offspring: list[Individual], elites: list[Individual]) -> list[Individual]:
+        """The elites followed by the best children, population_size in total."""
+        offspring = sorted(offspring, key=lambda individual: individual.fitness)
+        return elites + offspring[:self.population_size - len(elites)]
+
+    def steady_state_step(self, mutation_rate: float, pool: Optional[LocalSearchPool] = None) -> list[Individual]:
+        """
+        Breed steady_state_children children and insert each in place of the current worst
+        individual when it is not worse. With dedup, children that clone a member are dropped.
+        """
+        self.parents = self.select_parents(self.steady_state_children + self.steady_state_children % 2)
+        offspring = self.crossover_population()[:self.steady_state_children]
+        offspring = self.mutate_population(offspring, mutation_rate)
+
+        if self.dedup:
+            members = set(self.encoding.fingerprints(self.positions).tolist())
+            unique = []
+            for individual in offspring:
+                fingerprint = self.encoding.fingerprint(individual.cells)
+                if fingerprint in members:
+                    self.duplicates_rejected += 1
+                    continue
+                members.add(fingerprint)
+                unique.append(individual)
+            offspring = unique
+        if self.local_search_steps > 0 and offspring:
+            offspring = self.improve_population(offspring, pool)
+
+        for individual in offspring:
+            worst = int(np.argmax(self.fitness))
+            if individual.fitness <= self.fitness[worst]:
+                self.replace_member(worst, individual)
+        return self.population
+
     # Step 5: Evaluation
-    def get_best_schedule(self, population: list[Schedule]) -> tuple[Schedule, float]:
-        best_schedule = None
+    def get_best_individual(self, population: list[Individual]) -> tuple[Optional[Individual], float]:
+        best_individual = None
         best_fitness = float('inf')
         
-        for schedule in population:
-            fitness = self.objective.evaluate(schedule)
+        for individual in population:
+            fitness = individual.fitness  # Cached
             if fitness < best_fitness:
                 best_fitness = fitness
-                best_schedule = schedule
+                best_individual = individual
         
-        return best_schedule, best_fitness
+        return best_individual, best_fitness
+
+    def get_best_schedule(self, population: list[Individual]) -> tuple[Schedule, float]:
+        best_individual, best_fitness = self.get_best_individual(population)
+        return (best_individual.schedule if best_individual else None), best_fitness
 
 # Step 6: Main GA Loop
     def run(self, mutation_rate: float = 0.1) -> Tuple[Optional[Schedule], Optional[Schedule], float, List[float], int, float]:
         """
         Executes the genetic algorithm and returns detailed diagnostics.
+        See run_iter() for the streaming variant.
 
         Args:
             mutation_rate: The probability of a mutation for each schedule.
@@ -306,50 +486,121 @@ class Genetic_Algorithm:
             - generations_run: The total number of generations executed.
             - duration: The total execution time in seconds.
         """
+        return drain(profiled(self.run_iter(mutation_rate), self.profiler))
+
+    def run_iter(self, mutation_rate: float = 0.1) -> Generator[ProgressEvent, None, Tuple[Optional[Schedule], Optional[Schedule], float, List[float], int, float]]:
+        """Run the GA, yielding a ProgressEvent every `progress_every` generations; returns the same tuple as run()."""
         start_time = time.time()
+        self.budget.start(self.objective)
+        self.progress.start(self.objective)
+        if self.telemetry is not None:
+            self.telemetry.reset()
+
+        state = self.checkpointer.load(type(self).__name__) if self.checkpointer and self.resume else None
+        if state is not None:
+            # Resume from checkpoint: population and best-so-far from the last saved generation
+            day_names, hours, rooms = state["dims"]
+            self.encoding = ScheduleEncoding(self.registry, [DAY[name] for name in day_names], hours, rooms)
+            self.set_population([self._individual(cells) for cells in state["population"].copy()])
+            initial_cells = state["initial"]
+            best_ever_cells = state["best"]
+            best_ever_fitness = state["best_fitness"]
+            score_history = state["score_history"]
+            generations_run = state["generations_run"]
+            start_time -= state["elapsed"]
+            self.rng.setstate(state["rng_state"])
+        else:
+            # Step 1: Initialize Population
+            self.init_population()
+            if not self.population:
+                return None, None, float('inf'), [], 0, time.time() - start_time
+            
+            initial_cells = self.population[0].cells.copy()
+            initial_best, initial_best_fitness = self.get_best_individual(self.population)
+            
+            best_ever_cells = initial_best.cells.copy()
+            best_ever_fitness = initial_best_fitness
+            score_history = new_history(self.history_size, self.history_strategy)
+            score_history.append(initial_best_fitness)
+            generations_run = 0
 
-        # Step 1: Initialize Population
-        self.init_population()
-        if not self.population:
-            return None, None, float('inf'), [], 0, time.time() - start_time
-        
-        initial_schedule = self.population[0]
-        initial_best_schedule, initial_best_fitness = self.get_best_schedule(self.population)
-        
-        best_ever_schedule = initial_best_schedule
-        best_ever_fitness = initial_best_fitness
-        score_history = [initial_best_fitness]
-        generations_run = 0
+        pool = None
+        if self.local_search_steps > 0 and self.local_search_workers > 1:
+            pool = LocalSearchPool(self.registry, self.encoding, self.local_search_workers, self.objective.weights,
+                                   self.lower_bound)
 
         # Step 2: Main Evolution Loop
-        for generation in range(self.max_iteration):
-            generations_run += 1
-            
-            self.parents = self.tournament_selection()
-            offspring = self.crossover_population()
-            offspring = self.mutate_population(offspring, mutation_rate)
-            self.population = offspring
-            
-            current_best_schedule, current_best_fitness = self.get_best_schedule(self.population)
-            
-            if current_best_fitness < best_ever_fitness:
-                best_ever_fitness = current_best_fitness
-                best_ever_schedule = current_best_schedule
-            
-            score_history.append(best_ever_fitness)
-            
-            if best_ever_fitness == 0:
-                break
+        try:
+            for generation in range(generations_run, self.max_iteration):
+                if self.budget.exhausted():
+                    break
+                generations_run += 1
+                
+                if self.replacement == "steady_state":
+                    self.steady_state_step(mutation_rate, pool)
+                else:
+                    elites = []
+                    if self.replacement == "elitist":
+                        elites = [self.population[i] for i in np.argsort(self.fitness, kind="stable")[:self.elite_count].tolist()]
+                    self.select_parents()
+                    offspring = self.crossover_population()
+                    offspring = self.mutate_population(offspring, mutation_rate)
+                    if self.dedup:
+                        offspring = self.diversify(offspring, {self.encoding.fingerprint(elite.cells) for elite in elites})
+                    if self.local_search_steps > 0:
+                        offspring = self.improve_population(offspring, pool)
+                    if elites:
+                        offspring = self.elitist_replacement(offspring, elites)
+                    self.set_population(offspring)
+                
+                best_index = int(np.argmin(self.fitness))
+                current_best = self.population[best_index]
+                current_best_fitness = current_best.fitness
+                
+                if current_best_fitness < best_ever_fitness:
+                    best_ever_fitness = current_best_fitness
+                    best_ever_cells = current_best.cells.copy()
+                
+                score_history.append(best_ever_fitness)
+                if self.telemetry is not None:
+                    self.telemetry.end_iteration(generations_run, current_best_fitness, state=current_best.state)
+                if self.progress.due(generations_run):
+                    yield self.progress.event(generations_run, current_best_fitness, best_ever_fitness)
+                
+                if best_ever_fitness <= self.lower_bound:
+                    break
+                
+                # Checkpoint periodically, and when the budget runs out so the run can be resumed
+                if self.checkpointer and (self.checkpointer.due() or self.budget.exhausted()):
+                    encoding = self.encoding
+                    self.checkpointer.save(type(self).__name__, {
+                        "dims": ([d.name for d in encoding.days], encoding.hours, encoding.classroom_codes),
+                        "population": self.positions,
+                        "initial": initial_cells,
+                        "best": best_ever_cells,
+                        "best_fitness": best_ever_fitness,
+                        "score_history": score_history,
+                        "generations_run": generations_run,
+                        "elapsed": time.time() - start_time,
+                        "rng_state": self.rng.getstate(),
+                    })
+        finally:
+            if pool is not None:
+                pool.close()
         
+        if self.checkpointer and self.budget.stop_reason is None:
+            self.checkpointer.clear()
+
         # Step 3: Finalize and Return Results
         end_time = time.time()
         duration = end_time - start_time
+        self.generations_per_second = generations_run / duration if duration > 0 else 0.0
         
         return (
-            initial_schedule, 
-            best_ever_schedule, 
+            self.encoding.decode(initial_cells), 
+            self.encoding.decode(best_ever_cells), 
             best_ever_fitness, 
             score_history, 
             generations_run, 
             duration
-        )
\ No newline at end of file
+        )
@@ -1,76 +1,189 @@
 import time
-from typing import Optional
+from typing import Callable, Generator, Optional, Union
 from core.registry import Registry
 from core.schedule import Schedule
-from core.objective import ScheduleObjective
-from algorithm.neighbors import generate_neighbors
+from core.objective import ScheduleObjective, ObjectiveWeights
+from core.bounds import objective_lower_bound
+from core.rng import Seed, as_streams
+from algorithm.neighbors import iter_neighbors
+from algorithm.budget import SearchBudget, CancellationToken
+from algorithm.progress import ProgressReporter, ProgressEvent, drain
+from algorithm.history import new_history
+from algorithm.profiling import HotPathProfiler, create_profiler, profiled
+from algorithm.telemetry import SearchTelemetry, create_telemetry
+from algorithm.checkpoint import Checkpointer, schedule_dims, encode_schedule, decode_schedule
 
 
 class RandomRestartHillClimbing:
-    def __init__(self, registry: Registry, max_restarts: int, max_iterations_per_restart: Optional[int] = None):
+    def __init__(self, registry: Registry, max_restarts: int, max_iterations_per_restart: Optional[int] = None,
+                 time_budget: Optional[float] = None, max_evaluations: Optional[int] = None, cancel_token: Optional[CancellationToken] = None,
+                 progress_every: int = 1, on_progress: Optional[Callable[[ProgressEvent], None]] = None, history_size: Optional[int] = None, history_strategy: str = "recent",
+                 checkpoint_path: Optional[str] = None, checkpoint_interval: float = 5.0, resume: bool = False,
+                 objective_weights: Optional[ObjectiveWeights] = None, profile: Union[bool, HotPathProfiler] = False, telemetry: Union[bool, SearchTelemetry] = False, seed: Seed = None):
         self.registry = registry
         self.max_restarts = max_restarts
         self.max_iterations_per_restart = max_iterations_per_restart
-        self.objective = ScheduleObjective(registry)
+        self.objective = ScheduleObjective(registry, objective_weights)
+        self.lower_bound = objective_lower_bound(registry, self.objective.weights)  # Searches stop once they reach it
+        self.rng = as_streams(seed)
+        self.budget = SearchBudget(time_budget, max_evaluations, cancel_token)
+        self.progress = ProgressReporter(type(self).__name__, progress_every, on_progress)
+        self.profiler = create_profiler(profile, type(self).__name__)
+        self.telemetry = create_telemetry(telemetry)
+        self.history_size = history_size
+        self.history_strategy = history_strategy
+        self.checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+        self.resume = resume
     
     def run(self) -> tuple[Schedule, Schedule, float, list, int, float, list]:
+        return drain(profiled(self.run_iter(), self.profiler))
+
+    def run_iter(self) -> Generator[ProgressEvent, None, tuple[Schedule, Schedule, float, list, int, float, list]]:
+        """Run the search, yielding a ProgressEvent every `progress_every` iterations; returns the same tuple as run()."""
         start_time = time.time()
+        self.budget.start(self.objective)
+        self.progress.start(self.objective)
+        if self.telemetry is not None:
+            self.telemetry.reset()
         global_best_schedule = None
         global_best_score = float('inf')
         global_history = []  
         iterations_list = []
+        total_iterations = 0  # Iterations across all restarts, used for progress events
         
         initial_schedule = None
+        first_restart = 0
+        in_progress = None  # Unfinished restart restored from a checkpoint
         
-        for restart in range(self.max_restarts):
-            current = Schedule.random_initial_assignment(self.registry)
-            current_score = self.objective.evaluate(current)
-            
-            local_history = [current_score]  # History for this restart
-            
-            if restart == 0:
-                initial_schedule = current
-            
-            iteration = 0
+        def save_checkpoint(unfinished: Optional[dict]) -> None:
+            self.checkpointer.save(type(self).__name__, {
+                "dims": schedule_dims(initial_schedule),
+                "initial": encode_schedule(initial_schedule),
+                "best": encode_schedule(global_best_schedule) if global_best_schedule is not None else None,
+                "best_score": global_best_score,
+                "global_history": global_history,
+                "iterations_list": iterations_list,
+                "total_iterations": total_iterations,
+                "restarts_done": len(iterations_list),
+                "in_progress": unfinished,
+                "elapsed": time.time() - start_time,
+                "rng_state": self.rng.getstate(),
+            })
+        
+        state = self.checkpointer.load(type(self).__name__) if self.checkpointer and self.resume else None
+        if state is not None:
+            # Resume from checkpoint: finished restarts are kept, an unfinished one is continued
+            dims = state["dims"]
+            initial_schedule = decode_schedule(state["initial"], dims)
+            if state["best"] is not None:
+                global_best_schedule = decode_schedule(state["best"], dims)
+            global_best_score = state["best_score"]
+            global_history = state["global_history"]
+            iterations_list = state["iterations_list"]
+            total_iterations = state["total_iterations"]
+            first_restart = state["restarts_done"]
+            in_progress = state["in_progress"]
+            if in_progress is not None:
+                in_progress["current"] = decode_schedule(in_progress["current"], dims)
+            start_time -= state["elapsed"]
+            self.rng.setstate(state["rng_state"])
+        
+        interrupted = None  # Restart cut short by the budget, saved as unfinished
+        for restart in range(first_restart, self.max_restarts):
+            if in_progress is not None:
+                current = in_progress["current"]
+                current_score = in_progress["score"]
+                local_history = in_progress["history"]
+                iteration = in_progress["iteration"]
+                in_progress = None
+            else:
+                current = Schedule.random_initial_assignment(self.registry, self.rng.random)
+                current_score = self.objective.evaluate(current)
+                
+                local_history = new_history(self.history_size, self.history_strategy)  # History for this restart
+                local_history.append(current_score)
+                
+                if restart == 0:
+                    initial_schedule = current
+                
+                iteration = 0
             
+            stopped = False
             while self.max_iterations_per_restart is None or iteration < self.max_iterations_per_restart:
                 iteration += 1
                 
-                neighbors = generate_neighbors(current, self.registry)
-                
-                if not neighbors:
-                    break
-                
                 best_neighbor = None
                 best_score = current_score
                 
-                for neighbor in neighbors:
+                scanned = 0  # Neighbors are built lazily, so a budget stop skips the rest
+                for neighbor in iter_neighbors(current, self.registry):
+                    if self.budget.exhausted():
+                        break
+                    scanned += 1
                     score = self.objective.evaluate(neighbor)
+                    if self.telemetry is not None:
+                        self.telemetry.observe(score - current_score)
                     if score < best_score:
                         best_score = score
                         best_neighbor = neighbor
                 
+                if self.telemetry is not None:
+                    chosen = best_neighbor if best_neighbor is not None else current
+                    self.telemetry.end_iteration(total_iterations + 1, best_score, scanned,
+                                                 lambda: self.objective.build_state(chosen, count_evaluation=False))
+                
                 if best_neighbor is None:
+                    # A scan cut short by the budget is not a local optimum
+                    stopped = self.budget.exhausted()
                     break
                 
                 current = best_neighbor
                 current_score = best_score
                 local_history.append(current_score)
+                total_iterations += 1
+                if self.progress.due(total_iterations):
+                    yield self.progress.event(total_iterations, current_score, min(current_score, global_best_score))
                 
-                if current_score == 0:
+                if current_score <= self.lower_bound:
                     break
-            
-            iterations_list.append(iteration)
-            global_history.append(local_history)  # Append history of this restart
+                if self.budget.exhausted():
+                    stopped = True
+                    break
+                
+                # Save the unfinished restart periodically
+                if self.checkpointer and self.checkpointer.due():
+                    save_checkpoint({"current": encode_schedule(current), "score": current_score,
+                                     "history": local_history, "iteration": iteration})
             
             if current_score < global_best_score:
                 global_best_score = current_score
                 global_best_schedule = current
             
-            if global_best_score == 0:
+            if stopped and current_score > self.lower_bound:
+                # Not finished: kept as the unfinished restart of the final checkpoint
+                interrupted = {"current": encode_schedule(current), "score": current_score,
+                               "history": local_history, "iteration": iteration}
+                break
+            
+            iterations_list.append(iteration)
+            global_history.append(local_history)  # Append history of this restart
+            
+            # Per-restart results are always checkpointed once the restart finishes
+            if self.checkpointer:
+                save_checkpoint(None)
+            
+            if global_best_score <= self.lower_bound or self.budget.exhausted():
                 break
         
+        restarts_run = len(iterations_list) + (interrupted is not None)
+        if self.checkpointer:
+            # A budget stop always leaves a checkpoint to resume from; a completed run clears it
+            finished = interrupted is None and len(iterations_list) >= self.max_restarts
+            if self.budget.stop_reason is None or finished or global_best_score <= self.lower_bound:
+                self.checkpointer.clear()
+            else:
+                save_checkpoint(interrupted)
         end_time = time.time()
         duration = end_time - start_time
         
-        return initial_schedule, global_best_schedule, global_best_score, global_history, restart, duration, iterations_list
+        return initial_schedule, global_best_schedule, global_best_score, global_history, restarts_run, duration, iterations_list
@@ -1,52 +1,89 @@
-import random
 import time
-from typing import Optional
+from typing import Callable, Collection, Generator, Optional, Union
 from core.registry import Registry
 from core.schedule import Schedule
-from core.objective import ScheduleObjective
-from algorithm.neighbors import generate_neighbors
+from core.objective import ScheduleObjective, ObjectiveWeights
+from core.bounds import objective_lower_bound
+from core.rng import Seed, as_streams
+from algorithm.neighbors import iter_neighbors
+from algorithm.budget import SearchBudget, CancellationToken
+from algorithm.progress import ProgressReporter, ProgressEvent, drain
+from algorithm.history import new_history
+from algorithm.profiling import HotPathProfiler, create_profiler, profiled
+from algorithm.telemetry import SearchTelemetry, create_telemetry
 
 
 class SteepestAscentHillClimbing:
-    def __init__(self, registry: Registry, max_iterations: Optional[int] = None):
+    def __init__(self, registry: Registry, max_iterations: Optional[int] = None,
+                 time_budget: Optional[float] = None, max_evaluations: Optional[int] = None, cancel_token: Optional[CancellationToken] = None,
+                 progress_every: int = 1, on_progress: Optional[Callable[[ProgressEvent], None]] = None, history_size: Optional[int] = None, history_strategy: str = "recent",
+                 objective_weights: Optional[ObjectiveWeights] = None, profile: Union[bool, HotPathProfiler] = False, telemetry: Union[bool, SearchTelemetry] = False,
+                 initial_schedule: Optional[Schedule] = None, movable_meetings: Optional[Collection[int]] = None, seed: Seed = None):
         self.registry = registry
         self.max_iterations = max_iterations
-        self.objective = ScheduleObjective(registry)
+        self.objective = ScheduleObjective(registry, objective_weights)
+        self.lower_bound = objective_lower_bound(registry, self.objective.weights)  # Searches stop once they reach it
+        self.rng = as_streams(seed)
+        self.budget = SearchBudget(time_budget, max_evaluations, cancel_token)
+        self.progress = ProgressReporter(type(self).__name__, progress_every, on_progress)
+        self.profiler = create_profiler(profile, type(self).__name__)
+        self.telemetry = create_telemetry(telemetry)
+        self.initial_schedule = initial_schedule
+        self.movable_meetings = set(movable_meetings) if movable_meetings is not None else None
+        self.history_size = history_size
+        self.history_strategy = history_strategy
     
     def run(self) -> tuple[Schedule, Schedule, float, list, float, int]:
+        return drain(profiled(self.run_iter(), self.profiler))
+
+    def run_iter(self) -> Generator[ProgressEvent, None, tuple[Schedule, Schedule, float, list, float, int]]:
+        """Run the search, yielding a ProgressEvent every `progress_every` iterations; returns the same tuple as run()."""
         start_time = time.time()
-        initial_schedule = Schedule.random_initial_assignment(self.registry)
+        self.budget.start(self.objective)
+        self.progress.start(self.objective)
+        if self.telemetry is not None:
+            self.telemetry.reset()
+        initial_schedule = self.initial_schedule if self.initial_schedule is not None else Schedule.random_initial_assignment(self.registry, self.rng.random)
         current = initial_schedule
         current_score = self.objective.evaluate(current)
 
-        history = [current_score]
+        history = new_history(self.history_size, self.history_strategy)
+        history.append(current_score)
         iteration = 0
 
         while self.max_iterations is None or iteration < self.max_iterations:
             iteration += 1
 
-            neighbors = generate_neighbors(current, self.registry)
-
-            if not neighbors:
-                break
-
             best_neighbor = None
             best_score = current_score
 
-            for neighbor in neighbors:
+            scanned = 0  # Neighbors are built lazily, so a budget stop skips the rest
+            for neighbor in iter_neighbors(current, self.registry, self.movable_meetings):
+                if self.budget.exhausted():
+                    break
+                scanned += 1
                 score = self.objective.evaluate(neighbor)
+                if self.telemetry is not None:
+                    self.telemetry.observe(score - current_score)
                 if score < best_score:
                     best_score = score
                     best_neighbor = neighbor
 
+            if self.telemetry is not None:
+                chosen = best_neighbor if best_neighbor is not None else current
+                self.telemetry.end_iteration(iteration, best_score, scanned,
+                                             lambda: self.objective.build_state(chosen, count_evaluation=False))
+
             if best_neighbor is None:
                 break
 
             current = best_neighbor
             current_score = best_score
             history.append(current_score)
+            if self.progress.due(iteration):
+                yield self.progress.event(iteration, current_score, current_score)
 
-            if current_score == 0:
+            if current_score <= self.lower_bound or self.budget.exhausted():
                 break
 
         end_time = time.time()
@@ -1,37 +1,65 @@
-import random
 import copy
 import time
-from typing import Optional
+from typing import Callable, Collection, Generator, Optional, Union
 from core.registry import Registry
 from core.schedule import Schedule
-from core.objective import ScheduleObjective
-from .neighbors import generate_neighbors, generate_random_neighbor
+from core.objective import ScheduleObjective, ObjectiveWeights
+from core.bounds import objective_lower_bound
+from core.rng import Seed, as_streams
+from .neighbors import generate_random_neighbor
+from .budget import SearchBudget, CancellationToken
+from .progress import ProgressReporter, ProgressEvent, drain
+from .history import new_history
+from .profiling import HotPathProfiler, create_profiler, profiled
+from .telemetry import SearchTelemetry, create_telemetry
 
 class StochasticHillClimbing:
-    def __init__(self, registry: Registry, max_iterations: Optional[int] = None):
+    def __init__(self, registry: Registry, max_iterations: Optional[int] = None,
+                 time_budget: Optional[float] = None, max_evaluations: Optional[int] = None, cancel_token: Optional[CancellationToken] = None,
+                 progress_every: int = 1, on_progress: Optional[Callable[[ProgressEvent], None]] = None, history_size: Optional[int] = None, history_strategy: str = "recent",
+                 objective_weights: Optional[ObjectiveWeights] = None, profile: Union[bool, HotPathProfiler] = False, telemetry: Union[bool, SearchTelemetry] = False,
+                 initial_schedule: Optional[Schedule] = None, movable_meetings: Optional[Collection[int]] = None, seed: Seed = None):
         self.registry = registry
         self.max_iterations = max_iterations
-        self.objective = ScheduleObjective(registry)
+        self.objective = ScheduleObjective(registry, objective_weights)
+        self.lower_bound = objective_lower_bound(registry, self.objective.weights)  # Searches stop once they reach it
+        self.rng = as_streams(seed)
+        self.budget = SearchBudget(time_budget, max_evaluations, cancel_token)
+        self.progress = ProgressReporter(type(self).__name__, progress_every, on_progress)
+        self.profiler = create_profiler(profile, type(self).__name__)
+        self.telemetry = create_telemetry(telemetry)
+        self.initial_schedule = initial_schedule
+        self.movable_meetings = set(movable_meetings) if movable_meetings is not None else None
+        self.history_size = history_size
+        self.history_strategy = history_strategy
 
     def run(self) -> tuple[Schedule, Schedule, float, list, float, int]:
+        return drain(profiled(self.run_iter(), self.profiler))
+
+    def run_iter(self) -> Generator[ProgressEvent, None, tuple[Schedule, Schedule, float, list, float, int]]:
+        """Run the search, yielding a ProgressEvent every `progress_every` iterations; returns the same tuple as run()."""
         start_time = time.time()
-        initial_schedule = Schedule.random_initial_assignment(self.registry)
+        self.budget.start(self.objective)
+        self.progress.start(self.objective)
+        if self.telemetry is not None:
+            self.telemetry.reset()
+        initial_schedule = self.initial_schedule if self.initial_schedule is not None else Schedule.random_initial_assignment(self.registry, self.rng.random)
         current = initial_schedule
         current_score = self.objective.evaluate(current)
-        history = [current_score]
+        history = new_history(self.history_size, self.history_strategy)
+        history.append(current_score)
         iteration = 0
 
         while self.max_iterations is None or iteration < self.max_iterations:
             iteration += 1
 
-            neighbors = generate_neighbors(current, self.registry)
-
-            if not neighbors:
-                break
-
             # Pilih satu neighbor secara acak
-            next_schedule = random.choice(neighbors)
+            next_schedule = generate_random_neighbor(current, self.registry, self.movable_meetings, rng=self.rng.random)
+            if next_schedule is current:
+                break
             next_score = self.objective.evaluate(next_schedule)
+            if self.telemetry is not None:
+                self.telemetry.observe(next_score - current_score)
 
             # Hanya update jika neighbor lebih baik
             if next_score < current_score:
@@ -39,8 +67,13 @@ class StochasticHillClimbing:
                 current_score = next_score
 
             history.append(current_score)
+            if self.telemetry is not None:
+                self.telemetry.end_iteration(iteration, current_score,
+                                             state=lambda: self.objective.build_state(current, count_evaluation=False))
+            if self.progress.due(iteration):
+                yield self.progress.event(iteration, current_score, current_score)
 
-            if current_score == 0:
+            if current_score <= self.lower_bound or self.budget.exhausted():
                 break
 
         end_time = time.time()
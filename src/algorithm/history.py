@@ -0,0 +1,262 @@
+import struct
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+HISTORY_STRATEGIES = ("recent", "every_nth", "minmax", "improvement")
+
+_MAGIC = b"SCHH"
+_VERSION = 1
+
+
+class HistoryRecorder:
+    """
+    Bounded-memory recorder for per-iteration values (scores, acceptance probabilities).
+    Samples are stored in two preallocated arrays (iteration, value), so memory is
+    fixed at construction no matter how long the search runs.
+
+    Strategies:
+        recent:      ring buffer holding the last `capacity` samples
+        every_nth:   keep every n-th sample; when full, n doubles and the buffer is thinned
+        minmax:      keep the min and max of each bucket of n samples; when full, buckets double
+        improvement: keep only samples that improve on the best recorded value
+
+    The recorder behaves like a read-only list of the recorded values, so it can be
+    plotted or indexed like the plain history lists it replaces. The most recent sample
+    is always reported last, even if the strategy did not store it.
+    """
+
+    def __init__(self, capacity: int = 1024, strategy: str = "every_nth", every: int = 1):
+        """
+        Args:
+            capacity: Maximum number of stored samples
+            strategy: One of HISTORY_STRATEGIES
+            every: Initial sampling period (every_nth) or bucket size (minmax)
+        """
+        if strategy not in HISTORY_STRATEGIES:
+            raise ValueError(f"Unknown history strategy: {strategy}")
+        if capacity < 4:
+            raise ValueError("capacity must be at least 4")
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.capacity = capacity
+        self.strategy = strategy
+        self.every = every
+        self._iterations = array("q", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._count = 0
+        self._head = 0                                          # Ring start (recent strategy only)
+        self._seen = 0                                          # Samples offered so far
+        self._last: Optional[Tuple[int, float]] = None          # Most recent sample offered
+        self._best = float("inf")                               # Best stored value (improvement)
+        self._bucket: List[Tuple[int, float]] = []              # Pending (min, max) of the open bucket
+
+    # ---------- Recording ----------
+    def append(self, value: float) -> None:
+        """Offer the next sample; its iteration is the number of samples offered before it."""
+        iteration = self._seen
+        self._seen += 1
+        self._last = (iteration, float(value))
+
+        if self.strategy == "recent":
+            self._push_ring(iteration, value)
+        elif self.strategy == "every_nth":
+            if iteration % self.every == 0:
+                if self._count == self.capacity:
+                    self._thin_every_nth()
+                if iteration % self.every == 0:
+                    self._push(iteration, value)
+        elif self.strategy == "minmax":
+            self._offer_bucket(iteration, value)
+        else:
+            if value < self._best:
+                if self._count == self.capacity:
+                    self._thin_alternate()
+                self._best = value
+                self._push(iteration, value)
+
+    def _push(self, iteration: int, value: float) -> None:
+        self._iterations[self._count] = iteration
+        self._values[self._count] = value
+        self._count += 1
+
+    def _push_ring(self, iteration: int, value: float) -> None:
+        if self._count < self.capacity:
+            self._push(iteration, value)
+            return
+        self._iterations[self._head] = iteration
+        self._values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+
+    def _keep(self, indices: List[int]) -> None:
+        """Compact the stored samples down to the given (sorted) indices."""
+        for dst, src in enumerate(indices):
+            self._iterations[dst] = self._iterations[src]
+            self._values[dst] = self._values[src]
+        self._count = len(indices)
+
+    def _thin_every_nth(self) -> None:
+        self.every *= 2
+        self._keep([i for i in range(self._count) if self._iterations[i] % self.every == 0])
+
+    def _thin_alternate(self) -> None:
+        self._keep(list(range(0, self._count, 2)))
+
+    def _offer_bucket(self, iteration: int, value: float) -> None:
+        if not self._bucket:
+            self._bucket = [(iteration, value), (iteration, value)]
+        else:
+            if value < self._bucket[0][1]:
+                self._bucket[0] = (iteration, value)
+            if value > self._bucket[1][1]:
+                self._bucket[1] = (iteration, value)
+        if (iteration + 1) % self.every == 0:
+            self._flush_bucket()
+
+    def _flush_bucket(self) -> None:
+        points = sorted(set(self._bucket))
+        self._bucket = []
+        while self._count + len(points) > self.capacity:
+            self._merge_buckets()
+        for iteration, value in points:
+            self._push(iteration, value)
+
+    def _merge_buckets(self) -> None:
+        """Double the bucket size and reduce stored samples to the min/max of each new bucket."""
+        self.every *= 2
+        keep: List[int] = []
+        start = 0
+        while start < self._count:
+            bucket_id = self._iterations[start] // self.every
+            end = start
+            lo = hi = start
+            while end < self._count and self._iterations[end] // self.every == bucket_id:
+                if self._values[end] < self._values[lo]:
+                    lo = end
+                if self._values[end] > self._values[hi]:
+                    hi = end
+                end += 1
+            keep.extend(sorted({lo, hi}))
+            start = end
+        self._keep(keep)
+
+    # ---------- Reading ----------
+    def samples(self) -> List[Tuple[int, float]]:
+        """
+        Get the recorded samples in iteration order.
+
+        Returns:
+            List of (iteration, value) tuples, ending with the most recent sample
+        """
+        if self.strategy == "recent" and self._count == self.capacity:
+            order = [(self._head + k) % self.capacity for k in range(self._count)]
+        else:
+            order = range(self._count)
+        result = [(self._iterations[i], self._values[i]) for i in order]
+        for point in sorted(set(self._bucket)):
+            if not result or point[0] > result[-1][0]:
+                result.append(point)
+        if self._last is not None and (not result or result[-1][0] < self._last[0]):
+            result.append(self._last)
+        return result
+
+    def iterations(self) -> List[int]:
+        """Iteration index of each recorded value."""
+        return [i for i, _ in self.samples()]
+
+    def values(self) -> List[float]:
+        """Recorded values in iteration order."""
+        return [v for _, v in self.samples()]
+
+    @property
+    def total_samples(self) -> int:
+        """Number of samples offered, including those not stored."""
+        return self._seen
+
+    def __len__(self) -> int:
+        return len(self.samples())
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self.values())
+
+    def __getitem__(self, index):
+        return self.values()[index]
+
+    def __repr__(self) -> str:
+        return (f"HistoryRecorder(strategy={self.strategy!r}, stored={self._count}, "
+                f"capacity={self.capacity}, samples={self._seen})")
+
+
+def new_history(history_size: Optional[int] = None, strategy: str = "recent") -> Union[list, HistoryRecorder]:
+    """
+    Create a history container for one series.
+
+    Args:
+        history_size: Capacity of the recorder; None keeps every value in a plain list
+        strategy: Recording strategy used when history_size is given
+
+    Returns:
+        A list, or a HistoryRecorder when history_size is given
+    """
+    if history_size is None:
+        return []
+    return HistoryRecorder(capacity=history_size, strategy=strategy)
+
+
+def _series(history: Union[Sequence[float], HistoryRecorder]) -> Tuple[List[int], List[float]]:
+    if isinstance(history, HistoryRecorder):
+        samples = history.samples()
+        return [i for i, _ in samples], [v for _, v in samples]
+    return list(range(len(history))), [float(v) for v in history]
+
+
+def save_histories(file_path: str, histories: Dict[str, Union[Sequence[float], HistoryRecorder]]) -> None:
+    """
+    Write one or more history series to a compact binary file.
+    Layout: magic, version, series count, then per series its name, sample count,
+    int64 iterations and float64 values.
+
+    Args:
+        file_path: Destination file
+        histories: Mapping of series name to a list or HistoryRecorder
+    """
+    with open(file_path, "wb") as file:
+        file.write(_MAGIC + struct.pack("<BI", _VERSION, len(histories)))
+        for name, history in histories.items():
+            iterations, values = _series(history)
+            encoded = name.encode("utf-8")
+            file.write(struct.pack("<H", len(encoded)) + encoded)
+            file.write(struct.pack("<I", len(values)))
+            file.write(array("q", iterations).tobytes())
+            file.write(array("d", values).tobytes())
+
+
+def load_histories(file_path: str) -> Dict[str, Tuple[List[int], List[float]]]:
+    """
+    Read a file written by save_histories().
+
+    Returns:
+        Mapping of series name to (iterations, values)
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if data[:4] != _MAGIC:
+        raise ValueError(f"{file_path} is not a history file")
+    version, n_series = struct.unpack_from("<BI", data, 4)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported history file version: {version}")
+
+    offset = 9
+    histories = {}
+    for _ in range(n_series):
+        (name_len,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        name = data[offset:offset + name_len].decode("utf-8")
+        offset += name_len
+        (count,) = struct.unpack_from("<I", data, offset)
+        offset += 4
+        iterations = array("q", data[offset:offset + 8 * count])
+        offset += 8 * count
+        values = array("d", data[offset:offset + 8 * count])
+        offset += 8 * count
+        histories[name] = (iterations.tolist(), values.tolist())
+    return histories
@@ -0,0 +1,147 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+from core.registry import Registry
+from core.objective import ScheduleObjective, ConflictState, ObjectiveWeights
+from core.encoding import ScheduleEncoding
+from core.shared_registry import SharedRegistry, SharedRegistryHandle, attach
+from algorithm.telemetry import SearchTelemetry
+
+
+def local_search(cells: np.ndarray, grid: np.ndarray, state: ConflictState, encoding: ScheduleEncoding,
+                 steps: int, rng: np.random.Generator, telemetry: Optional[SearchTelemetry] = None,
+                 lower_bound: float = 0.0) -> int:
+    """
+    Bounded first-improvement local search on an encoded schedule, in place.
+    Each step picks a random unlocked meeting and a random cell in one of its legal
+    rooms, then moves it there (or swaps with the occupant); moves breaking a pin are skipped. The move is kept only if the
+    delta-evaluated score improves, otherwise it is undone. Stops early once the score
+    reaches lower_bound (see core.bounds).
+
+    Args:
+        cells: Meeting -> cell array (modified in place)
+        grid: Cell occupancy grid of `cells` (modified in place)
+        state: ConflictState of `cells` (modified in place)
+        encoding: Encoding of the schedule
+        steps: Number of attempted moves
+        rng: Random generator
+        telemetry: Receives the delta of every attempted move
+        lower_bound: Lower bound on the objective; no move can improve on it
+
+    Returns:
+        Number of improving moves applied
+    """
+    n_rooms = encoding.n_rooms
+    room_codes = encoding.classroom_codes
+    free_meetings = encoding.free_meetings
+    if free_meetings.size == 0:
+        return 0
+    legal_rooms = [np.flatnonzero(row) for row in encoding.legal_rooms]
+    pinned, legal_cells = encoding.pinned, encoding.legal_cells
+    meetings = free_meetings[rng.integers(free_meetings.size, size=steps)]
+    slots = rng.integers(encoding.n_slots, size=steps)
+    picks = rng.random(steps)
+    improvements = 0
+
+    for mid, slot, pick in zip(meetings.tolist(), slots.tolist(), picks.tolist()):
+        if state.score <= lower_bound:
+            break
+        rooms = legal_rooms[mid]
+        if rooms.size == 0:
+            continue
+        target = slot * n_rooms + int(rooms[int(pick * rooms.size)])
+        source = int(cells[mid])
+        if target == source or (pinned[mid] and not legal_cells[mid, target]):
+            continue
+        other = int(grid[target])
+        if other != -1 and pinned[other] and not legal_cells[other, source]:
+            continue
+        source_slot, source_room = divmod(source, n_rooms)
+        target_slot, target_room = divmod(target, n_rooms)
+        source_room, target_room = room_codes[source_room], room_codes[target_room]
+
+        delta = state.move(mid, source_slot, target_slot, source_room, target_room)
+        if other != -1:
+            delta += state.move(other, target_slot, source_slot, target_room, source_room)
+        if telemetry is not None:
+            telemetry.observe(delta)
+
+        if delta < 0:
+            cells[mid] = target
+            grid[target] = mid
+            grid[source] = other
+            if other != -1:
+                cells[other] = source
+            improvements += 1
+        else:
+            state.move(mid, target_slot, source_slot, target_room, source_room)
+            if other != -1:
+                state.move(other, source_slot, target_slot, source_room, target_room)
+    return improvements
+
+
+# ---------- Process pool ----------
+# Workers attach to the registry arrays in shared memory once (pool initializer) and
+# then only exchange position arrays with the parent.
+_worker: Optional[Tuple[ScheduleObjective, ScheduleEncoding, float]] = None
+
+
+def _init_worker(handle: SharedRegistryHandle, dims: Tuple[list, list], weights: Optional[ObjectiveWeights],
+                 lower_bound: float) -> None:
+    global _worker
+    arrays, masks = attach(handle)
+    _worker = (ScheduleObjective.from_arrays(arrays, weights), ScheduleEncoding.from_arrays(arrays, masks, *dims), lower_bound)
+
+
+def _improve(task: Tuple[np.ndarray, int, int]) -> np.ndarray:
+    cells, steps, seed = task
+    objective, encoding, lower_bound = _worker
+    state = objective.build_cell_state(cells.tolist(), encoding)
+    local_search(cells, encoding.grid(cells), state, encoding, steps, np.random.default_rng(seed), lower_bound=lower_bound)
+    return cells
+
+
+class LocalSearchPool:
+    """
+    Runs local_search() over many encoded schedules in a process pool.
+    Only position arrays cross the process boundary; the parent re-derives fitness
+    from its own cached ConflictStates, so results are identical to running in-process.
+    """
+
+    def __init__(self, registry: Registry, encoding: ScheduleEncoding, workers: int,
+                 weights: Optional[ObjectiveWeights] = None, lower_bound: float = 0.0):
+        """
+        Args:
+            registry: Registry the schedules belong to
+            encoding: Encoding of the schedules
+            workers: Number of worker processes
+            weights: Objective weights the workers score moves with
+            lower_bound: Score at which the workers stop searching, see local_search()
+        """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+        self.workers = workers
+        self.shared = SharedRegistry.from_registry(registry, encoding.classroom_codes, extra=encoding.masks())
+        dims = (list(encoding.days), encoding.hours)
+        self.executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.shared.handle, dims, weights, lower_bound))
+
+    def improve(self, population: List[np.ndarray], steps: int, seeds: List[int]) -> List[np.ndarray]:
+        """
+        Improve each schedule independently.
+
+        Args:
+            population: Meeting -> cell arrays
+            steps: Attempted moves per schedule
+            seeds: One random seed per schedule
+
+        Returns:
+            Improved arrays, in input order
+        """
+        chunksize = max(1, len(population) // (4 * self.workers))
+        tasks = [(cells, steps, seed) for cells, seed in zip(population, seeds)]
+        return list(self.executor.map(_improve, tasks, chunksize=chunksize))
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.shared.close()
@@ -1,57 +1,106 @@
 import random
+from typing import Collection, Iterator, Optional
 from core.registry import Registry
 from core.schedule import Schedule
 
 
-def generate_neighbors(schedule: Schedule, registry: Registry) -> list:
-    neighbors = []
-    placed_meetings = [registry.meetings[mid] for mid in schedule.where_is.keys()]
-    
-    for meeting in placed_meetings:
-        current_pos = schedule.get_position(meeting.meeting_id)
+def iter_neighbors(schedule: Schedule, registry: Registry, movable: Optional[Collection[int]] = None) -> Iterator[Schedule]:
+    """
+    All single-meeting moves to a free legal cell, built one at a time so a search can
+    stop (e.g. on its budget) without paying for the rest of the neighborhood.
+    Only meetings in `movable` move (None = all). Locked meetings never move and pinned
+    ones only to positions their pin allows.
+    """
+    days = schedule.days
+    hours = schedule.hours
+    for mid in list(schedule.where_is.keys()):
+        if movable is not None and mid not in movable:
+            continue
+        if mid in registry.locked_meetings:
+            continue
+        meeting = registry.meetings[mid]
+        pin = registry.pins.get(mid)
+        current_pos = schedule.get_position(mid)
         if current_pos is None:
             continue
-        
-        curr_day, curr_hour, curr_room = current_pos
-        legal_rooms = registry.legal_classrooms_by_meeting.get(meeting.meeting_id, [])
-        
-        days = schedule.days
-        hours = schedule.hours
+        legal_rooms = registry.legal_classrooms_by_meeting.get(mid, [])
         
         for day in days:
             for hour in hours:
                 if hour + meeting.duration_hours > max(hours) + 1:
                     continue
+                if pin is not None and not pin.allows(day, hour):
+                    continue
                 
                 required_hours = list(range(hour, hour + meeting.duration_hours))
                 if not all(h in hours for h in required_hours):
                     continue
                 
                 for room in legal_rooms:
-                    if (day, hour, room) == (curr_day, curr_hour, curr_room):
+                    if (day, hour, room) == current_pos:
                         continue
-                    
-                    can_move = True
-                    for h in required_hours:
-                        if not schedule.is_empty(day, h, room):
-                            can_move = False
-                            break
-                    
-                    if can_move:
-                        new_schedule = Schedule(days, hours, schedule.classroom_codes)
-                        
-                        for m in placed_meetings:
-                            pos = schedule.get_position(m.meeting_id)
-                            if pos and m.meeting_id != meeting.meeting_id:
-                                new_schedule.place(m.meeting_id, pos[0], pos[1], pos[2])
-                        
-                        new_schedule.place(meeting.meeting_id, day, hour, room)
-                        neighbors.append(new_schedule)
-    
-    return neighbors
-
-def generate_random_neighbor(schedule: Schedule, registry: Registry) -> Schedule:
-    neighbors = generate_neighbors(schedule, registry)
+                    if all(schedule.is_empty(day, h, room) for h in required_hours):
+                        yield _copy_with_move(schedule, mid, day, hour, room)
+
+
+def generate_neighbors(schedule: Schedule, registry: Registry, movable: Optional[Collection[int]] = None) -> list:
+    """All neighbors of iter_neighbors() as a list."""
+    return list(iter_neighbors(schedule, registry, movable))
+
+def _copy_with_move(schedule: Schedule, meeting_id: int, day, hour: int, room: str) -> Schedule:
+    new_schedule = Schedule(schedule.days, schedule.hours, schedule.classroom_codes)
+    for mid, pos in schedule.where_is.items():
+        if mid != meeting_id:
+            new_schedule.place(mid, pos[0], pos[1], pos[2])
+    new_schedule.place(meeting_id, day, hour, room)
+    return new_schedule
+
+
+def generate_random_neighbor(schedule: Schedule, registry: Registry, movable: Optional[Collection[int]] = None,
+                             attempts: int = 64, rng: Optional[random.Random] = None) -> Schedule:
+    """
+    One neighbor drawn uniformly from generate_neighbors() without building them all:
+    a meeting is chosen with weight equal to its number of candidate cells (pins narrow
+    the days and hours), then a cell uniformly, and occupied cells are rejected. Falls back to the full enumeration after
+    `attempts` rejections (nearly full schedules). Draws from `rng` (default: the random module).
+    """
+    rng = rng if rng is not None else random
+    days, hours = schedule.days, schedule.hours
+    hour_set = set(hours)
+    last_hour = max(hours)
+    candidates, weights = [], []
+    for mid in schedule.where_is:
+        if movable is not None and mid not in movable:
+            continue
+        if mid in registry.locked_meetings:
+            continue
+        rooms = registry.legal_classrooms_by_meeting.get(mid, [])
+        pin = registry.pins.get(mid)
+        if pin is None:
+            n_times = len(days) * len(hours)
+        else:
+            n_times = ((1 if pin.day in days else 0) if pin.day is not None else len(days)) * \
+                      ((1 if pin.hour in hour_set else 0) if pin.hour is not None else len(hours))
+        if rooms and n_times:
+            candidates.append(mid)
+            weights.append(len(rooms) * n_times)
+    if not candidates:
+        return schedule
+
+    for _ in range(attempts):
+        mid = rng.choices(candidates, weights)[0]
+        duration = registry.meetings[mid].duration_hours
+        pin = registry.pins.get(mid)
+        day = pin.day if pin is not None and pin.day is not None else rng.choice(days)
+        hour = pin.hour if pin is not None and pin.hour is not None else rng.choice(hours)
+        room = rng.choice(registry.legal_classrooms_by_meeting[mid])
+        if hour + duration > last_hour + 1 or (day, hour, room) == schedule.get_position(mid):
+            continue
+        required_hours = range(hour, hour + duration)
+        if all(h in hour_set and schedule.is_empty(day, h, room) for h in required_hours):
+            return _copy_with_move(schedule, mid, day, hour, room)
+
+    neighbors = generate_neighbors(schedule, registry, movable)
     if not neighbors:
         return schedule
-    return random.choice(neighbors)
+    return rng.choice(neighbors)
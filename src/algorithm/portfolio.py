@@ -0,0 +1,206 @@
+import inspect
+import math
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from core.registry import Registry
+from core.schedule import Schedule
+from core.rng import RandomStreams, Seed, as_streams
+from algorithm.budget import CancellationToken
+from algorithm.checkpoint import schedule_dims, encode_schedule, decode_schedule
+from algorithm.stimulated_annealing import SimulatedAnnealing
+from algorithm.hill_climbing_sideways import HillClimbingSidewaysMove
+from algorithm.hill_climbing_random_restart import RandomRestartHillClimbing
+from algorithm.genetic_algorithm import Genetic_Algorithm
+
+
+@dataclass
+class SolverConfig:
+    """One portfolio member: an algorithm class with its constructor and run() arguments."""
+    name: str
+    algorithm: type
+    params: Dict[str, Any] = field(default_factory=dict)        # Constructor keyword arguments
+    run_params: Dict[str, Any] = field(default_factory=dict)    # run() keyword arguments (e.g. mutation_rate)
+
+    @property
+    def resumable(self) -> bool:
+        """Whether the algorithm supports checkpoint/resume, so survivors continue instead of restarting."""
+        return "checkpoint_path" in inspect.signature(self.algorithm.__init__).parameters
+
+
+DEFAULT_PORTFOLIO: List[SolverConfig] = [
+    SolverConfig("sa_geometric", SimulatedAnnealing, {"cooling_schedule": "geometric", "cooling_rate": 0.995}),
+    SolverConfig("sa_adaptive", SimulatedAnnealing, {"cooling_schedule": "adaptive", "reheat_after": 5}),
+    SolverConfig("ga_elitist", Genetic_Algorithm, {"population_size": 50, "max_iteration": 10**9, "replacement": "elitist"},
+                 {"mutation_rate": 0.15}),
+    SolverConfig("ga_memetic", Genetic_Algorithm, {"population_size": 30, "max_iteration": 10**9, "replacement": "elitist",
+                                                   "local_search_steps": 50, "dedup": True}, {"mutation_rate": 0.1}),
+    SolverConfig("random_restart", RandomRestartHillClimbing, {"max_restarts": 10**9}),
+    SolverConfig("sideways", HillClimbingSidewaysMove, {"max_consecutive_sideways": 5, "max_total_sideways": 50}),
+]
+
+
+@dataclass
+class PortfolioResult:
+    """Outcome of a portfolio race."""
+    best_schedule: Optional[Schedule]
+    best_score: float
+    best_config: Optional[str]                                          # Name of the winning configuration
+    rounds: List[Dict[str, float]] = field(default_factory=list)        # Best score of every entrant, per round
+    duration: float = 0.0
+
+
+# ---------- Worker side ----------
+def _run_entry(registry: Registry, config: SolverConfig, seconds: float, checkpoint_path: Optional[str],
+               resume: bool, cancel_event: Any, results: Any, streams: RandomStreams) -> None:
+    # Every entrant runs on its own spawned streams (forked workers would otherwise share the parent's state)
+    params = dict(config.params, time_budget=seconds, cancel_token=CancellationToken(cancel_event), seed=streams)
+    if checkpoint_path is not None:
+        params.update(checkpoint_path=checkpoint_path, resume=resume)
+    solver = config.algorithm(registry, **params)
+    result = solver.run(**config.run_params)
+    best, best_score = result[1], result[2]
+    if best_score <= getattr(solver, "lower_bound", 0):
+        cancel_event.set()  # Optimal: stop every other entrant
+    if best is None:
+        results.put((config.name, float("inf"), None, None))
+    else:
+        results.put((config.name, best_score, encode_schedule(best), schedule_dims(best)))
+
+
+# ---------- Portfolio ----------
+class PortfolioSolver:
+    """
+    Races several algorithm configurations on one registry under a single time budget.
+
+    The budget is split into successive-halving rounds. In every round the surviving
+    entrants run concurrently in worker processes, each with an equal share of the
+    round's worker-seconds (entrants overrunning it are terminated); afterwards only
+    the best 1/eta of them (by best score so far) go on. Resumable algorithms (SA, random restart, GA) continue from their checkpoint
+    in the next round, the others start over with the larger share. An entrant reaching
+    its lower bound on the objective (see core.bounds) cancels the whole race.
+    """
+
+    def __init__(self, registry: Registry, time_budget: float, configs: Optional[List[SolverConfig]] = None,
+                 workers: Optional[int] = None, eta: int = 2, kill_grace: float = 1.0, seed: Seed = None):
+        """
+        Args:
+            registry: Registry to schedule
+            time_budget: Total wall-clock seconds for the race
+            configs: Entrants (default: DEFAULT_PORTFOLIO)
+            workers: Worker processes (default: one per entrant, at most os.cpu_count())
+            eta: Elimination factor; each round keeps ceil(alive / eta) entrants
+            kill_grace: Seconds an entrant may overrun its share before it is terminated
+            seed: Seed of the race; every entrant run gets spawned child streams, see core.rng
+        """
+        if time_budget <= 0:
+            raise ValueError("time_budget must be positive")
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.registry = registry
+        self.time_budget = time_budget
+        self.configs = list(configs) if configs is not None else list(DEFAULT_PORTFOLIO)
+        if not self.configs:
+            raise ValueError("configs must not be empty")
+        if len({config.name for config in self.configs}) != len(self.configs):
+            raise ValueError("config names must be unique")
+        self.workers = workers if workers is not None else min(len(self.configs), os.cpu_count() or 1)
+        self.eta = eta
+        self.kill_grace = kill_grace
+        self.rng = as_streams(seed)
+
+    @property
+    def n_rounds(self) -> int:
+        """Rounds needed to narrow the entrants down to one."""
+        return max(1, math.ceil(math.log(len(self.configs), self.eta)) + 1) if len(self.configs) > 1 else 1
+
+    def run(self) -> PortfolioResult:
+        start = time.monotonic()
+        deadline = start + self.time_budget
+        alive = list(self.configs)
+        best: Dict[str, Tuple[float, Optional[bytes], Optional[tuple]]] = {}
+        rounds: List[Dict[str, float]] = []
+        context = multiprocessing.get_context()
+        cancel_event = context.Event()
+
+        with tempfile.TemporaryDirectory(prefix="portfolio-") as checkpoint_dir:
+            for round_index in range(self.n_rounds):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or cancel_event.is_set():
+                    break
+                # Equal share of this round's worker-seconds; entrants beyond the worker count queue up
+                round_seconds = remaining / (self.n_rounds - round_index)
+                seconds = round_seconds / math.ceil(len(alive) / self.workers)
+
+                standings = self._race(context, alive, seconds, checkpoint_dir, round_index > 0, cancel_event)
+                for name, (score, encoded, dims) in standings.items():
+                    if name not in best or score < best[name][0]:
+                        best[name] = (score, encoded, dims)
+                rounds.append({name: result[0] for name, result in standings.items()})
+
+                # Successive halving on the best score reached so far
+                keep = max(1, math.ceil(len(alive) / self.eta))
+                alive = sorted(alive, key=lambda config: best[config.name][0])[:keep]
+
+        found = {name: entry for name, entry in best.items() if entry[1] is not None}
+        if not found:
+            return PortfolioResult(None, float("inf"), None, rounds, time.monotonic() - start)
+        winner = min(found, key=lambda name: found[name][0])
+        score, encoded, dims = found[winner]
+        return PortfolioResult(decode_schedule(encoded, dims), score, winner, rounds, time.monotonic() - start)
+
+    def _race(self, context: Any, entrants: List[SolverConfig], seconds: float, checkpoint_dir: str,
+              resume: bool, cancel_event: Any) -> Dict[str, Tuple[float, Optional[bytes], Optional[tuple]]]:
+        """
+        Run one round, at most `workers` entrants at a time.
+        An entrant still running `kill_grace` seconds after its share expired (a single
+        step can outlast the budget check) or crashing is recorded with score inf.
+        """
+        results = context.Queue()
+        pending = list(entrants)
+        running: Dict[str, Tuple[Any, float]] = {}      # name -> (process, kill time)
+        standings: Dict[str, Tuple[float, Optional[bytes], Optional[tuple]]] = {}
+
+        def collect(name: str, score: float, encoded: Optional[bytes], dims: Optional[tuple]) -> None:
+            if name in running:
+                standings[name] = (score, encoded, dims)
+                running.pop(name)[0].join()
+            elif name not in standings or score < standings[name][0]:
+                standings[name] = (score, encoded, dims)    # Queued just before the entrant was terminated
+
+        try:
+            while pending or running:
+                while pending and len(running) < self.workers:
+                    config = pending.pop(0)
+                    path = os.path.join(checkpoint_dir, f"{config.name}.ckpt") if config.resumable else None
+                    process = context.Process(target=_run_entry, daemon=True,
+                                              args=(self.registry, config, seconds, path, resume, cancel_event, results,
+                                                    self.rng.spawn(1)[0]))
+                    process.start()
+                    running[config.name] = (process, time.monotonic() + seconds + self.kill_grace)
+                # Drain every queued result before the kill sweep, so finished entrants are not terminated
+                try:
+                    collect(*results.get(timeout=0.05))
+                    while True:
+                        collect(*results.get_nowait())
+                except queue.Empty:
+                    pass
+                for name, (process, kill_at) in list(running.items()):
+                    if process.exitcode not in (None, 0) or time.monotonic() > kill_at:
+                        process.terminate()
+                        process.join()
+                        standings[name] = (float("inf"), None, None)
+                        del running[name]
+            try:
+                while True:
+                    collect(*results.get_nowait())
+            except queue.Empty:
+                pass
+        finally:
+            for process, _ in running.values():
+                process.terminate()
+        return standings
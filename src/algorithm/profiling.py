@@ -0,0 +1,252 @@
+import copy
+import cProfile
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Union
+from core.schedule import Schedule
+from core.objective import ScheduleObjective, ConflictState
+import algorithm.neighbors as neighbors
+
+# Instrumented functions: report name -> (owner, attribute). Module-level functions are
+# also replaced wherever they were imported by name (e.g. `from copy import deepcopy`).
+HOT_PATHS: Dict[str, Tuple[Any, str]] = {
+    "generate_neighbors": (neighbors, "generate_neighbors"),
+    "generate_random_neighbor": (neighbors, "generate_random_neighbor"),
+    "copy_with_move": (neighbors, "_copy_with_move"),      # One neighbor built by iter_neighbors()
+    "Schedule.place": (Schedule, "place"),
+    "ScheduleObjective.evaluate": (ScheduleObjective, "evaluate"),
+    "ConflictState.move": (ConflictState, "move"),
+    "copy.deepcopy": (copy, "deepcopy"),
+}
+
+# Only these packages are scanned for by-name imports of instrumented functions
+_PATCHED_PACKAGES = ("algorithm", "core", "utils", "__main__")
+
+_active: Optional["HotPathProfiler"] = None
+
+
+@dataclass
+class HotPathStats:
+    """Counters for one instrumented function."""
+    calls: int = 0
+    total_time: float = 0.0             # Cumulative seconds, including nested instrumented calls
+    allocated_bytes: int = 0            # Net traced memory growth (only with track_allocations)
+
+    @property
+    def mean_time(self) -> float:
+        return self.total_time / self.calls if self.calls else 0.0
+
+
+@dataclass
+class ProfileReport:
+    """Structured result of one profiled run."""
+    algorithm: str
+    duration: float                                             # Wall-clock seconds of the run
+    functions: Dict[str, HotPathStats] = field(default_factory=dict)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Plain-dict form (JSON serializable)."""
+        return {
+            "algorithm": self.algorithm,
+            "duration": self.duration,
+            "functions": {name: {"calls": s.calls, "total_time": s.total_time, "mean_time": s.mean_time,
+                                 "allocated_bytes": s.allocated_bytes}
+                          for name, s in self.functions.items()},
+        }
+
+    def format(self) -> str:
+        """Human-readable table, slowest function first."""
+        lines = [f"Profile of {self.algorithm} ({self.duration:.4f}s)",
+                 f"{'function':<28}{'calls':>10}{'total (s)':>12}{'% run':>8}{'mean (us)':>12}{'alloc (KiB)':>13}"]
+        for name, s in sorted(self.functions.items(), key=lambda item: -item[1].total_time):
+            share = 100 * s.total_time / self.duration if self.duration > 0 else 0.0
+            lines.append(f"{name:<28}{s.calls:>10}{s.total_time:>12.4f}{share:>8.1f}"
+                         f"{s.mean_time * 1e6:>12.1f}{s.allocated_bytes / 1024:>13.1f}")
+        return "\n".join(lines)
+
+
+class HotPathProfiler:
+    """
+    Opt-in instrumentation of the search hot paths (see HOT_PATHS).
+    While a profiling session is active the functions are replaced by counting wrappers;
+    outside a session nothing is patched, so a run without a profiler pays nothing.
+
+    Each wrapper counts calls and cumulative time, optionally the traced memory growth
+    (tracemalloc, noticeably slower) and the nesting of instrumented calls, which is
+    written as collapsed stacks for flamegraph tools. A full cProfile of the session can
+    be recorded as well and dumped in pstats format.
+    Only the current process is instrumented (worker pools are not).
+    """
+
+    def __init__(self, algorithm: str = "run", track_allocations: bool = False, use_cprofile: bool = False):
+        """
+        Args:
+            algorithm: Name used in the report and as the flamegraph root frame
+            track_allocations: Record net memory allocated by each function (uses tracemalloc)
+            use_cprofile: Also run cProfile over the whole session
+        """
+        self.algorithm = algorithm
+        self.track_allocations = track_allocations
+        self.use_cprofile = use_cprofile
+        self.stats: Dict[str, HotPathStats] = {}
+        self.stacks: Dict[Tuple[str, ...], float] = {}      # Stack of instrumented frames -> self time
+        self.duration = 0.0
+        self._stack: List[str] = []
+        self._top_level = [0.0]                                # Time inside outermost instrumented calls
+        self._patches: List[Tuple[Any, str, Any]] = []
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._started_tracemalloc = False
+        self._start = 0.0
+
+    # ---------- Session ----------
+    def start(self) -> None:
+        """Reset the counters and install the wrappers."""
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another HotPathProfiler session is already active")
+        _active = self
+        self.stats = {name: HotPathStats() for name in HOT_PATHS}
+        self.stacks = {}
+        self._stack = []
+        self._top_level = [0.0]
+        if self.track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        for name, (owner, attr) in HOT_PATHS.items():
+            self._patch(name, owner, attr)
+        if self.use_cprofile:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+        self._start = time.perf_counter()
+
+    def stop(self) -> ProfileReport:
+        """Remove the wrappers and return the report."""
+        global _active
+        self.duration = time.perf_counter() - self._start
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        for target, attr, original in reversed(self._patches):
+            setattr(target, attr, original)
+        self._patches = []
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        _active = None
+        return self.report()
+
+    def __enter__(self) -> "HotPathProfiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _patch(self, name: str, owner: Any, attr: str) -> None:
+        original = owner.__dict__[attr] if isinstance(owner, type) else getattr(owner, attr)
+        wrapper = self._wrap(name, original)
+        targets = [owner]
+        if not isinstance(owner, type):
+            # Rebind names imported with `from module import function` as well
+            for module_name, module in list(sys.modules.items()):
+                if module is not owner and module_name.split(".")[0] in _PATCHED_PACKAGES \
+                        and getattr(module, attr, None) is original:
+                    targets.append(module)
+        for target in targets:
+            self._patches.append((target, attr, original))
+            setattr(target, attr, wrapper)
+
+    def _wrap(self, name: str, function: Callable) -> Callable:
+        stats = self.stats[name]
+        stack = self._stack
+        stacks = self.stacks
+        clock = time.perf_counter
+        root = self.algorithm
+        track_allocations = self.track_allocations
+        top_level = self._top_level
+
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            if stack and stack[-1] == name:
+                # Recursive call (copy.deepcopy recurses through its module global): counted once
+                return function(*args, **kwargs)
+            stack.append(name)
+            before = tracemalloc.get_traced_memory()[0] if track_allocations else 0
+            start = clock()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                stats.calls += 1
+                stats.total_time += elapsed
+                if track_allocations:
+                    stats.allocated_bytes += max(0, tracemalloc.get_traced_memory()[0] - before)
+                key = (root, *stack)
+                stacks[key] = stacks.get(key, 0.0) + elapsed
+                stack.pop()
+                if stack:
+                    # Exclude the nested call from the caller's self time
+                    parent = (root, *stack)
+                    stacks[parent] = stacks.get(parent, 0.0) - elapsed
+                else:
+                    top_level[0] += elapsed
+        return wrapper
+
+    # ---------- Output ----------
+    def report(self) -> ProfileReport:
+        """Report of the last (or current) session."""
+        return ProfileReport(self.algorithm, self.duration,
+                             {name: s for name, s in self.stats.items() if s.calls})
+
+    def dump_stats(self, path: str) -> None:
+        """Write the cProfile data in pstats format (requires use_cprofile=True)."""
+        if self._cprofile is None:
+            raise RuntimeError("cProfile was not enabled for this profiler")
+        self._cprofile.dump_stats(path)
+
+    def write_collapsed(self, path: str) -> None:
+        """
+        Write instrumented self time as collapsed stacks ("a;b;c <microseconds>" per line),
+        the input format of flamegraph.pl, speedscope and inferno.
+        Time outside instrumented functions is reported on the root frame.
+        """
+        stacks = dict(self.stacks)
+        stacks[(self.algorithm,)] = max(0.0, self.duration - self._top_level[0])
+        with open(path, "w") as f:
+            for stack, seconds in stacks.items():
+                micros = int(round(seconds * 1e6))
+                if micros > 0:
+                    f.write(f"{';'.join(stack)} {micros}\n")
+
+
+def create_profiler(profile: Union[bool, HotPathProfiler, None], algorithm: str) -> Optional[HotPathProfiler]:
+    """
+    Resolve an algorithm's `profile` argument.
+
+    Args:
+        profile: False/None (off), True (default profiler) or a configured HotPathProfiler
+        algorithm: Name given to a default profiler
+
+    Returns:
+        The profiler to use, or None when profiling is off
+    """
+    if isinstance(profile, HotPathProfiler):
+        return profile
+    return HotPathProfiler(algorithm) if profile else None
+
+
+def profiled(events: Generator, profiler: Optional[HotPathProfiler]) -> Generator:
+    """
+    Run a run_iter() generator inside a profiling session.
+    Returns the generator unchanged when profiler is None.
+    """
+    if profiler is None:
+        return events
+    return _profiled(events, profiler)
+
+
+def _profiled(events: Generator, profiler: HotPathProfiler) -> Generator:
+    with profiler:
+        return (yield from events)
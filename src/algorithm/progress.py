@@ -0,0 +1,98 @@
+import time
+from dataclasses import dataclass
+from typing import Callable, Generator, Optional
+from core.objective import ScheduleObjective
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """Snapshot of a running search, emitted every N iterations."""
+    algorithm: str                      # Name of the emitting algorithm class
+    iteration: int                      # Iteration (or generation) number
+    current_score: float                # Score of the current state
+    best_score: float                   # Best score found so far
+    temperature: Optional[float]        # Current temperature (Simulated Annealing only)
+    evaluations: int                    # Objective evaluations since the run started
+    elapsed: float                      # Seconds since the run started
+
+    @property
+    def evals_per_second(self) -> float:
+        return self.evaluations / self.elapsed if self.elapsed > 0 else 0.0
+
+    @property
+    def iterations_per_second(self) -> float:
+        """Iterations (generations for the GA) per second since the run started."""
+        return self.iteration / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class ProgressReporter:
+    """
+    Builds ProgressEvents for one algorithm run and forwards them to an optional callback.
+    Algorithms ask due() every iteration and only build an event when it returns True,
+    so the cost of reporting is one modulo when no event is due.
+    """
+
+    def __init__(self, algorithm: str, every: int = 1, callback: Optional[Callable[[ProgressEvent], None]] = None):
+        """
+        Args:
+            algorithm: Name reported in every event
+            every: Emit one event every `every` iterations
+            callback: Observer called with each event as it is emitted
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.algorithm = algorithm
+        self.every = every
+        self.callback = callback
+        self.objective: Optional[ScheduleObjective] = None
+        self._start_time = 0.0
+        self._start_evaluations = 0
+
+    def start(self, objective: ScheduleObjective) -> None:
+        """Reset the clock and evaluation counter for a new run."""
+        self.objective = objective
+        self._start_time = time.monotonic()
+        self._start_evaluations = objective.evaluations
+
+    def due(self, iteration: int) -> bool:
+        """Check whether an event should be emitted at this iteration."""
+        return iteration % self.every == 0
+
+    def event(self, iteration: int, current_score: float, best_score: float,
+              temperature: Optional[float] = None) -> ProgressEvent:
+        """
+        Build an event and pass it to the callback.
+
+        Returns:
+            The emitted ProgressEvent
+        """
+        evaluations = self.objective.evaluations - self._start_evaluations if self.objective else 0
+        event = ProgressEvent(
+            algorithm=self.algorithm,
+            iteration=iteration,
+            current_score=current_score,
+            best_score=best_score,
+            temperature=temperature,
+            evaluations=evaluations,
+            elapsed=time.monotonic() - self._start_time,
+        )
+        if self.callback is not None:
+            self.callback(event)
+        return event
+
+
+def drain(events: Generator[ProgressEvent, None, tuple]) -> tuple:
+    """
+    Exhaust a run_iter() generator and return its final result tuple.
+
+    Args:
+        events: Generator returned by an algorithm's run_iter()
+
+    Returns:
+        The value returned by the generator (the algorithm's result tuple)
+    """
+    while True:
+        try:
+            next(events)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,81 @@
+import random
+from typing import Optional, Set, Tuple
+from core.registry import Registry, RegistryUpdate
+from core.schedule import Schedule
+from core.rng import as_streams
+from algorithm.stimulated_annealing import SimulatedAnnealing
+
+# Algorithms accepting initial_schedule / movable_meetings
+WARM_START_ALGORITHMS = ("SteepestAscentHillClimbing", "StochasticHillClimbing", "SimulatedAnnealing", "HillClimbingSidewaysMove")
+
+
+def carry_over(schedule: Schedule, registry: Registry, update: Optional[RegistryUpdate] = None,
+               rng: Optional[random.Random] = None) -> Tuple[Schedule, Set[int]]:
+    """
+    Starting state for re-optimizing a previous schedule after Registry.apply_changes().
+    Surviving meetings keep their positions (under their current ids), deleted meetings
+    are dropped and meetings without a position are put into free cells, in one of
+    their legal rooms when possible; pinned ones always at a position their pin allows.
+
+    Args:
+        schedule: Previous schedule (e.g. from utils.schedule_export), in previous meeting ids
+        registry: Registry after the update
+        update: Result of apply_changes() (None if the registry did not change)
+        rng: Random generator for the free cells (default: the random module)
+
+    Returns:
+        (new schedule, ids of the meetings that were newly placed)
+
+    Raises:
+        ValueError: If no free position matches the pin of a meeting to place
+    """
+    carried = Schedule(schedule.days, schedule.hours, schedule.classroom_codes)
+    for previous_id, (day, hour, room) in schedule.where_is.items():
+        mid = update.current_id(previous_id) if update is not None else previous_id
+        if mid is not None and mid in registry.meetings:
+            carried.place(mid, day, hour, room)
+
+    placed: Set[int] = set()
+    free = carried.all_free_positions()
+    (rng if rng is not None else random).shuffle(free)
+    missing = [mid for mid in registry.meetings if mid not in carried.where_is]
+    pinned = Schedule.pin_order(registry, [mid for mid in missing if mid in registry.pins], free)
+    for mid in pinned:
+        position = Schedule.take_pinned_position(free, mid, registry.pins[mid], registry.legal_classrooms_by_meeting.get(mid))
+        carried.place(mid, *position)
+        placed.add(mid)
+    for mid in missing:
+        if mid in registry.pins or not free:
+            continue
+        legal = set(registry.legal_classrooms_by_meeting.get(mid, []))
+        index = next((i for i, (day, hour, room) in enumerate(free) if room in legal), len(free) - 1)
+        day, hour, room = free.pop(index)
+        carried.place(mid, day, hour, room)
+        placed.add(mid)
+    return carried, placed
+
+
+def reoptimize(registry: Registry, schedule: Schedule, update: Optional[RegistryUpdate] = None,
+               algorithm: type = SimulatedAnnealing, **params) -> tuple:
+    """
+    Incrementally re-solve after enrollment changes: start from the previous schedule and
+    move only the meetings the update touched (plus any newly placed ones); everything
+    else stays pinned where it was.
+
+    Args:
+        registry: Registry after apply_changes()
+        schedule: Previous schedule
+        update: Result of apply_changes() (None re-optimizes nothing but unplaced meetings)
+        algorithm: One of WARM_START_ALGORITHMS
+        **params: Further constructor arguments of the algorithm; `seed` also seeds carry_over()
+
+    Returns:
+        The algorithm's run() result tuple
+    """
+    if algorithm.__name__ not in WARM_START_ALGORITHMS:
+        raise ValueError(f"{algorithm.__name__} does not support warm starts")
+    streams = as_streams(params.pop("seed", None))
+    start, placed = carry_over(schedule, registry, update, rng=streams.random)
+    movable = placed | (update.affected if update is not None else set())
+    solver = algorithm(registry, initial_schedule=start, movable_meetings=movable, seed=streams, **params)
+    return solver.run()
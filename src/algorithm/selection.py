@@ -0,0 +1,53 @@
+import numpy as np
+
+SELECTION_METHODS = ("tournament", "rank", "roulette")
+
+
+# ---------- Vectorized parent selection ----------
+# Each function takes the population fitness vector (lower is better) and returns
+# the indices of the selected parents, drawing all of them in one call.
+
+def tournament_indices(fitness: np.ndarray, num_parents: int, tournament_size: int,
+                       rng: np.random.Generator) -> np.ndarray:
+    """Winners of num_parents tournaments of tournament_size contestants (drawn with replacement)."""
+    contestants = rng.integers(fitness.size, size=(num_parents, max(1, tournament_size)))
+    winners = np.argmin(fitness[contestants], axis=1)
+    return contestants[np.arange(num_parents), winners]
+
+
+def rank_indices(fitness: np.ndarray, num_parents: int, rng: np.random.Generator) -> np.ndarray:
+    """Linear rank selection: the best of n individuals has weight n, the worst weight 1."""
+    n = fitness.size
+    ranks = np.empty(n, dtype=np.float64)
+    ranks[np.argsort(fitness, kind="stable")] = np.arange(n, 0, -1)
+    return rng.choice(n, size=num_parents, p=ranks / ranks.sum())
+
+
+def roulette_indices(fitness: np.ndarray, num_parents: int, rng: np.random.Generator) -> np.ndarray:
+    """Fitness-proportionate selection for minimization, weights 1 / (1 + fitness)."""
+    weights = 1.0 / (1.0 + np.maximum(fitness, 0.0))
+    return rng.choice(fitness.size, size=num_parents, p=weights / weights.sum())
+
+
+def select_indices(kind: str, fitness: np.ndarray, num_parents: int, rng: np.random.Generator,
+                   tournament_size: int = 2) -> np.ndarray:
+    """
+    Select parent indices with the given method.
+
+    Args:
+        kind: One of SELECTION_METHODS
+        fitness: Fitness of every individual (lower is better)
+        num_parents: Number of parents to select
+        rng: Random generator
+        tournament_size: Contestants per tournament (tournament selection only)
+
+    Returns:
+        int array of num_parents population indices
+    """
+    if kind == "tournament":
+        return tournament_indices(fitness, num_parents, tournament_size, rng)
+    if kind == "rank":
+        return rank_indices(fitness, num_parents, rng)
+    if kind == "roulette":
+        return roulette_indices(fitness, num_parents, rng)
+    raise ValueError(f"Unknown selection method: {kind}")
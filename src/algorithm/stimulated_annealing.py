@@ -1,44 +1,147 @@
-import random
 import math
 import copy
 import time
-from typing import Optional
+from typing import Callable, Collection, Generator, Optional, Union
 from core.registry import Registry
 from core.schedule import Schedule
-from core.objective import ScheduleObjective
+from core.objective import ScheduleObjective, ObjectiveWeights
+from core.bounds import objective_lower_bound
+from core.rng import Seed, as_streams
 from algorithm.neighbors import generate_random_neighbor
+from algorithm.budget import SearchBudget, CancellationToken
+from algorithm.progress import ProgressReporter, ProgressEvent, drain
+from algorithm.history import new_history
+from algorithm.profiling import HotPathProfiler, create_profiler, profiled
+from algorithm.telemetry import SearchTelemetry, create_telemetry
+from algorithm.checkpoint import Checkpointer, schedule_dims, encode_schedule, decode_schedule
+from algorithm.cooling import CoolingSchedule, create_cooling_schedule, calibrate_initial_temp
 
 
 class SimulatedAnnealing:
-	def __init__(self, registry: Registry, max_iterations: Optional[int] = None, initial_temp: float = 100.0, cooling_rate: float = 0.99, random_func: Optional[callable] = None):
+	def __init__(self, registry: Registry, max_iterations: Optional[int] = None, initial_temp: Optional[float] = None, cooling_rate: float = 0.99, random_func: Optional[callable] = None,
+			cooling_schedule: str | CoolingSchedule = "geometric", stuck_threshold: int = 50, reheat_after: Optional[int] = None, reheat_ratio: float = 0.5,
+			calibration_samples: int = 30, initial_acceptance: float = 0.8,
+			time_budget: Optional[float] = None, max_evaluations: Optional[int] = None, cancel_token: Optional[CancellationToken] = None,
+			progress_every: int = 1, on_progress: Optional[Callable[[ProgressEvent], None]] = None, history_size: Optional[int] = None, history_strategy: str = "recent",
+			checkpoint_path: Optional[str] = None, checkpoint_interval: float = 5.0, resume: bool = False,
+			objective_weights: Optional[ObjectiveWeights] = None, profile: Union[bool, HotPathProfiler] = False, telemetry: Union[bool, SearchTelemetry] = False,
+			initial_schedule: Optional[Schedule] = None, movable_meetings: Optional[Collection[int]] = None, seed: Seed = None):
+		"""
+		Args:
+			initial_temp: Starting temperature; None calibrates it from sampled neighbor deltas
+			cooling_schedule: Schedule name (see algorithm.cooling.COOLING_SCHEDULES) or instance
+			stuck_threshold: Non-improving iterations that count as one stuck event
+			reheat_after: Stuck events before reheating (None disables reheating)
+			reheat_ratio: Reheat temperature as a fraction of the starting temperature
+			calibration_samples: Neighbors sampled when calibrating initial_temp
+			initial_acceptance: Target acceptance probability of worsening moves at the start
+			time_budget, max_evaluations, cancel_token: Stopping limits, see algorithm.budget.SearchBudget
+			progress_every, on_progress: Progress event period and observer, see algorithm.progress
+			history_size: Capacity of the bounded history recorders (None keeps every entry in a list)
+			history_strategy: Recording strategy, see algorithm.history.HISTORY_STRATEGIES
+			checkpoint_path: Write periodic checkpoints to this file (None disables checkpointing)
+			checkpoint_interval: Minimum seconds between checkpoints
+			resume: Continue from checkpoint_path if it exists
+			objective_weights: Soft-constraint weights, see core.objective.ObjectiveWeights (None = ObjectiveWeights.for_registry)
+			profile: Instrument hot paths during run(): True or a configured algorithm.profiling.HotPathProfiler
+			telemetry: Record per-iteration search analytics: True or a configured algorithm.telemetry.SearchTelemetry
+			initial_schedule: Warm start from this schedule instead of a random assignment
+			movable_meetings: Only these meetings are moved (None moves all), see algorithm.reoptimize
+			seed: Integer seed, SeedSequence or RandomStreams of the run's random streams (None = drawn from the random module), see core.rng
+		"""
 		self.registry = registry
 		self.max_iterations = max_iterations
 		self.initial_temp = initial_temp
 		self.cooling_rate = cooling_rate
-		self.objective = ScheduleObjective(registry)
-		self.random_func = random_func if random_func is not None else random.random
+		self.objective = ScheduleObjective(registry, objective_weights)
+		self.lower_bound = objective_lower_bound(registry, self.objective.weights)  # Searches stop once they reach it
+		self.rng = as_streams(seed)
+		self.random_func = random_func if random_func is not None else self.rng.random.random
+		if isinstance(cooling_schedule, str):
+			cooling_schedule = create_cooling_schedule(cooling_schedule, cooling_rate)
+		self.cooling_schedule = cooling_schedule
+		self.stuck_threshold = stuck_threshold
+		self.reheat_after = reheat_after
+		self.reheat_ratio = reheat_ratio
+		self.calibration_samples = calibration_samples
+		self.initial_acceptance = initial_acceptance
+		self.reheat_count = 0
+		self.budget = SearchBudget(time_budget, max_evaluations, cancel_token)
+		self.progress = ProgressReporter(type(self).__name__, progress_every, on_progress)
+		self.profiler = create_profiler(profile, type(self).__name__)
+		self.telemetry = create_telemetry(telemetry)
+		self.initial_schedule = initial_schedule
+		self.movable_meetings = set(movable_meetings) if movable_meetings is not None else None
+		self.history_size = history_size
+		self.history_strategy = history_strategy
+		self.checkpointer = Checkpointer(checkpoint_path, checkpoint_interval) if checkpoint_path else None
+		self.resume = resume
+
+	def calibrate_temperature(self, schedule: Schedule, score: float) -> float:
+		"""Estimate a starting temperature from a sample of neighbor deltas."""
+		sample = [generate_random_neighbor(schedule, self.registry, self.movable_meetings, rng=self.rng.random) for _ in range(self.calibration_samples)]
+		sample = [n for n in sample if n is not schedule]
+		if not sample:
+			return 1.0
+		deltas = [self.objective.evaluate(n) - score for n in sample]
+		return calibrate_initial_temp(deltas, self.initial_acceptance)
 	
 	def run(self) -> tuple[Schedule, Schedule, float, list, list, int, float]:
+		return drain(profiled(self.run_iter(), self.profiler))
+
+	def run_iter(self) -> Generator[ProgressEvent, None, tuple[Schedule, Schedule, float, list, list, int, float]]:
+		"""Run the search, yielding a ProgressEvent every `progress_every` iterations; returns the same tuple as run()."""
 		start_time = time.time()
-		initial_schedule = Schedule.random_initial_assignment(self.registry)
-		current = initial_schedule
-		current_score = self.objective.evaluate(current)
-		best = copy.deepcopy(current)
-		best_score = current_score
-		temp = self.initial_temp
-		
-		history = [current_score]
-		acceptance_history = []
-		stuck_count = 0
-		iterations_without_improvement = 0
-		iteration = 0
+		self.budget.start(self.objective)
+		self.progress.start(self.objective)
+		if self.telemetry is not None:
+			self.telemetry.reset()
+		state = self.checkpointer.load(type(self).__name__) if self.checkpointer and self.resume else None
+		if state is not None:
+			# Resume from checkpoint
+			dims = state["dims"]
+			initial_schedule = decode_schedule(state["initial"], dims)
+			current = decode_schedule(state["current"], dims)
+			best = decode_schedule(state["best"], dims)
+			current_score, best_score = state["current_score"], state["best_score"]
+			start_temp, temp = state["start_temp"], state["temp"]
+			self.cooling_schedule = state["cooling_schedule"]
+			self.reheat_count = state["reheat_count"]
+			history, acceptance_history = state["history"], state["acceptance_history"]
+			stuck_count = state["stuck_count"]
+			iterations_without_improvement = state["iterations_without_improvement"]
+			iteration = state["iteration"]
+			start_time -= state["elapsed"]
+			self.rng.setstate(state["rng_state"])
+		else:
+			initial_schedule = self.initial_schedule if self.initial_schedule is not None else Schedule.random_initial_assignment(self.registry, self.rng.random)
+			current = initial_schedule
+			current_score = self.objective.evaluate(current)
+			best = copy.deepcopy(current)
+			best_score = current_score
+			start_temp = self.initial_temp
+			if start_temp is None:
+				start_temp = self.calibrate_temperature(current, current_score)
+			temp = self.cooling_schedule.start(start_temp)
+			self.reheat_count = 0
+			
+			history = new_history(self.history_size, self.history_strategy)
+			history.append(current_score)
+			# Acceptance probabilities don't improve over time; sample them instead
+			acceptance_strategy = "every_nth" if self.history_strategy == "improvement" else self.history_strategy
+			acceptance_history = new_history(self.history_size, acceptance_strategy)
+			stuck_count = 0
+			iterations_without_improvement = 0
+			iteration = 0
 
 		while self.max_iterations is None or iteration < self.max_iterations:
 			iteration += 1
 			
-			neighbor = generate_random_neighbor(current, self.registry)
+			neighbor = generate_random_neighbor(current, self.registry, self.movable_meetings, rng=self.rng.random)
 			neighbor_score = self.objective.evaluate(neighbor)
 			delta = neighbor_score - current_score
+			if self.telemetry is not None:
+				self.telemetry.observe(delta)
 			
 			if delta < 0:
 				acceptance_prob = 1.0
@@ -47,7 +150,8 @@ class SimulatedAnnealing:
 			
 			acceptance_history.append(acceptance_prob)
 
-			if delta < 0 or self.random_func() < acceptance_prob:
+			accepted = delta < 0 or self.random_func() < acceptance_prob
+			if accepted:
 				current = neighbor
 				current_score = neighbor_score
 				
@@ -61,16 +165,52 @@ class SimulatedAnnealing:
 				iterations_without_improvement += 1
 			
 			history.append(current_score)
+			if self.telemetry is not None:
+				self.telemetry.end_iteration(iteration, current_score,
+											 state=lambda: self.objective.build_state(current, count_evaluation=False))
+			if self.progress.due(iteration):
+				yield self.progress.event(iteration, current_score, best_score, temp)
 			
-			if iterations_without_improvement >= 50:
+			reheat = False
+			if iterations_without_improvement >= self.stuck_threshold:
 				stuck_count += 1
 				iterations_without_improvement = 0
+				reheat = self.reheat_after is not None and stuck_count % self.reheat_after == 0
+			
+			if reheat:
+				temp = self.cooling_schedule.start(max(start_temp * self.reheat_ratio, temp))
+				self.reheat_count += 1
+			else:
+				temp = self.cooling_schedule.next_temp(temp, accepted)
 			
-			temp *= self.cooling_rate
+			stop = best_score <= self.lower_bound or self.budget.exhausted()
+			# Checkpoint periodically, and on budget stops so the run can be resumed
+			if self.checkpointer and (self.budget.stop_reason or self.checkpointer.due()):
+				self.checkpointer.save(type(self).__name__, {
+					"dims": schedule_dims(current),
+					"initial": encode_schedule(initial_schedule),
+					"current": encode_schedule(current),
+					"best": encode_schedule(best),
+					"current_score": current_score,
+					"best_score": best_score,
+					"start_temp": start_temp,
+					"temp": temp,
+					"cooling_schedule": self.cooling_schedule,
+					"reheat_count": self.reheat_count,
+					"history": history,
+					"acceptance_history": acceptance_history,
+					"stuck_count": stuck_count,
+					"iterations_without_improvement": iterations_without_improvement,
+					"iteration": iteration,
+					"elapsed": time.time() - start_time,
+					"rng_state": self.rng.getstate(),
+				})
 			
-			if best_score == 0:
+			if stop:
 				break
 		
+		if self.checkpointer and self.budget.stop_reason is None:
+			self.checkpointer.clear()
 		end_time = time.time()
 		duration = end_time - start_time
 
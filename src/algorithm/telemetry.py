@@ -0,0 +1,200 @@
+import csv
+import math
+from array import array
+from typing import Callable, Dict, List, Optional, Union
+import numpy as np
+from core.bounds import DAYS, HOURS
+from core.objective import ConflictState
+
+# Trajectory columns, in output order (distribution columns follow, see SearchTelemetry.columns)
+TRAJECTORY_COLUMNS = ("iteration", "score", "neighborhood_size", "evaluated", "improving", "sideways", "worsening",
+                      "improving_fraction", "sideways_fraction", "worsening_fraction")
+
+_SIDEWAYS_TOLERANCE = 1e-9     # Weighted scores are floats: smaller deltas count as sideways
+
+
+class SearchTelemetry:
+    """
+    Opt-in analytics of a search trajectory, collected from the delta-evaluation path and
+    written as columns (numpy .npz or CSV) for offline analysis.
+
+    Algorithms report the score delta of every candidate they evaluate (observe()) and
+    close each iteration with end_iteration(). Every `every` iterations a row aggregates
+    the window: mean neighborhood size (NaN where the neighborhood is sampled rather than
+    enumerated, e.g. SA), candidates evaluated, and how many of them were improving,
+    sideways or worsening. Every `distribution_every` rows the conflict distributions of
+    the current schedule are read from its ConflictState: student conflicts per timeslot
+    (one column per day and hour) and a histogram of conflicts per conflicted student.
+    Other rows hold NaN there.
+
+    Rows are kept in flat arrays; raise `every` for very long runs.
+    """
+
+    def __init__(self, every: int = 1, distribution_every: int = 10, student_bins: int = 8):
+        """
+        Args:
+            every: Iterations aggregated per row
+            distribution_every: Rows between conflict distribution samples (0 disables them)
+            student_bins: Conflicts per student are binned 2, 3, ..., student_bins (the last bin is "or more")
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if distribution_every < 0:
+            raise ValueError("distribution_every must not be negative")
+        if student_bins < 2:
+            raise ValueError("student_bins must be at least 2")
+        self.every = every
+        self.distribution_every = distribution_every
+        self.student_bins = student_bins
+        self.slot_labels = [f"{day.name}_{hour}" for day in DAYS for hour in HOURS]
+        self._slot_index = {(day, hour): i for i, (day, hour) in enumerate((d, h) for d in DAYS for h in HOURS)}
+        self.reset()
+
+    def reset(self) -> None:
+        """Drop all rows (called at the start of every run)."""
+        self._rows = {name: array("d") for name in TRAJECTORY_COLUMNS[:7]}
+        self._slots = array("d")                                # rows x timeslots, row-major
+        self._students = array("d")                             # rows x (student_bins + 1)
+        self._window = 0
+        self._improving = self._sideways = self._worsening = 0
+        self._neighborhood_sum = 0
+        self._enumerated = 0
+
+    # ---------- Recording ----------
+    def observe(self, delta: float) -> None:
+        """Classify one evaluated candidate by its score delta (candidate - current)."""
+        if delta < -_SIDEWAYS_TOLERANCE:
+            self._improving += 1
+        elif delta > _SIDEWAYS_TOLERANCE:
+            self._worsening += 1
+        else:
+            self._sideways += 1
+
+    def end_iteration(self, iteration: int, score: float, neighborhood_size: Optional[int] = None,
+                      state: Union[None, ConflictState, Callable[[], ConflictState]] = None) -> None:
+        """
+        Close an iteration; a row is written every `every` iterations.
+
+        Args:
+            iteration: Iteration number
+            score: Score of the current (or best, for populations) schedule after the iteration
+            neighborhood_size: Candidates in the enumerated neighborhood (None when sampled)
+            state: ConflictState of that schedule, or a callable building it; only used when a
+                distribution sample is due, so building it costs nothing on other rows
+        """
+        self._window += 1
+        if neighborhood_size is not None:
+            self._neighborhood_sum += neighborhood_size
+            self._enumerated += 1
+        if self._window < self.every:
+            return
+
+        rows = self._rows
+        rows["iteration"].append(iteration)
+        rows["score"].append(score)
+        rows["neighborhood_size"].append(self._neighborhood_sum / self._enumerated if self._enumerated else math.nan)
+        rows["evaluated"].append(self._improving + self._sideways + self._worsening)
+        rows["improving"].append(self._improving)
+        rows["sideways"].append(self._sideways)
+        rows["worsening"].append(self._worsening)
+
+        n_rows = len(rows["iteration"])
+        due = state is not None and self.distribution_every and (n_rows - 1) % self.distribution_every == 0
+        if due:
+            self._sample_distribution(state() if callable(state) else state)
+        else:
+            self._slots.extend([math.nan] * len(self.slot_labels))
+            self._students.extend([math.nan] * (self.student_bins + 1))
+
+        self._window = 0
+        self._improving = self._sideways = self._worsening = 0
+        self._neighborhood_sum = 0
+        self._enumerated = 0
+
+    def _sample_distribution(self, state: ConflictState) -> None:
+        by_slot, by_student = state.conflict_counts()
+        slots = [0.0] * len(self.slot_labels)
+        for time_slot, conflicts in by_slot.items():
+            index = self._slot_index.get(state.slot_parts(time_slot) if state.slot_parts else time_slot)
+            if index is not None:
+                slots[index] += conflicts
+        self._slots.extend(slots)
+
+        # Per student: bins for 2 .. student_bins conflicts (a conflicted student has at least 2), then the maximum
+        histogram = [0.0] * self.student_bins
+        for conflicts in by_student.values():
+            histogram[min(conflicts, self.student_bins) - 1] += 1
+        histogram[0] = len(by_student)
+        self._students.extend(histogram + [float(max(by_student.values(), default=0))])
+
+    # ---------- Output ----------
+    @property
+    def student_columns(self) -> List[str]:
+        bins = [f"students_{k}_conflicts" for k in range(2, self.student_bins)] + [f"students_{self.student_bins}_plus_conflicts"]
+        return ["conflicted_students"] + bins + ["max_student_conflicts"]
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        """
+        All recorded columns: TRAJECTORY_COLUMNS, then `conflicted_students`, the per-student
+        histogram and `max_student_conflicts`, then one `conflicts_<DAY>_<hour>` column per timeslot.
+        """
+        n_rows = len(self._rows["iteration"])
+        columns = {name: np.frombuffer(self._rows[name], dtype=np.float64).copy() for name in TRAJECTORY_COLUMNS[:7]}
+        for name in ("iteration", "evaluated", "improving", "sideways", "worsening"):
+            columns[name] = columns[name].astype(np.int64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            evaluated = columns["evaluated"].astype(np.float64)
+            for kind in ("improving", "sideways", "worsening"):
+                columns[f"{kind}_fraction"] = np.where(evaluated > 0, columns[kind] / evaluated, np.nan)
+        students = np.frombuffer(self._students, dtype=np.float64).reshape(n_rows, self.student_bins + 1)
+        for i, name in enumerate(self.student_columns):
+            columns[name] = students[:, i].copy()
+        slots = np.frombuffer(self._slots, dtype=np.float64).reshape(n_rows, len(self.slot_labels))
+        for i, label in enumerate(self.slot_labels):
+            columns[f"conflicts_{label}"] = slots[:, i].copy()
+        return columns
+
+    def save(self, file_path: str) -> None:
+        """Write the columns as CSV (a .csv path) or as a numpy .npz archive (any other path)."""
+        columns = self.columns()
+        if file_path.lower().endswith(".csv"):
+            with open(file_path, "w", newline="") as file:
+                writer = csv.writer(file)
+                writer.writerow(columns)
+                for row in zip(*(column.tolist() for column in columns.values())):
+                    writer.writerow(["" if isinstance(v, float) and math.isnan(v) else v for v in row])
+        else:
+            np.savez_compressed(file_path, **columns)
+
+    def summary(self) -> Dict[str, float]:
+        """Totals over the whole run (evaluated candidates and their improving/sideways/worsening shares)."""
+        evaluated = sum(self._rows["evaluated"])
+        totals = {"rows": len(self._rows["iteration"]), "evaluated": int(evaluated)}
+        for kind in ("improving", "sideways", "worsening"):
+            totals[f"{kind}_fraction"] = sum(self._rows[kind]) / evaluated if evaluated else 0.0
+        return totals
+
+    def format(self) -> str:
+        """One-line human-readable summary."""
+        s = self.summary()
+        return (f"Telemetry: {s['rows']} rows, {s['evaluated']} candidates evaluated "
+                f"({100 * s['improving_fraction']:.1f}% improving, {100 * s['sideways_fraction']:.1f}% sideways, "
+                f"{100 * s['worsening_fraction']:.1f}% worsening)")
+
+    def __repr__(self) -> str:
+        return f"SearchTelemetry(every={self.every}, rows={len(self._rows['iteration'])})"
+
+
+def create_telemetry(telemetry: Union[bool, SearchTelemetry, None]) -> Optional[SearchTelemetry]:
+    """
+    Resolve an algorithm's `telemetry` argument.
+
+    Args:
+        telemetry: False/None (off), True (default recorder) or a configured SearchTelemetry
+
+    Returns:
+        The recorder to use, or None when telemetry is off
+    """
+    if isinstance(telemetry, SearchTelemetry):
+        return telemetry
+    return SearchTelemetry() if telemetry else None
@@ -0,0 +1,286 @@
+import hashlib
+import json
+import math
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from core.registry import Registry
+from algorithm.stimulated_annealing import SimulatedAnnealing
+from algorithm.hill_climbing_sideways import HillClimbingSidewaysMove
+from algorithm.genetic_algorithm import Genetic_Algorithm
+from algorithm.portfolio import SolverConfig
+
+
+@dataclass(frozen=True)
+class ParamRange:
+    """Search range of one hyperparameter."""
+    low: float
+    high: float
+    kind: str = "float"         # "float" (uniform), "log" (log-uniform) or "int"
+    target: str = "init"        # "init" for constructor arguments, "run" for run() arguments
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "int":
+            return rng.randint(int(self.low), int(self.high))
+        if self.kind == "log":
+            return math.exp(rng.uniform(math.log(self.low), math.log(self.high)))
+        return rng.uniform(self.low, self.high)
+
+
+@dataclass
+class TunableAlgorithm:
+    """An algorithm class with the fixed arguments of every trial and its tunable ranges."""
+    algorithm: type
+    fixed: Dict[str, Any] = field(default_factory=dict)
+    space: Dict[str, ParamRange] = field(default_factory=dict)
+
+
+# Tunable algorithms, keyed by class name
+TUNABLE: Dict[str, TunableAlgorithm] = {
+    "SimulatedAnnealing": TunableAlgorithm(SimulatedAnnealing, {}, {
+        "initial_temp": ParamRange(0.5, 500.0, "log"),
+        "cooling_rate": ParamRange(0.9, 0.9999),
+    }),
+    "Genetic_Algorithm": TunableAlgorithm(Genetic_Algorithm, {"max_iteration": 10**9, "replacement": "elitist"}, {
+        "population_size": ParamRange(10, 120, "int"),
+        "mutation_rate": ParamRange(0.01, 0.5, target="run"),
+    }),
+    "HillClimbingSidewaysMove": TunableAlgorithm(HillClimbingSidewaysMove, {}, {
+        "max_consecutive_sideways": ParamRange(1, 30, "int"),
+        "max_total_sideways": ParamRange(5, 300, "int"),
+    }),
+}
+
+
+def registry_fingerprint(registry: Registry) -> str:
+    """Stable hash of a dataset (courses, classrooms, enrollments, pins), used as the cache key."""
+    h = hashlib.sha256()
+    for code in sorted(registry.courses):
+        course = registry.courses[code]
+        h.update(f"C{code}|{course.student_count}|{course.credits};".encode())
+    for code in sorted(registry.classrooms):
+        h.update(f"R{code}|{registry.classrooms[code].capacity};".encode())
+    for nim in sorted(registry.students):
+        student = registry.students[nim]
+        h.update(f"S{nim}|{','.join(student.course_list)}|{','.join(map(str, student.priority))};".encode())
+    for mid in sorted(registry.pins):
+        pin = registry.pins[mid]
+        h.update(f"P{mid}|{pin.day.name if pin.day else ''}|{pin.hour if pin.hour is not None else ''}|{pin.classroom or ''};".encode())
+    return h.hexdigest()[:16]
+
+
+def _params_key(params: Dict[str, Any]) -> str:
+    return json.dumps(params, sort_keys=True)
+
+
+# ---------- Persistent JSON stores ----------
+def _load_json(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as file:
+        return json.load(file)
+
+
+def _save_json(path: str, data: Dict[str, Any]) -> None:
+    # Same atomic replace as algorithm.checkpoint, so an interrupted write keeps the old file
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=".tune-", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as file:
+            json.dump(data, file, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class TrialCache:
+    """
+    Scores of finished trials keyed by dataset hash, algorithm, parameter set,
+    trial time budget and trial seed, so an interrupted or repeated tuning run
+    does not pay for trials it already ran (a run with another seed does).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self._data: Dict[str, float] = _load_json(path) if path else {}
+
+    @staticmethod
+    def key(dataset: str, algorithm: str, params: Dict[str, Any], trial_time: float, trial_seed: int) -> str:
+        return f"{dataset}|{algorithm}|{_params_key(params)}|{trial_time}|{trial_seed}"
+
+    def get(self, key: str) -> Optional[float]:
+        return self._data.get(key)
+
+    def put(self, key: str, score: float) -> None:
+        self._data[key] = score
+
+    def save(self) -> None:
+        if self.path:
+            _save_json(self.path, self._data)
+
+
+def save_tuned(path: str, registry: Registry, algorithm: str, params: Dict[str, Any], mean_score: float) -> None:
+    """Persist the tuned parameters of an algorithm for this dataset."""
+    store = _load_json(path)
+    store.setdefault(registry_fingerprint(registry), {})[algorithm] = {"params": params, "mean_score": mean_score}
+    _save_json(path, store)
+
+
+def load_tuned(path: str, registry: Registry, algorithm: str) -> Optional[Dict[str, Any]]:
+    """Tuned parameters of an algorithm for this dataset, or None if it was never tuned."""
+    entry = _load_json(path).get(registry_fingerprint(registry), {}).get(algorithm)
+    return entry["params"] if entry else None
+
+
+def split_params(algorithm: str, params: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split tuned parameters into (constructor arguments with the fixed ones, run() arguments)."""
+    tunable = TUNABLE[algorithm]
+    init = dict(tunable.fixed)
+    run = {}
+    for name, value in params.items():
+        (run if tunable.space[name].target == "run" else init)[name] = value
+    return init, run
+
+
+def tuned_solver_config(path: str, registry: Registry, algorithm: str, name: Optional[str] = None) -> Optional[SolverConfig]:
+    """Portfolio entrant (see algorithm.portfolio) built from stored tuned parameters."""
+    params = load_tuned(path, registry, algorithm)
+    if params is None:
+        return None
+    init, run = split_params(algorithm, params)
+    return SolverConfig(name or f"{algorithm}_tuned", TUNABLE[algorithm].algorithm, init, run)
+
+
+# ---------- Worker side ----------
+_registry: Optional[Registry] = None
+
+
+def _init_worker(registry: Registry) -> None:
+    global _registry
+    _registry = registry
+
+
+def _run_trial(task: Tuple[str, Dict[str, Any], float, int]) -> float:
+    algorithm, params, trial_time, seed = task
+    # Every candidate sees the same seed in a given repetition (common random numbers)
+    init, run = split_params(algorithm, params)
+    solver = TUNABLE[algorithm].algorithm(_registry, time_budget=trial_time, seed=seed, **init)
+    return float(solver.run(**run)[2])
+
+
+# ---------- Racing ----------
+@dataclass
+class TuningResult:
+    """Outcome of a tuning race."""
+    algorithm: str
+    best_params: Dict[str, Any]
+    mean_score: float
+    trials_run: int                                                     # Trials executed (cache hits excluded)
+    standings: List[Tuple[Dict[str, Any], float, int]] = field(default_factory=list)   # (params, mean, repeats)
+
+
+class Tuner:
+    """
+    Racing hyperparameter search for one algorithm on one dataset.
+
+    n_candidates parameter sets are sampled from the algorithm's TUNABLE space (the
+    first one is the centre of the space). Every round runs one more repetition of each
+    surviving candidate with a fixed time budget, in parallel worker processes, and
+    keeps the best 1/eta by mean score once min_repeats repetitions are in. Results are
+    cached on disk per dataset hash and parameter set.
+    """
+
+    def __init__(self, registry: Registry, algorithm: str, trial_time: float = 5.0, n_candidates: int = 16,
+                 min_repeats: int = 2, max_repeats: int = 6, eta: int = 2, workers: Optional[int] = None,
+                 cache_path: Optional[str] = None, seed: int = 0):
+        """
+        Args:
+            registry: Dataset to tune on
+            algorithm: Key of TUNABLE
+            trial_time: Time budget of every trial in seconds
+            n_candidates: Parameter sets sampled at the start
+            min_repeats: Repetitions before any candidate is eliminated
+            max_repeats: Maximum repetitions of a candidate
+            eta: Elimination factor per round
+            workers: Worker processes (default: os.cpu_count())
+            cache_path: JSON file caching trial scores (None disables the cache)
+            seed: Seed for candidate sampling and trial seeds
+        """
+        if algorithm not in TUNABLE:
+            raise ValueError(f"Unknown tunable algorithm: {algorithm}")
+        if trial_time <= 0:
+            raise ValueError("trial_time must be positive")
+        if not 1 <= min_repeats <= max_repeats:
+            raise ValueError("need 1 <= min_repeats <= max_repeats")
+        if eta < 2:
+            raise ValueError("eta must be at least 2")
+        self.registry = registry
+        self.algorithm = algorithm
+        self.trial_time = trial_time
+        self.n_candidates = max(1, n_candidates)
+        self.min_repeats = min_repeats
+        self.max_repeats = max_repeats
+        self.eta = eta
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.cache = TrialCache(cache_path)
+        self.seed = seed
+        self.dataset = registry_fingerprint(registry)
+
+    def candidates(self) -> List[Dict[str, Any]]:
+        """Centre of the space followed by random samples."""
+        rng = random.Random(self.seed)
+        space = TUNABLE[self.algorithm].space
+        centre = {}
+        for name, param in space.items():
+            if param.kind == "log":
+                centre[name] = math.sqrt(param.low * param.high)
+            elif param.kind == "int":
+                centre[name] = int(round((param.low + param.high) / 2))
+            else:
+                centre[name] = (param.low + param.high) / 2
+        found = [centre]
+        while len(found) < self.n_candidates:
+            found.append({name: param.sample(rng) for name, param in space.items()})
+        # Round floats so cache keys stay readable and stable
+        return [{name: round(v, 6) if isinstance(v, float) else v for name, v in params.items()} for params in found]
+
+    def run(self) -> TuningResult:
+        alive = self.candidates()
+        scores: Dict[str, List[float]] = {_params_key(params): [] for params in alive}
+        trials_run = 0
+
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker, initargs=(self.registry,)) as executor:
+            for repeat in range(self.max_repeats):
+                trial_seed = self.seed * 1_000_003 + repeat
+                tasks, keys = [], []
+                for params in alive:
+                    key = self.cache.key(self.dataset, self.algorithm, params, self.trial_time, trial_seed)
+                    cached = self.cache.get(key)
+                    if cached is not None:
+                        scores[_params_key(params)].append(cached)
+                    else:
+                        tasks.append((self.algorithm, params, self.trial_time, trial_seed))
+                        keys.append((key, params))
+                for (key, params), score in zip(keys, executor.map(_run_trial, tasks)):
+                    self.cache.put(key, score)
+                    scores[_params_key(params)].append(score)
+                trials_run += len(tasks)
+                self.cache.save()
+
+                alive.sort(key=lambda params: float(np.mean(scores[_params_key(params)])))
+                if repeat + 1 >= self.min_repeats:
+                    alive = alive[:max(1, math.ceil(len(alive) / self.eta))]
+                if len(alive) == 1 and repeat + 1 >= self.min_repeats:
+                    break
+
+        standings = sorted(((params, float(np.mean(s)), len(s)) for params in self.candidates()
+                            for s in [scores[_params_key(params)]]), key=lambda item: item[1])
+        best = alive[0]
+        return TuningResult(self.algorithm, best, float(np.mean(scores[_params_key(best)])), trials_run, standings)
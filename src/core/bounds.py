@@ -0,0 +1,132 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, FrozenSet, List, Optional, Set, Tuple
+from core.models import DAY
+from core.objective import ObjectiveWeights
+
+if TYPE_CHECKING:
+    from core.registry import Registry
+
+# Timeslot grid of Schedule.random_initial_assignment
+DAYS = list(DAY)
+HOURS = list(range(7, 18))
+
+
+@dataclass
+class ConflictBound:
+    """
+    Lower bounds on the student conflict count of every schedule of a registry.
+    Both are valid on their own; `value` is the larger one.
+    """
+    per_student: int = 0                                # Sum of per-student bounds
+    clique: int = 0                                     # Bound from the heaviest course clique found
+    clique_courses: List[str] = field(default_factory=list)
+
+    @property
+    def value(self) -> int:
+        return max(self.per_student, self.clique)
+
+
+def _allowed_slots(registry: Registry, mid: int) -> Optional[FrozenSet[Tuple[DAY, int]]]:
+    # Timeslots a meeting may use (None = every timeslot)
+    pin = registry.pins.get(mid)
+    if pin is None or (pin.day is None and pin.hour is None):
+        return None
+    return frozenset((day, hour) for day in DAYS for hour in HOURS if pin.allows(day, hour))
+
+
+def _crowding_bound(n_meetings: int, n_slots: int) -> int:
+    # n_meetings pairwise-conflicting meetings in n_slots timeslots: some timeslot holds j >= 2
+    # of them and costs at least j, so the best case is one crowded timeslot: n - n_slots + 1
+    return n_meetings - n_slots + 1 if n_meetings > n_slots else 0
+
+
+def _slots_of(mids, allowed: Dict[int, Optional[FrozenSet]]) -> int:
+    slots: Set[Tuple[DAY, int]] = set()
+    for mid in mids:
+        if allowed[mid] is None:
+            return len(DAYS) * len(HOURS)
+        slots |= allowed[mid]
+    return len(slots)
+
+
+def conflict_lower_bound(registry: Registry, max_clique_seeds: int = 64) -> ConflictBound:
+    """
+    Lower bound on unavoidable student conflicts.
+
+    Per student (the objective is a sum over students, so these add up): a student with
+    k meetings and T usable timeslots has at least k - T + 1 conflicts when k > T, and at
+    least the conflicts among their locked meetings (adding meetings never lowers a
+    student's count).
+
+    Clique: meetings of courses that pairwise share a student conflict whenever two of
+    them share a timeslot, so a course clique with more meetings than usable timeslots
+    forces the same k - T + 1 bound. Cliques are grown greedily (heaviest course first)
+    from the max_clique_seeds heaviest courses.
+    """
+    allowed = {mid: _allowed_slots(registry, mid) for mid in registry.meetings}
+    bound = ConflictBound()
+
+    # Locked meetings of each student per timeslot
+    locked_counts: Dict[Tuple[str, DAY, int], int] = {}
+    for mid in registry.locked_meetings:
+        pin = registry.pins[mid]
+        for nim in registry.students_of_meeting.get(mid, []):
+            key = (nim, pin.day, pin.hour)
+            locked_counts[key] = locked_counts.get(key, 0) + 1
+    locked_cost: Dict[str, int] = {}
+    for (nim, _, _), count in locked_counts.items():
+        if count > 1:
+            locked_cost[nim] = locked_cost.get(nim, 0) + count
+
+    for nim, mids in registry.meetings_of_student.items():
+        crowding = _crowding_bound(len(mids), _slots_of(mids, allowed))
+        bound.per_student += max(crowding, locked_cost.get(nim, 0))
+
+    # Course graph: courses adjacent when a student takes both
+    neighbours: Dict[str, Set[str]] = {}
+    for nim, mids in registry.meetings_of_student.items():
+        courses = {registry.meetings[mid].course_code for mid in mids}
+        for code in courses:
+            neighbours.setdefault(code, set()).update(courses - {code})
+    weight = {code: len(registry.meetings_of_course.get(code, [])) for code in neighbours}
+
+    seeds = sorted(neighbours, key=lambda code: (-weight[code], code))[:max_clique_seeds]
+    for seed in seeds:
+        clique = [seed]
+        candidates = set(neighbours[seed])
+        while candidates:
+            code = max(candidates, key=lambda c: (weight[c], c))
+            clique.append(code)
+            candidates &= neighbours[code]
+        mids = [mid for code in clique for mid in registry.meetings_of_course[code]]
+        value = _crowding_bound(len(mids), _slots_of(mids, allowed))
+        if value > bound.clique:
+            bound.clique, bound.clique_courses = value, sorted(clique)
+    return bound
+
+
+def objective_lower_bound(registry: Registry, weights: Optional[ObjectiveWeights] = None,
+                          conflicts: Optional[ConflictBound] = None) -> float:
+    """
+    Lower bound on the weighted objective (see core.objective.ScheduleObjective).
+    Student conflicts use conflict_lower_bound(); priority conflicts weigh every
+    conflicting meeting at least 1, so they are bounded by the per-student conflict
+    bound; a student with k meetings over d days has at least k - d * max_daily_hours
+    overload. Room capacity counts only the overflow of meetings larger than every
+    classroom; gaps contribute 0.
+    """
+    weights = weights if weights is not None else ObjectiveWeights.for_registry(registry)
+    active = weights.active()
+    total = 0.0
+    if "student_conflicts" in active or "priority_conflicts" in active:
+        conflicts = conflicts if conflicts is not None else conflict_lower_bound(registry)
+        total += weights.student_conflicts * conflicts.value + weights.priority_conflicts * conflicts.per_student
+    if "daily_overload" in active:
+        limit = len(DAYS) * weights.max_daily_hours
+        total += weights.daily_overload * sum(max(0, len(mids) - limit) for mids in registry.meetings_of_student.values())
+    if "room_over_capacity" in active and registry.oversized_meetings:
+        largest = max(classroom.capacity for classroom in registry.classrooms.values())
+        total += weights.room_over_capacity * sum(registry.meetings[mid].student_count - largest
+                                                  for mid in registry.oversized_meetings)
+    return total
@@ -0,0 +1,176 @@
+from __future__ import annotations
+from typing import Dict, List, Tuple, TYPE_CHECKING
+import numpy as np
+from core.models import DAY
+from core.schedule import Schedule
+
+if TYPE_CHECKING:
+    from core.registry import Registry
+    from core.shared_registry import RegistryArrays
+
+# Per-encoding masks (see ScheduleEncoding.masks)
+MASKS = ("legal_slots", "legal_cells", "pinned", "locked")
+
+
+class ScheduleEncoding:
+    """
+    Flat integer encoding of schedules for array-based operators.
+    Every (day, hour, classroom) position is a cell index:
+        cell = (day_index * n_hours + hour_index) * n_rooms + room_index
+    and a schedule is an int32 array mapping meeting_id -> cell.
+    The timeslot of a cell is cell // n_rooms.
+    """
+
+    def __init__(self, registry: Registry, days: List[DAY], hours: List[int], classroom_codes: List[str]):
+        """
+        Args:
+            registry: Registry whose meeting ids are 0..n_meetings-1
+            days: Days in encoding order
+            hours: Hours in encoding order
+            classroom_codes: Classroom codes in encoding order
+        """
+        meeting_ids = sorted(registry.meetings.keys())
+        if meeting_ids != list(range(len(meeting_ids))):
+            raise ValueError("meeting ids must be contiguous from 0 to be array-encoded")
+
+        self.registry = registry
+        self._set_dims(days, hours, classroom_codes, len(meeting_ids))
+
+        # Legal-room masks: meeting x room, and expanded to meeting x cell
+        self.legal_rooms = np.zeros((self.n_meetings, self.n_rooms), dtype=bool)
+        for mid in range(self.n_meetings):
+            for code in registry.legal_classrooms_by_meeting.get(mid, []):
+                if code in self._room_index:
+                    self.legal_rooms[mid, self._room_index[code]] = True
+
+        # Pins: allowed timeslots per meeting, pinned / locked flags and the meetings operators may move
+        self.legal_slots = np.ones((self.n_meetings, self.n_slots), dtype=bool)
+        self.pinned = np.zeros(self.n_meetings, dtype=bool)
+        for mid, pin in registry.pins.items():
+            if pin.day is None and pin.hour is None:
+                continue
+            days_ok = np.array([pin.day is None or d == pin.day for d in self.days])
+            hours_ok = np.array([pin.hour is None or h == pin.hour for h in self.hours])
+            self.legal_slots[mid] = np.outer(days_ok, hours_ok).ravel()
+            if not self.legal_slots[mid].any():
+                raise ValueError(f"Meeting {mid} is pinned outside the schedule's days and hours")
+            self.pinned[mid] = True
+        self.pinned[[mid for mid, pin in registry.pins.items() if pin.classroom is not None]] = True
+        self.legal_cells = np.repeat(self.legal_slots, self.n_rooms, axis=1) & np.tile(self.legal_rooms, (1, self.n_slots))
+        self.locked = np.zeros(self.n_meetings, dtype=bool)
+        self.locked[sorted(registry.locked_meetings)] = True
+
+        # Course of each meeting as a rank in sorted course order (for course-level crossover)
+        course_codes = sorted(registry.courses.keys())
+        course_rank = {code: i for i, code in enumerate(course_codes)}
+        self.n_courses = len(course_codes)
+        self.course_of_meeting = np.array(
+            [course_rank[registry.meetings[mid].course_code] for mid in range(self.n_meetings)], dtype=np.int32)
+        self._finish()
+
+    def _set_dims(self, days: List[DAY], hours: List[int], classroom_codes: List[str], n_meetings: int) -> None:
+        self.days = [d for d in DAY if d in set(days)]
+        self.hours = sorted(hours)
+        self.classroom_codes = list(classroom_codes)
+        self.n_days = len(self.days)
+        self.n_hours = len(self.hours)
+        self.n_rooms = len(self.classroom_codes)
+        self.n_slots = self.n_days * self.n_hours
+        self.n_cells = self.n_slots * self.n_rooms
+        self.n_meetings = n_meetings
+
+        self._day_index = {d: i for i, d in enumerate(self.days)}
+        self._hour_index = {h: i for i, h in enumerate(self.hours)}
+        self._room_index = {r: i for i, r in enumerate(self.classroom_codes)}
+
+    def _finish(self) -> None:
+        self.free_meetings = np.flatnonzero(~self.locked)
+        # Fixed random weights for 64-bit position fingerprints (same for every run)
+        self._fingerprint_weights = np.random.default_rng(0x5C4ED).integers(
+            0, np.iinfo(np.uint64).max, size=self.n_meetings, dtype=np.uint64, endpoint=True)
+
+    def masks(self) -> Dict[str, np.ndarray]:
+        """Pin masks not derivable from RegistryArrays, for sharing with from_arrays()."""
+        return {name: getattr(self, name) for name in MASKS}
+
+    @classmethod
+    def from_arrays(cls, arrays: RegistryArrays, masks: Dict[str, np.ndarray], days: List[DAY], hours: List[int]) -> ScheduleEncoding:
+        """
+        Encoding over existing arrays, e.g. attached from shared memory (see core.shared_registry);
+        nothing is copied and `registry` is None. Rooms are in arrays.classroom_codes order.
+        """
+        encoding = cls.__new__(cls)
+        encoding.registry = None
+        encoding._set_dims(days, hours, arrays.classroom_codes, arrays.n_meetings)
+        for name in MASKS:
+            setattr(encoding, name, masks[name])
+        encoding.legal_rooms = arrays.legal_rooms
+        encoding.n_courses = len(arrays.course_codes)
+        encoding.course_of_meeting = arrays.meeting_course
+        encoding._finish()
+        return encoding
+
+    @classmethod
+    def from_schedule(cls, registry: Registry, schedule: Schedule) -> ScheduleEncoding:
+        """Build an encoding with the same dimensions as an existing schedule."""
+        return cls(registry, schedule.days, schedule.hours, schedule.classroom_codes)
+
+    # ---------- Cell arithmetic ----------
+    def cell(self, day: DAY, hour: int, classroom: str) -> int:
+        """Cell index of a (day, hour, classroom) position."""
+        return (self._day_index[day] * self.n_hours + self._hour_index[hour]) * self.n_rooms + self._room_index[classroom]
+
+    def position(self, cell: int) -> Tuple[DAY, int, str]:
+        """(day, hour, classroom) position of a cell index."""
+        slot, room_idx = divmod(int(cell), self.n_rooms)
+        day_idx, hour_idx = divmod(slot, self.n_hours)
+        return self.days[day_idx], self.hours[hour_idx], self.classroom_codes[room_idx]
+
+    def slot_of(self, cell: int) -> int:
+        """Timeslot index of a cell."""
+        return int(cell) // self.n_rooms
+
+    # ---------- Conversion ----------
+    def encode(self, schedule: Schedule) -> np.ndarray:
+        """
+        Convert a Schedule to a meeting -> cell array.
+
+        Returns:
+            int32 array of length n_meetings (-1 for unplaced meetings)
+        """
+        cells = np.full(self.n_meetings, -1, dtype=np.int32)
+        for mid, (day, hour, room) in schedule.where_is.items():
+            cells[mid] = self.cell(day, hour, room)
+        return cells
+
+    def decode(self, cells: np.ndarray) -> Schedule:
+        """Convert a meeting -> cell array back to a Schedule."""
+        schedule = Schedule(self.days, self.hours, self.classroom_codes)
+        for mid, cell in enumerate(cells.tolist()):
+            if cell >= 0:
+                schedule.place(mid, *self.position(cell))
+        return schedule
+
+    def grid(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Build the occupancy grid of an encoded schedule.
+
+        Returns:
+            int32 array of length n_cells holding the meeting id in each cell, -1 if empty
+        """
+        grid = np.full(self.n_cells, -1, dtype=np.int32)
+        placed = cells >= 0
+        grid[cells[placed]] = np.flatnonzero(placed)
+        return grid
+
+    # ---------- Fingerprints ----------
+    def fingerprint(self, cells: np.ndarray) -> int:
+        """
+        64-bit hash of a position vector (a random linear combination mod 2**64).
+        Equal schedules always match; different ones collide with negligible probability.
+        """
+        return int((cells.astype(np.uint64) * self._fingerprint_weights).sum(dtype=np.uint64))
+
+    def fingerprints(self, population: np.ndarray) -> np.ndarray:
+        """Fingerprints of every row of a 2-D (individuals x meetings) position matrix."""
+        return (population.astype(np.uint64) * self._fingerprint_weights).sum(axis=1, dtype=np.uint64)
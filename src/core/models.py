@@ -59,4 +59,20 @@ class ClassMeeting:
     classroom_code: str | None          # Which room is assigned (None if not yet assigned)
     duration_hours: int                 # How long the meeting lasts
     student_count: int                  # Number of students attending
-    students: Optional[List[str]] = None # List of student IDs attending (optional)
\ No newline at end of file
+    students: Optional[List[str]] = None # List of student IDs attending (optional)
+
+@dataclass(frozen=True)
+class MeetingPin:
+    """Fixed part of a meeting's position; None leaves that part free."""
+    day: Optional[DAY] = None           # Fixed day
+    hour: Optional[int] = None          # Fixed start hour
+    classroom: Optional[str] = None     # Fixed room
+
+    @property
+    def locked(self) -> bool:
+        """Whether the whole position is fixed (the meeting never moves)."""
+        return self.day is not None and self.hour is not None and self.classroom is not None
+
+    def allows(self, day: DAY, hour: int) -> bool:
+        """Whether the meeting may start at (day, hour)."""
+        return (self.day is None or self.day == day) and (self.hour is None or self.hour == hour)
@@ -1,51 +1,339 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING, Dict, Tuple
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Sequence, Tuple
 
 if TYPE_CHECKING:
     from core.registry import Registry
     from core.schedule import Schedule
+    from core.encoding import ScheduleEncoding
+    from core.shared_registry import RegistryArrays
+
+# Objective components, in breakdown order
+COMPONENTS = ("student_conflicts", "priority_conflicts", "room_over_capacity", "daily_overload", "daily_gaps")
+
+# Default room over-capacity weight of registries with oversized meetings (see ObjectiveWeights.for_registry)
+OVERSIZED_ROOM_WEIGHT = 1
+
+
+@dataclass
+class ObjectiveWeights:
+    """Weight of every objective component (0 disables it). The default is the plain conflict count."""
+    student_conflicts: float = 1    # A student attending c > 1 meetings in one timeslot counts c
+    priority_conflicts: float = 0   # Same, but each meeting counts the student's priority weight for its course
+    room_over_capacity: float = 0   # Students beyond the capacity of the assigned classroom
+    daily_overload: float = 0       # Meetings beyond max_daily_hours per student per day
+    daily_gaps: float = 0           # Idle hours between a student's first and last meeting of a day
+    max_daily_hours: int = 6        # Daily load allowed before daily_overload applies
+
+    def active(self) -> Tuple[str, ...]:
+        """Components with a non-zero weight."""
+        return tuple(name for name in COMPONENTS if getattr(self, name))
+
+    @classmethod
+    def for_registry(cls, registry: Registry, **weights) -> ObjectiveWeights:
+        """
+        Weights for a registry: the given ones, and unless room_over_capacity is given, the
+        room over-capacity penalty (OVERSIZED_ROOM_WEIGHT) when some meeting fits no classroom
+        (Registry.oversized_meetings), so the overflow of those meetings is scored.
+        This is what every search uses when no weights are passed.
+        """
+        if registry.oversized_meetings:
+            weights.setdefault("room_over_capacity", OVERSIZED_ROOM_WEIGHT)
+        return cls(**weights)
 
 
 class ScheduleObjective:
-    """Evaluates schedule by counting student time conflicts."""
-    
-    def __init__(self, registry: Registry):
+    """Evaluates schedule by counting student time conflicts, plus optional weighted soft constraints."""
+
+    def __init__(self, registry: Registry, weights: Optional[ObjectiveWeights] = None):
         self.registry = registry
-    
+        self._set_weights(weights if weights is not None else ObjectiveWeights.for_registry(registry))
+
+        # Priority weight of each (meeting, student): the student's top-priority course weighs
+        # max(priority), the lowest-priority one weighs 1
+        self.priority_weights: Dict[int, List[int]] = {}
+        for mid, nims in registry.students_of_meeting.items():
+            course_code = registry.meetings[mid].course_code
+            weights_of_meeting = []
+            for nim in nims:
+                student = registry.students[nim]
+                priority = student.priority[student.course_list.index(course_code)]
+                weights_of_meeting.append(max(student.priority) - priority + 1)
+            self.priority_weights[mid] = weights_of_meeting
+
+        # Students beyond capacity for every (meeting, classroom), so placing a meeting scores in O(1)
+        self.room_excess: Dict[int, Dict[str, int]] = {
+            mid: {room.code: max(0, meeting.student_count - room.capacity) for room in registry.classrooms.values()}
+            for mid, meeting in registry.meetings.items()
+        }
+
+    def _set_weights(self, weights: Optional[ObjectiveWeights]) -> None:
+        self.weights = weights if weights is not None else ObjectiveWeights()
+        self.evaluations = 0  # Number of full evaluations performed (used by search budgets)
+        self._active = set(self.weights.active())
+        self._weighted = [(name, getattr(self.weights, name)) for name in self.weights.active()]
+
+    @classmethod
+    def from_arrays(cls, arrays: RegistryArrays, weights: Optional[ObjectiveWeights] = None) -> ScheduleObjective:
+        """
+        Objective over RegistryArrays (e.g. attached from shared memory, see core.shared_registry)
+        for incremental scoring through ConflictState and build_cell_state(); students are keyed
+        by index. Schedule-based evaluate() needs a Registry.
+        """
+        objective = cls.__new__(cls)
+        objective.registry = arrays
+        objective._set_weights(weights)
+        objective.priority_weights = arrays.priority_of_meeting
+        objective.room_excess = arrays.room_excess
+        return objective
+
+    def combine(self, parts: Dict[str, float]) -> float:
+        """Weighted objective value of a component breakdown."""
+        total = 0
+        for name, weight in self._weighted:
+            total += weight * parts[name]
+        return total
+
     def evaluate(self, schedule: Schedule) -> float:
         """Returns objective value (lower is better)."""
-        return self.calculate_student_time_conflicts(schedule)
-    
+        self.evaluations += 1
+        if self._active == {"student_conflicts"}:
+            return self.weights.student_conflicts * self.calculate_student_time_conflicts(schedule)
+        return self._fill_state(ConflictState(self), schedule).score
+
     def calculate_student_time_conflicts(self, schedule: Schedule) -> float:
         total_conflicts = 0
         student_timeslot_usage: Dict[Tuple, Dict[str, int]] = {}
-        
+
         # Count meetings per student per timeslot
         for meeting_id, (day, hour, room_code) in schedule.where_is.items():
             time_slot = (day, hour)
             students = self.registry.students_of_meeting.get(meeting_id, [])
-            
+
             if time_slot not in student_timeslot_usage:
                 student_timeslot_usage[time_slot] = {}
-            
+
             for student_nim in students:
                 student_timeslot_usage[time_slot][student_nim] = \
                     student_timeslot_usage[time_slot].get(student_nim, 0) + 1
-        
+
         # Count conflicts
         for time_slot, student_counts in student_timeslot_usage.items():
             for student_nim, count in student_counts.items():
                 if count > 1:
                     total_conflicts += count
-        
+
         return total_conflicts
-    
+
+    def _fill_state(self, state: ConflictState, schedule: Schedule) -> ConflictState:
+        # One pass over the placed meetings updates every tracked component
+        for meeting_id, (day, hour, room_code) in schedule.where_is.items():
+            state.add(meeting_id, (day, hour), room_code)
+        return state
+
+    def build_state(self, schedule: Schedule, count_evaluation: bool = True) -> ConflictState:
+        """
+        Fully evaluate a schedule once and return its incremental conflict state.
+        Later moves can be scored through the state without re-evaluating.
+        count_evaluation=False leaves `evaluations` (and so search budgets) untouched, for diagnostics.
+        """
+        self.evaluations += count_evaluation
+        return self._fill_state(ConflictState(self), schedule)
+
+    def count_evaluations(self, n: int = 1) -> None:
+        """Charge n delta-scored candidates to `evaluations`, for searches that never rebuild a state from scratch."""
+        self.evaluations += n
+
+    def build_cell_state(self, cells: Sequence[int], encoding: ScheduleEncoding) -> ConflictState:
+        """
+        Like build_state() for an array-encoded schedule (see core.encoding):
+        timeslots are keyed by the slot index cell // n_rooms.
+        """
+        self.evaluations += 1
+        n_rooms, n_hours = encoding.n_rooms, encoding.n_hours
+        days, hours, rooms = encoding.days, encoding.hours, encoding.classroom_codes
+        state = ConflictState(self, slot_parts=lambda slot: (days[slot // n_hours], hours[slot % n_hours]))
+        for meeting_id, cell in enumerate(cells):
+            if cell >= 0:
+                slot, room = divmod(int(cell), n_rooms)
+                state.add(meeting_id, slot, rooms[room])
+        return state
+
     def get_detailed_breakdown(self, schedule: Schedule) -> Dict[str, float]:
-        """Returns breakdown of objective components."""
-        total = self.calculate_student_time_conflicts(schedule)
-        return {"total_objective": total}
+        """Returns breakdown of objective components (all of them, weighted or not) and the weighted total."""
+        state = self._fill_state(ConflictState(self, track=COMPONENTS), schedule)
+        breakdown = dict(state.parts)
+        breakdown["total_objective"] = self.combine(state.parts)
+        return breakdown
+
+
+class ConflictState:
+    """
+    Incremental form of the objective for one schedule.
+    Keeps a per-timeslot counter for every student, so adding, removing or moving a
+    meeting updates the score in O(students of that meeting).
+    A student attending c > 1 meetings in the same timeslot contributes c conflicts.
+    Soft components are tracked alongside when their weight is non-zero: priority
+    weight sums per (timeslot, student), per-(student, day) hour counters for daily
+    load and gaps, and the over-capacity of each meeting's room.
+    """
+
+    def __init__(self, objective: ScheduleObjective, slot_parts: Optional[Callable[[object], Tuple]] = None,
+                 track: Optional[Sequence[str]] = None):
+        """
+        Args:
+            objective: Objective whose weights and lookup tables are used
+            slot_parts: Maps a timeslot key to (day, hour); None means keys already are (day, hour)
+            track: Components to track (default: those with a non-zero weight)
+        """
+        self.objective = objective
+        self.registry = objective.registry
+        self.slot_parts = slot_parts
+        track = set(objective.weights.active() if track is None else track)
+        self.track_priority = "priority_conflicts" in track
+        self.track_rooms = "room_over_capacity" in track
+        self.track_daily = "daily_overload" in track or "daily_gaps" in track
+        self.counts: Dict[Tuple, int] = {}  # (timeslot, student_nim) -> meetings attended; timeslot is (day, hour) or a slot index
+        self.priority_sums: Dict[Tuple, int] = {}  # (timeslot, student_nim) -> sum of priority weights
+        self.day_hours: Dict[Tuple, Dict[int, int]] = {}  # (student_nim, day) -> {hour: meetings}
+        self.day_load: Dict[Tuple, int] = {}  # (student_nim, day) -> meetings that day
+        self.parts: Dict[str, int] = {name: 0 for name in COMPONENTS}
+        self.score = 0
+
+    def _day_cost(self, key: Tuple) -> Tuple[int, int]:
+        # (overload, gaps) of one student-day
+        hours = self.day_hours.get(key)
+        if not hours:
+            return 0, 0
+        overload = max(0, self.day_load[key] - self.objective.weights.max_daily_hours)
+        gaps = max(hours) - min(hours) + 1 - len(hours)
+        return overload, gaps
+
+    def _day_update(self, student_nim: str, day, hour: int, step: int) -> None:
+        key = (student_nim, day)
+        old_overload, old_gaps = self._day_cost(key)
+        hours = self.day_hours.setdefault(key, {})
+        c = hours.get(hour, 0) + step
+        if c:
+            hours[hour] = c
+        else:
+            del hours[hour]
+        self.day_load[key] = self.day_load.get(key, 0) + step
+        new_overload, new_gaps = self._day_cost(key)
+        self.parts["daily_overload"] += new_overload - old_overload
+        self.parts["daily_gaps"] += new_gaps - old_gaps
+
+    def _excess(self, meeting_id: int, room: Optional[str]) -> int:
+        if room is None:
+            return 0
+        return self.objective.room_excess[meeting_id][room]
+
+    def _rescore(self) -> float:
+        old = self.score
+        self.score = self.objective.combine(self.parts)
+        return self.score - old
+
+    def _count(self, meeting_id: int, time_slot: Tuple, step: int) -> None:
+        # Add (step=1) or remove (step=-1) a meeting's students from a timeslot
+        counts = self.counts
+        parts = self.parts
+        students = self.registry.students_of_meeting.get(meeting_id, [])
+        if not (self.track_priority or self.track_daily):
+            delta = 0
+            if step > 0:
+                for student_nim in students:
+                    key = (time_slot, student_nim)
+                    c = counts.get(key, 0)
+                    counts[key] = c + 1
+                    if c == 1:
+                        delta += 2  # 1 -> 2 meetings: both become conflicts
+                    elif c > 1:
+                        delta += 1
+            else:
+                for student_nim in students:
+                    key = (time_slot, student_nim)
+                    c = counts[key]
+                    if c == 1:
+                        del counts[key]
+                    else:
+                        counts[key] = c - 1
+                        delta -= 2 if c == 2 else 1
+            parts["student_conflicts"] += delta
+            return
+
+        priority_weights = self.objective.priority_weights.get(meeting_id, [])
+        day, hour = self.slot_parts(time_slot) if self.slot_parts else time_slot
+        for student_nim, weight in zip(students, priority_weights):
+            key = (time_slot, student_nim)
+            c = counts.get(key, 0)
+            if c + step:
+                counts[key] = c + step
+            else:
+                del counts[key]
+            parts["student_conflicts"] += (c + step if c + step > 1 else 0) - (c if c > 1 else 0)
+            if self.track_priority:
+                old_sum = self.priority_sums.get(key, 0)
+                new_sum = old_sum + step * weight
+                if new_sum:
+                    self.priority_sums[key] = new_sum
+                else:
+                    del self.priority_sums[key]
+                parts["priority_conflicts"] += (new_sum if c + step > 1 else 0) - (old_sum if c > 1 else 0)
+            if self.track_daily:
+                self._day_update(student_nim, day, hour, step)
+
+    def add(self, meeting_id: int, time_slot: Tuple, room: Optional[str] = None) -> float:
+        """Count a meeting in a timeslot (and room, for over-capacity); returns the score delta."""
+        self._count(meeting_id, time_slot, 1)
+        if self.track_rooms:
+            self.parts["room_over_capacity"] += self._excess(meeting_id, room)
+        return self._rescore()
+
+    def remove(self, meeting_id: int, time_slot: Tuple, room: Optional[str] = None) -> float:
+        """Stop counting a meeting in a timeslot (and room); returns the score delta."""
+        self._count(meeting_id, time_slot, -1)
+        if self.track_rooms:
+            self.parts["room_over_capacity"] -= self._excess(meeting_id, room)
+        return self._rescore()
+
+    def move(self, meeting_id: int, old_slot: Tuple, new_slot: Tuple,
+             old_room: Optional[str] = None, new_room: Optional[str] = None) -> float:
+        """Move a meeting between timeslots (and rooms); returns the score delta."""
+        if old_slot != new_slot:
+            self._count(meeting_id, old_slot, -1)
+            self._count(meeting_id, new_slot, 1)
+        if self.track_rooms and old_room != new_room:
+            self.parts["room_over_capacity"] += self._excess(meeting_id, new_room) - self._excess(meeting_id, old_room)
+        return self._rescore()
+
+    def conflict_counts(self) -> Tuple[Dict[Tuple, int], Dict[str, int]]:
+        """
+        Student conflicts broken down by timeslot and by student, from the counters
+        (O(counters), no re-evaluation). Only timeslots and students with conflicts appear.
+
+        Returns:
+            (timeslot -> conflicts, student -> conflicts); both sum to parts["student_conflicts"]
+        """
+        by_slot: Dict[Tuple, int] = {}
+        by_student: Dict[str, int] = {}
+        for (time_slot, student), c in self.counts.items():
+            if c > 1:
+                by_slot[time_slot] = by_slot.get(time_slot, 0) + c
+                by_student[student] = by_student.get(student, 0) + c
+        return by_slot, by_student
+
+    def copy(self) -> ConflictState:
+        """Independent copy of the counters (much cheaper than re-evaluating)."""
+        clone = ConflictState.__new__(ConflictState)
+        clone.__dict__.update(self.__dict__)
+        clone.counts = self.counts.copy()
+        clone.priority_sums = self.priority_sums.copy()
+        clone.day_hours = {key: hours.copy() for key, hours in self.day_hours.items()}
+        clone.day_load = self.day_load.copy()
+        clone.parts = self.parts.copy()
+        return clone
 
 
-def create_objective(registry: Registry) -> ScheduleObjective:
+def create_objective(registry: Registry, weights: Optional[ObjectiveWeights] = None) -> ScheduleObjective:
     """Factory function to create objective function."""
-    return ScheduleObjective(registry)
+    return ScheduleObjective(registry, weights)
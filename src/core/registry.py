@@ -1,9 +1,31 @@
-from core.models import Course, Classroom, Student, ClassMeeting
-from dataclasses import dataclass, field
-from typing import Dict, List
-from utils.input_parser import load_json
+import random
+from core.models import Course, Classroom, Student, ClassMeeting, MeetingPin, DAY
+from core.bounds import HOURS
+from dataclasses import dataclass, field, replace
+from typing import Dict, Iterable, List, Set
+from utils.input_parser import load_json, load_pins
 from typing import Optional
 
+
+@dataclass
+class RegistryUpdate:
+    """
+    Outcome of Registry.apply_changes().
+    Meeting ids stay contiguous: a deleted meeting's id is reused by the last meeting,
+    so surviving meetings may be renumbered.
+    """
+    affected: Set[int] = field(default_factory=set)             # Current ids of new meetings and meetings whose students or size changed
+    removed: Set[int] = field(default_factory=set)              # Previous ids of deleted meetings
+    renumbered: Dict[int, int] = field(default_factory=dict)    # Previous id -> current id of moved meetings
+    _origin: Dict[int, Optional[int]] = field(default_factory=dict, repr=False)  # Current id -> previous id (None if new)
+
+    def current_id(self, previous_id: int) -> Optional[int]:
+        """Current id of a meeting that existed before the update (None if it was deleted)."""
+        if previous_id in self.removed:
+            return None
+        return self.renumbered.get(previous_id, previous_id)
+
+
 @dataclass
 class Registry:
     """
@@ -21,13 +43,22 @@ class Registry:
     students_of_meeting: Dict[int, List[str]] = field(default_factory=dict)      # meeting_id -> [student_nims]
     legal_classrooms_by_meeting: Dict[int, List[str]] = field(default_factory=dict)  # meeting_id -> [classroom_codes]
     meetings_of_course: Dict[str, List[int]] = field(default_factory=dict)       # course_code -> [meeting_ids]
+    oversized_meetings: List[int] = field(default_factory=list)                  # meetings larger than every classroom
+
+    # Pinned meetings: fixed day, hour and/or room (room pins also narrow legal_classrooms_by_meeting)
+    pins: Dict[int, MeetingPin] = field(default_factory=dict)                    # meeting_id -> pin
+    locked_meetings: Set[int] = field(default_factory=set)                       # fully pinned meetings (never move)
 
     def load_from_json(self, file_path: str) -> None:
-        """Load and parse input JSON file, then call generate_meetings() and build_indices()."""
+        """Load and parse input JSON file, then call generate_meetings(), build_indices() and apply its pins."""
         self.courses, self.classrooms, self.students = load_json(file_path)
         self.validate()
         self.generate_meetings()
         self.build_indices()
+        for code, index, day, hour, classroom in load_pins(file_path):
+            self.pin_course(code, index, day, hour, classroom)
+        if self.pins:
+            print(f"{len(self.pins)} meetings pinned ({len(self.locked_meetings)} locked).")
 
     def validate(self):
         """Validate data consistency between students and courses."""
@@ -41,18 +72,19 @@ class Registry:
                     raise ValueError(f"Student {student.nim} references unknown course {code}")
         print("Validation passed.")
 
-    def generate_meetings(self, randomize: Optional[bool] = False) -> None:
+    def generate_meetings(self, randomize: Optional[bool] = False, rng: Optional[random.Random] = None, verbose: bool = True) -> None:
         """
         Expand each course into ClassMeeting units (1 meeting per credit hour).
         Each course with N credits becomes N separate meetings that need scheduling.
-        Optional paramater 'randomize' to generate randomly ordered ClassMeeting units.
+        Optional paramater 'randomize' to generate randomly ordered ClassMeeting units,
+        shuffled with `rng` (default: the random module, e.g. RandomStreams.random).
+        verbose=False skips the summary line, e.g. for derived sub-registries.
         """
         meeting_id = 0
 
         if randomize:
-            import random
             course_codes = list(self.courses.keys())
-            random.shuffle(course_codes)
+            (rng if rng is not None else random).shuffle(course_codes)
         else:
             course_codes = sorted(self.courses.keys()) # deterministic order for reproducible results
         for code in course_codes: 
@@ -69,17 +101,20 @@ class Registry:
                 # Add to course-meeting lookup
                 self.meetings_of_course.setdefault(course.code, []).append(meeting_id)
                 meeting_id += 1
-        print(f"Generated {len(self.meetings)} meetings.")
+        if verbose:
+            print(f"Generated {len(self.meetings)} meetings.")
 
-    def build_indices(self) -> None:
+    def build_indices(self, verbose: bool = True) -> None:
         """
         Precompute relationships for faster conflict checking.
         Builds bidirectional mappings between students, meetings, and valid classrooms.
+        verbose=False skips the summary lines.
         """
         # Clear any existing indices
         self.meetings_of_student.clear()
         self.students_of_meeting.clear()
         self.legal_classrooms_by_meeting.clear()
+        self.oversized_meetings.clear()
 
         # 1. Build Student <-> Meeting bidirectional mapping
         for student in self.students.values():
@@ -95,16 +130,236 @@ class Registry:
                 self.students_of_meeting.setdefault(mid, []).append(student.nim)
 
         # 2. Build Meeting -> Legal Classrooms mapping
-        for mid, meeting in self.meetings.items():
-            # Find classrooms that can accommodate the meeting's student count
-            valid_classrooms = [
-                classroom.code
-                for classroom in self.classrooms.values()
-                if classroom.capacity >= meeting.student_count
-            ]
-            self.legal_classrooms_by_meeting[mid] = valid_classrooms
-
-        print("Lookup indices built.")
+        for mid in self.meetings:
+            self._derive_pin(mid)
+            self._index_classrooms(mid)
+
+        if verbose:
+            if self.oversized_meetings:
+                print(f"{len(self.oversized_meetings)} meetings exceed every classroom capacity.")
+            print("Lookup indices built.")
+
+    def _index_classrooms(self, mid: int) -> None:
+        # Find classrooms that can accommodate the meeting's student count
+        meeting = self.meetings[mid]
+        valid_classrooms = [
+            classroom.code
+            for classroom in self.classrooms.values()
+            if classroom.capacity >= meeting.student_count
+        ]
+        if mid in self.oversized_meetings:
+            self.oversized_meetings.remove(mid)
+        if not valid_classrooms:
+            # No room is big enough: allow the largest ones so the meeting stays movable,
+            # the overflow is scored by the room_over_capacity objective component
+            max_capacity = max((classroom.capacity for classroom in self.classrooms.values()), default=0)
+            valid_classrooms = [classroom.code for classroom in self.classrooms.values() if classroom.capacity == max_capacity]
+            self.oversized_meetings.append(mid)
+        pin = self.pins.get(mid)
+        if pin is not None and pin.classroom is not None:
+            valid_classrooms = [pin.classroom]
+        self.legal_classrooms_by_meeting[mid] = valid_classrooms
+
+    # ---------- Pinned meetings ----------
+    def _derive_pin(self, mid: int) -> None:
+        # A course code like X_R101 names its room: pin the room if it exists
+        code = self.meetings[mid].classroom_code
+        if code in self.classrooms and mid not in self.pins:
+            self.pins[mid] = MeetingPin(classroom=code)
+            self._sync_lock(mid)
+
+    def _sync_lock(self, mid: int) -> None:
+        pin = self.pins.get(mid)
+        if pin is not None and pin.locked:
+            self.locked_meetings.add(mid)
+        else:
+            self.locked_meetings.discard(mid)
+
+    def pin(self, mid: int, day: Optional[DAY] = None, hour: Optional[int] = None, classroom: Optional[str] = None) -> MeetingPin:
+        """
+        Fix part or all of a meeting's position, on top of any existing pin.
+        A meeting with day, hour and room fixed is locked: search algorithms never move it.
+
+        Returns:
+            The meeting's pin after the update
+
+        Raises:
+            ValueError: If the meeting or room is unknown, the hour is outside the schedule's
+                hours, or a locked meeting already holds the position
+        """
+        if mid not in self.meetings:
+            raise ValueError(f"Unknown meeting: {mid}")
+        if classroom is not None and classroom not in self.classrooms:
+            raise ValueError(f"Meeting {mid} pinned to unknown classroom {classroom}")
+        if hour is not None and hour not in HOURS:
+            raise ValueError(f"Meeting {mid} pinned to hour {hour}, outside the schedule's hours {HOURS[0]}-{HOURS[-1]}")
+        if day is not None and not isinstance(day, DAY):
+            raise TypeError(f"day must be a DAY enum, got {day}")
+        previous = self.pins.get(mid, MeetingPin())
+        pin = MeetingPin(day if day is not None else previous.day,
+                         hour if hour is not None else previous.hour,
+                         classroom if classroom is not None else previous.classroom)
+        if pin.locked:
+            for other in self.locked_meetings:
+                if other != mid and self.pins[other] == pin:
+                    raise ValueError(f"Meetings {other} and {mid} are locked to the same position")
+        self.pins[mid] = pin
+        self._sync_lock(mid)
+        self._index_classrooms(mid)
+        return pin
+
+    def pin_course(self, code: str, index: Optional[int] = None, day: Optional[DAY] = None,
+                   hour: Optional[int] = None, classroom: Optional[str] = None) -> None:
+        """Pin one meeting (0-based index within the course) or, if index is None, every meeting of a course."""
+        if code not in self.meetings_of_course:
+            raise ValueError(f"Pin references unknown course {code}")
+        mids = self.meetings_of_course[code]
+        if index is not None and not 0 <= index < len(mids):
+            raise ValueError(f"Course {code} has no meeting {index + 1}")
+        for mid in (mids if index is None else [mids[index]]):
+            self.pin(mid, day, hour, classroom)
+
+    def unpin(self, mid: int) -> None:
+        """Release a meeting's pin."""
+        self.pins.pop(mid, None)
+        self.locked_meetings.discard(mid)
+        self._index_classrooms(mid)
+
+    # ---------- Incremental updates ----------
+    def apply_changes(self, courses: Dict[str, Course], removed_courses: Iterable[str],
+                      students: Dict[str, Student], removed_students: Iterable[str]) -> RegistryUpdate:
+        """
+        Apply enrollment changes (see utils.input_parser.load_changes) to the registry and
+        its lookup indices in place, touching only the courses and students involved
+        instead of rebuilding every index.
+
+        Args:
+            courses: Courses to add or replace (credit changes add or delete meetings)
+            removed_courses: Codes of courses to delete (also dropped from students' lists)
+            students: Students to add or replace
+            removed_students: NIMs of students to delete
+
+        Returns:
+            RegistryUpdate describing the affected, deleted and renumbered meetings
+
+        Raises:
+            ValueError: If a student references an unknown course or priorities mismatch
+        """
+        update = RegistryUpdate()
+        removed_courses = set(removed_courses)
+        removed_students = list(removed_students)
+        # Validate everything first, so a rejected update leaves the registry unchanged
+        known_courses = (set(self.courses) - removed_courses) | set(courses)
+        for nim, student in students.items():
+            if len(student.course_list) != len(student.priority):
+                raise ValueError(f"Priority length mismatch for student {student.nim}")
+            for code in student.course_list:
+                if code not in known_courses:
+                    raise ValueError(f"Student {nim} references unknown course {code}")
+
+        # 1. Students leaving or being replaced
+        for nim in removed_students + [nim for nim in students if nim in self.students]:
+            for mid in self.meetings_of_student.pop(nim, []):
+                self.students_of_meeting[mid].remove(nim)
+                update.affected.add(mid)
+            self.students.pop(nim, None)
+
+        # 2. Courses deleted
+        for code in removed_courses:
+            for student in self.students.values():
+                if code in student.course_list:
+                    i = student.course_list.index(code)
+                    del student.course_list[i]
+                    del student.priority[i]
+            for mid in list(self.meetings_of_course.get(code, [])):
+                self._remove_meeting(mid, update)
+            self.courses.pop(code, None)
+            self.meetings_of_course.pop(code, None)
+
+        # 3. Courses added or changed
+        for code, course in courses.items():
+            previous = self.courses.get(code)
+            self.courses[code] = course
+            mids = self.meetings_of_course.setdefault(code, [])
+            while len(mids) > course.credits:
+                self._remove_meeting(mids[-1], update)
+            if previous is not None and previous.student_count != course.student_count:
+                for mid in mids:
+                    self.meetings[mid] = replace(self.meetings[mid], student_count=course.student_count)
+                    self._index_classrooms(mid)
+                    update.affected.add(mid)
+            enrolled = [nim for nim, student in self.students.items() if code in student.course_list]
+            while len(mids) < course.credits:
+                mid = len(self.meetings)
+                self.meetings[mid] = ClassMeeting(
+                    meeting_id=mid,
+                    course_code=code,
+                    classroom_code=code.split("_")[1] if "_" in code else None,
+                    duration_hours=1,
+                    student_count=course.student_count
+                )
+                mids.append(mid)
+                self.students_of_meeting[mid] = list(enrolled)
+                for nim in enrolled:
+                    self.meetings_of_student[nim].append(mid)
+                self._derive_pin(mid)
+                self._index_classrooms(mid)
+                update._origin[mid] = None
+                update.affected.add(mid)
+
+        # 4. Students added or replaced
+        for nim, student in students.items():
+            self.students[nim] = student
+            mids = [mid for code in student.course_list for mid in self.meetings_of_course.get(code, [])]
+            self.meetings_of_student[nim] = mids
+            for mid in mids:
+                self.students_of_meeting.setdefault(mid, []).append(nim)
+                update.affected.add(mid)
+
+        return update
+
+    def _remove_meeting(self, mid: int, update: RegistryUpdate) -> None:
+        """Delete a meeting, moving the last meeting into its id so ids stay contiguous."""
+        meeting = self.meetings.pop(mid)
+        for nim in self.students_of_meeting.pop(mid, []):
+            self.meetings_of_student[nim].remove(mid)
+        self.meetings_of_course[meeting.course_code].remove(mid)
+        self.legal_classrooms_by_meeting.pop(mid, None)
+        if mid in self.oversized_meetings:
+            self.oversized_meetings.remove(mid)
+        self.pins.pop(mid, None)
+        self.locked_meetings.discard(mid)
+        origin = update._origin.pop(mid, mid)
+        if origin is not None:
+            update.removed.add(origin)
+            update.renumbered.pop(origin, None)
+        update.affected.discard(mid)
+
+        last = len(self.meetings)
+        if mid == last:
+            return
+        moved = self.meetings.pop(last)
+        self.meetings[mid] = replace(moved, meeting_id=mid)
+        self.students_of_meeting[mid] = self.students_of_meeting.pop(last, [])
+        for nim in self.students_of_meeting[mid]:
+            mids = self.meetings_of_student[nim]
+            mids[mids.index(last)] = mid
+        mids = self.meetings_of_course[moved.course_code]
+        mids[mids.index(last)] = mid
+        self.legal_classrooms_by_meeting[mid] = self.legal_classrooms_by_meeting.pop(last)
+        if last in self.oversized_meetings:
+            self.oversized_meetings[self.oversized_meetings.index(last)] = mid
+        if last in self.pins:
+            self.pins[mid] = self.pins.pop(last)
+            self.locked_meetings.discard(last)
+            self._sync_lock(mid)
+        origin = update._origin.pop(last, last)
+        update._origin[mid] = origin
+        if origin is not None:
+            update.renumbered[origin] = mid
+        if last in update.affected:
+            update.affected.discard(last)
+            update.affected.add(mid)
 
     # Utility getters for safe data access
     def get_meeting(self, mid: int) -> ClassMeeting:
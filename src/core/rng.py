@@ -0,0 +1,61 @@
+import random
+from typing import List, Union
+import numpy as np
+
+
+class RandomStreams:
+    """
+    Independent random streams derived from one seed (numpy SeedSequence).
+
+    `random` (a random.Random) serves the schedule-level code, `numpy` (a Generator) the
+    encoded operators; spawn() hands every worker, restart or entrant its own child
+    streams, so parallel runs never share state and a seed reproduces the whole run.
+    """
+
+    def __init__(self, seed: Union[None, int, np.random.SeedSequence] = None):
+        """
+        Args:
+            seed: Integer seed or SeedSequence. None draws the entropy from the `random`
+                module, so seeding that module still seeds the run
+        """
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed if seed is not None else random.getrandbits(128))
+        python_seq, numpy_seq = self.seed_sequence.spawn(2)
+        self.random = random.Random(int.from_bytes(python_seq.generate_state(4, np.uint32).tobytes(), "little"))
+        self.numpy = np.random.default_rng(numpy_seq)
+
+    @property
+    def entropy(self) -> int:
+        """Root entropy; RandomStreams(entropy) repeats a run that was not explicitly seeded."""
+        return self.seed_sequence.entropy
+
+    def spawn(self, n: int) -> List['RandomStreams']:
+        """n independent child streams (different on every call)."""
+        return [RandomStreams(child) for child in self.seed_sequence.spawn(n)]
+
+    def spawn_seeds(self, n: int) -> List[int]:
+        """n independent 63-bit integer seeds, for consumers that only take an int."""
+        return [int(child.generate_state(2, np.uint64)[0] >> np.uint64(1)) for child in self.seed_sequence.spawn(n)]
+
+    def getstate(self) -> dict:
+        """Checkpointable state of both generators (spawned children are not included)."""
+        return {"random": self.random.getstate(), "numpy": self.numpy.bit_generator.state,
+                "children": self.seed_sequence.n_children_spawned}
+
+    def setstate(self, state: dict) -> None:
+        self.random.setstate(state["random"])
+        self.numpy.bit_generator.state = state["numpy"]
+        self.seed_sequence = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=self.seed_sequence.spawn_key,
+                                                    pool_size=self.seed_sequence.pool_size,
+                                                    n_children_spawned=state["children"])
+
+
+# Accepted by every `seed` argument
+Seed = Union[None, int, np.random.SeedSequence, RandomStreams]
+
+
+def as_streams(seed: Seed) -> RandomStreams:
+    """RandomStreams for a `seed` argument (an existing RandomStreams is used as is)."""
+    return seed if isinstance(seed, RandomStreams) else RandomStreams(seed)
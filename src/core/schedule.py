@@ -1,6 +1,6 @@
 from __future__ import annotations
-from typing import Dict, Optional, Tuple, List, TYPE_CHECKING
-from core.models import DAY
+from typing import Dict, Iterable, Optional, Tuple, List, TYPE_CHECKING
+from core.models import DAY, MeetingPin
 import random
 
 if TYPE_CHECKING:
@@ -252,6 +252,55 @@ class Schedule:
         """
         return [(mid, d, h, r) for mid, (d, h, r) in self.where_is.items()]
 
+    def pin_violations(self, registry: 'Registry') -> List[int]:
+        """
+        Get the meetings placed against their pin (see Registry.pin).
+
+        Returns:
+            List of meeting_ids whose day, hour or classroom differs from the pinned one
+        """
+        violations = []
+        for mid, pin in registry.pins.items():
+            pos = self.where_is.get(mid)
+            if pos is not None and (not pin.allows(pos[0], pos[1]) or pin.classroom not in (None, pos[2])):
+                violations.append(mid)
+        return violations
+
+    @staticmethod
+    def take_pinned_position(free_positions: List[Tuple[DAY, int, str]], meeting_id: int, pin: MeetingPin,
+                             legal_rooms: Optional[Iterable[str]] = None) -> Tuple[DAY, int, str]:
+        """
+        Remove and return the first free position matching a meeting's pin, preferring one
+        of its legal rooms.
+
+        Args:
+            free_positions: Free positions (consumed in order, so shuffle for a random choice)
+            meeting_id: Meeting being placed
+            pin: Its pin
+            legal_rooms: Preferred rooms (default: any room the pin allows)
+
+        Returns:
+            (day, hour, classroom)
+
+        Raises:
+            ValueError: If no free position matches the pin
+        """
+        matching = [i for i, (d, h, r) in enumerate(free_positions) if pin.allows(d, h) and pin.classroom in (None, r)]
+        if not matching:
+            raise ValueError(f"Meeting {meeting_id} cannot be placed at its pin {pin}: no free matching position")
+        if legal_rooms is not None:
+            legal_rooms = set(legal_rooms)
+            matching = [i for i in matching if free_positions[i][2] in legal_rooms] or matching
+        return free_positions.pop(matching[0])
+
+    @staticmethod
+    def pin_order(registry: 'Registry', meeting_ids: Iterable[int], free_positions: List[Tuple[DAY, int, str]]) -> List[int]:
+        """Pinned meetings sorted by how few free positions match their pin, so the tightest pins are placed first."""
+        def matches(mid: int) -> int:
+            pin = registry.pins[mid]
+            return sum(1 for d, h, r in free_positions if pin.allows(d, h) and pin.classroom in (None, r))
+        return sorted(meeting_ids, key=lambda mid: (matches(mid), mid))
+
     def print_schedule_table(self, registry: 'Registry') -> None:
         """
         Print a visual table representation of the schedule.
@@ -349,17 +398,22 @@ class Schedule:
         print()
         
     @staticmethod
-    def random_initial_assignment(registry: 'Registry') -> 'Schedule':
+    def random_initial_assignment(registry: 'Registry', rng: Optional[random.Random] = None) -> 'Schedule':
         """
         Generate a completely random initial schedule without constraint checking.
-        Places all meetings randomly into available positions.
+        Places all meetings randomly into available positions; locked meetings go to
+        their pinned position and partially pinned ones to a random position matching their pin.
         This can create invalid schedules with conflicts, useful for testing optimization algorithms.
         
         Args:
             registry: Registry containing meetings, classrooms, and constraints
+            rng: Random generator (default: the random module), e.g. RandomStreams.random
             
         Returns:
             Schedule with all meetings randomly placed (may be invalid)
+
+        Raises:
+            ValueError: If the free positions cannot satisfy a pin
         """
         # Define schedule dimensions
         days = list(DAY)
@@ -367,10 +421,18 @@ class Schedule:
         classroom_codes = list(registry.classrooms.keys())
         
         schedule = Schedule(days, hours, classroom_codes)
-        meetings = list(registry.meetings.keys())
+        for mid in sorted(registry.locked_meetings):
+            pin = registry.pins[mid]
+            schedule.place(mid, pin.day, pin.hour, pin.classroom)
         free_positions = schedule.all_free_positions()
-        random.shuffle(free_positions)
-        
+        (rng if rng is not None else random).shuffle(free_positions)
+
+        # Partially pinned meetings take the first matching free position, tightest pins first
+        partial = [mid for mid in registry.pins if mid not in registry.locked_meetings]
+        for mid in Schedule.pin_order(registry, partial, free_positions):
+            schedule.place(mid, *Schedule.take_pinned_position(free_positions, mid, registry.pins[mid]))
+
+        meetings = [mid for mid in registry.meetings.keys() if mid not in registry.pins]
         for mid, pos in zip(meetings, free_positions):
             d, h, r = pos
             schedule.place(mid, d, h, r)
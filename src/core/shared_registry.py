@@ -0,0 +1,254 @@
+from __future__ import annotations
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from functools import cached_property
+from multiprocessing import shared_memory
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+
+if TYPE_CHECKING:
+    from core.registry import Registry
+
+_ALIGN = 64     # Byte alignment of every array in the shared block
+
+
+class CSRIndex(Mapping):
+    """Read-only row -> list view of a CSR pair (row i holds values[ptr[i]:ptr[i + 1]])."""
+
+    def __init__(self, ptr: np.ndarray, values: np.ndarray):
+        self.ptr = ptr
+        self.values = values
+
+    def __getitem__(self, row: int) -> list:
+        if not 0 <= row < len(self.ptr) - 1:
+            raise KeyError(row)
+        return self.values[self.ptr[row]:self.ptr[row + 1]].tolist()
+
+    def __len__(self) -> int:
+        return len(self.ptr) - 1
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(len(self.ptr) - 1))
+
+
+class RoomExcessTable:
+    """table[meeting][room_code]: students beyond the room's capacity, computed on access."""
+
+    class _Row:
+        __slots__ = ("size", "capacity")
+
+        def __init__(self, size: int, capacity: Dict[str, int]):
+            self.size = size
+            self.capacity = capacity
+
+        def __getitem__(self, room: str) -> int:
+            return max(0, self.size - self.capacity[room])
+
+    def __init__(self, meeting_size: np.ndarray, capacity: Dict[str, int]):
+        self.meeting_size = meeting_size
+        self.capacity = capacity
+
+    def __getitem__(self, meeting_id: int) -> 'RoomExcessTable._Row':
+        return self._Row(int(self.meeting_size[meeting_id]), self.capacity)
+
+
+def _csr(rows: List[List[int]], dtype=np.int32) -> Tuple[np.ndarray, np.ndarray]:
+    ptr = np.zeros(len(rows) + 1, dtype=np.int64)
+    ptr[1:] = np.cumsum([len(row) for row in rows])
+    values = np.fromiter((v for row in rows for v in row), dtype=dtype, count=int(ptr[-1]))
+    return ptr, values
+
+
+@dataclass
+class RegistryArrays:
+    """
+    Integer indices of a Registry as flat numpy arrays, for sharing between processes.
+    Students, courses and classrooms are numbered by their position in the name lists
+    (courses and students in sorted order); one-to-many relations are CSR pairs.
+    """
+    course_codes: List[str]
+    student_nims: List[str]
+    classroom_codes: List[str]
+    meeting_course: np.ndarray              # int32 [meetings]: course index of every meeting
+    meeting_size: np.ndarray                # int32 [meetings]: enrolled students
+    room_capacity: np.ndarray               # int32 [rooms]
+    meeting_students_ptr: np.ndarray        # Incidence CSR: meeting -> student indices
+    meeting_students: np.ndarray
+    meeting_priority: np.ndarray            # int32, aligned with meeting_students: priority weight of the course for the student
+    student_meetings_ptr: np.ndarray        # Transposed incidence: student -> meeting ids
+    student_meetings: np.ndarray
+    course_meetings_ptr: np.ndarray         # meetings_of_course: course -> meeting ids
+    course_meetings: np.ndarray
+    legal_rooms: np.ndarray                 # bool [meetings, rooms]
+    course_graph_ptr: np.ndarray            # Conflict graph CSR: course -> adjacent courses (a student takes both)
+    course_graph: np.ndarray
+    course_graph_weight: np.ndarray         # int32, aligned with course_graph: students taking both
+
+    @classmethod
+    def from_registry(cls, registry: Registry, classroom_codes: Optional[List[str]] = None) -> RegistryArrays:
+        """
+        Args:
+            registry: Registry whose meeting ids are 0..n_meetings-1
+            classroom_codes: Room order of legal_rooms (default: registry order)
+        """
+        n_meetings = len(registry.meetings)
+        if sorted(registry.meetings) != list(range(n_meetings)):
+            raise ValueError("meeting ids must be contiguous from 0 to be shared")
+        course_codes = sorted(registry.courses)
+        student_nims = sorted(registry.students)
+        classroom_codes = list(classroom_codes) if classroom_codes is not None else list(registry.classrooms)
+        course_index = {code: i for i, code in enumerate(course_codes)}
+        student_index = {nim: i for i, nim in enumerate(student_nims)}
+        room_index = {code: i for i, code in enumerate(classroom_codes)}
+
+        meeting_students, meeting_priority = [], []
+        for mid in range(n_meetings):
+            course_code = registry.meetings[mid].course_code
+            nims = registry.students_of_meeting.get(mid, [])
+            meeting_students.append([student_index[nim] for nim in nims])
+            weights = []
+            for nim in nims:
+                student = registry.students[nim]
+                weights.append(max(student.priority) - student.priority[student.course_list.index(course_code)] + 1)
+            meeting_priority.append(weights)
+        meeting_students_ptr, meeting_students_flat = _csr(meeting_students)
+        _, meeting_priority_flat = _csr(meeting_priority)
+
+        legal_rooms = np.zeros((n_meetings, len(classroom_codes)), dtype=bool)
+        for mid in range(n_meetings):
+            for code in registry.legal_classrooms_by_meeting.get(mid, []):
+                if code in room_index:
+                    legal_rooms[mid, room_index[code]] = True
+
+        # Conflict graph: every pair of courses a student takes
+        edges: List[Dict[int, int]] = [{} for _ in course_codes]
+        for nim in student_nims:
+            courses = sorted({course_index[registry.meetings[mid].course_code]
+                              for mid in registry.meetings_of_student.get(nim, [])})
+            for i, a in enumerate(courses):
+                for b in courses[i + 1:]:
+                    edges[a][b] = edges[a].get(b, 0) + 1
+                    edges[b][a] = edges[b].get(a, 0) + 1
+        course_graph_ptr, course_graph = _csr([sorted(row) for row in edges])
+        _, course_graph_weight = _csr([[row[b] for b in sorted(row)] for row in edges])
+
+        student_ptr, student_flat = _csr([registry.meetings_of_student.get(nim, []) for nim in student_nims])
+        course_ptr, course_flat = _csr([registry.meetings_of_course.get(code, []) for code in course_codes])
+        return cls(
+            course_codes, student_nims, classroom_codes,
+            meeting_course=np.array([course_index[registry.meetings[mid].course_code] for mid in range(n_meetings)], dtype=np.int32),
+            meeting_size=np.array([registry.meetings[mid].student_count for mid in range(n_meetings)], dtype=np.int32),
+            room_capacity=np.array([registry.classrooms[code].capacity for code in classroom_codes], dtype=np.int32),
+            meeting_students_ptr=meeting_students_ptr, meeting_students=meeting_students_flat,
+            meeting_priority=meeting_priority_flat,
+            student_meetings_ptr=student_ptr, student_meetings=student_flat,
+            course_meetings_ptr=course_ptr, course_meetings=course_flat,
+            legal_rooms=legal_rooms,
+            course_graph_ptr=course_graph_ptr, course_graph=course_graph, course_graph_weight=course_graph_weight,
+        )
+
+    @classmethod
+    def array_fields(cls) -> Tuple[str, ...]:
+        return tuple(f.name for f in fields(cls) if f.name not in ("course_codes", "student_nims", "classroom_codes"))
+
+    @property
+    def n_meetings(self) -> int:
+        return len(self.meeting_course)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, name).nbytes for name in self.array_fields())
+
+    # Registry-style lookups keyed by index (what ConflictState reads from a Registry)
+    @cached_property
+    def students_of_meeting(self) -> CSRIndex:
+        return CSRIndex(self.meeting_students_ptr, self.meeting_students)
+
+    @cached_property
+    def meetings_of_student(self) -> CSRIndex:
+        return CSRIndex(self.student_meetings_ptr, self.student_meetings)
+
+    @cached_property
+    def meetings_of_course(self) -> CSRIndex:
+        return CSRIndex(self.course_meetings_ptr, self.course_meetings)
+
+    @cached_property
+    def priority_of_meeting(self) -> CSRIndex:
+        return CSRIndex(self.meeting_students_ptr, self.meeting_priority)
+
+    @cached_property
+    def room_excess(self) -> RoomExcessTable:
+        return RoomExcessTable(self.meeting_size, dict(zip(self.classroom_codes, self.room_capacity.tolist())))
+
+
+@dataclass(frozen=True)
+class SharedRegistryHandle:
+    """Picklable reference to a SharedRegistry: the block name, array layout and name lists."""
+    name: str
+    layout: Tuple[Tuple[str, int, str, Tuple[int, ...]], ...]      # (field, offset, dtype, shape)
+    course_codes: Tuple[str, ...]
+    student_nims: Tuple[str, ...]
+    classroom_codes: Tuple[str, ...]
+
+
+class SharedRegistry:
+    """
+    RegistryArrays (plus any extra arrays, e.g. encoding masks) copied once into a single
+    shared-memory block. Pass `handle` to worker processes and call attach() there: the
+    arrays are read-only views of the block, so workers copy nothing and memory per worker
+    does not grow with the instance. The creating process owns the block: close() (or
+    leaving the `with` block) unlinks it.
+    """
+
+    def __init__(self, arrays: RegistryArrays, extra: Optional[Dict[str, np.ndarray]] = None):
+        named = [(name, np.ascontiguousarray(getattr(arrays, name))) for name in arrays.array_fields()]
+        named += [(f"extra.{name}", np.ascontiguousarray(array)) for name, array in (extra or {}).items()]
+        layout, offset = [], 0
+        for name, array in named:
+            layout.append((name, offset, array.dtype.str, array.shape))
+            offset += -(-array.nbytes // _ALIGN) * _ALIGN
+        self.shm = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        for (name, array), (_, start, _, _) in zip(named, layout):
+            np.ndarray(array.shape, array.dtype, buffer=self.shm.buf, offset=start)[...] = array
+        self.handle = SharedRegistryHandle(self.shm.name, tuple(layout), tuple(arrays.course_codes),
+                                           tuple(arrays.student_nims), tuple(arrays.classroom_codes))
+
+    @classmethod
+    def from_registry(cls, registry: Registry, classroom_codes: Optional[List[str]] = None,
+                      extra: Optional[Dict[str, np.ndarray]] = None) -> SharedRegistry:
+        return cls(RegistryArrays.from_registry(registry, classroom_codes), extra)
+
+    def close(self) -> None:
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self) -> SharedRegistry:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Blocks attached by this process, kept open for as long as their views may be used
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+
+
+def attach(handle: SharedRegistryHandle) -> Tuple[RegistryArrays, Dict[str, np.ndarray]]:
+    """
+    Zero-copy view of a SharedRegistry from any process.
+
+    Returns:
+        (read-only RegistryArrays, read-only extra arrays by name)
+    """
+    shm = _attached.get(handle.name)
+    if shm is None:
+        shm = _attached[handle.name] = shared_memory.SharedMemory(name=handle.name)
+    views: Dict[str, np.ndarray] = {}
+    for name, offset, dtype, shape in handle.layout:
+        view = np.ndarray(shape, np.dtype(dtype), buffer=shm.buf, offset=offset)
+        view.flags.writeable = False
+        views[name] = view
+    extra = {name[len("extra."):]: view for name, view in views.items() if name.startswith("extra.")}
+    arrays = RegistryArrays(list(handle.course_codes), list(handle.student_nims), list(handle.classroom_codes),
+                            **{name: views[name] for name in RegistryArrays.array_fields()})
+    return arrays, extra
@@ -3,14 +3,29 @@ import matplotlib.pyplot as plt
 import numpy as np
 from core.registry import Registry
 from core.schedule import Schedule
-from core.objective import ScheduleObjective
+from core.objective import ScheduleObjective, ObjectiveWeights
 from core.models import DAY
+from core.bounds import conflict_lower_bound, objective_lower_bound
+from core.rng import RandomStreams
 from algorithm.hill_climbing_steepest_ascent import SteepestAscentHillClimbing
 from algorithm.hill_climbing_stochastic import StochasticHillClimbing
 from algorithm.stimulated_annealing import SimulatedAnnealing
 from algorithm.hill_climbing_sideways import HillClimbingSidewaysMove
 from algorithm.hill_climbing_random_restart import RandomRestartHillClimbing
 from algorithm.genetic_algorithm import Genetic_Algorithm
+from algorithm.history import HistoryRecorder, HISTORY_STRATEGIES, save_histories
+from algorithm.profiling import HotPathProfiler
+from algorithm.telemetry import SearchTelemetry
+from algorithm.portfolio import PortfolioSolver, DEFAULT_PORTFOLIO
+from algorithm.tuning import Tuner, TUNABLE, save_tuned, tuned_solver_config
+from algorithm.reoptimize import carry_over
+from algorithm.decomposition import DecompositionSolver
+from algorithm.exact import ExactSolver, ORTOOLS_AVAILABLE, use_exact
+from utils.schedule_export import EXPORT_FORMATS, export_schedule, load_json_export
+from utils.input_parser import load_changes
+
+TUNED_CONFIGS_PATH = "data/tuned_configs.json"
+TUNING_CACHE_PATH = "data/output/tuning_cache.json"
 
 def main():
     print("="*60)
@@ -45,7 +60,11 @@ def main():
         3: ("Simulated Annealing", SimulatedAnnealing),
         4: ("Hill Climbing with Sideways Move", HillClimbingSidewaysMove),
         5: ("Random Restart Hill Climbing", RandomRestartHillClimbing),
-        6: ("Genetic Algorithm", Genetic_Algorithm)
+        6: ("Genetic Algorithm", Genetic_Algorithm),
+        7: ("Portfolio (race algorithms)", PortfolioSolver),
+        8: ("Tune hyperparameters", Tuner),
+        9: ("Decomposition (large instances)", DecompositionSolver),
+        10: ("Auto (exact solver for small instances)", ExactSolver)
     }
 
     print("\nAvailable Algorithms:")
@@ -54,11 +73,11 @@ def main():
 
     while True:
         try:
-            choice = int(input("\nSelect algorithm (1-6): "))
+            choice = int(input("\nSelect algorithm (1-10): "))
             if choice in algorithms:
                 break
             else:
-                print("Invalid choice. Please select 1-6.")
+                print("Invalid choice. Please select 1-10.")
         except ValueError:
             print("Please enter a number.")
 
@@ -68,36 +87,142 @@ def main():
     print("ALGORITHM PARAMETERS")
     print("-"*60)
 
+    if choice == 7:
+        run_portfolio(reg)
+        return
+    if choice == 8:
+        run_tuning(reg)
+        return
+    if choice == 9:
+        run_decomposition(reg)
+        return
+    if choice == 10:
+        if use_exact(reg):
+            run_exact(reg)
+            return
+        print(f"{'Instance too large for' if ORTOOLS_AVAILABLE else 'OR-Tools is not installed, no'} exact solver: "
+              f"using Simulated Annealing.")
+        choice = 3
+        algorithm_name, algorithm_class = algorithms[choice]
+
     # Initialize algorithm with user-defined parameters
-    objective = ScheduleObjective(reg)
+    # Stopping limits shared by every algorithm
+    time_budget = input("Time budget in seconds (default: None): ").strip()
+    time_budget = float(time_budget) if time_budget else None
+
+    max_evaluations = input("Max objective evaluations (default: None): ").strip()
+    max_evaluations = int(max_evaluations) if max_evaluations else None
+
+    # History recording: bounded by default so long runs keep constant memory
+    history_size = input("History size (default: 2000, 0 = keep everything): ").strip()
+    history_size = int(history_size) if history_size else 2000
+    history_size = history_size if history_size > 0 else None
+
+    history_strategy = input(f"History strategy {list(HISTORY_STRATEGIES)} (default: every_nth): ").strip()
+    history_strategy = history_strategy if history_strategy else "every_nth"
+
+    # Every random choice of the run derives from this seed, so a run can be repeated exactly
+    seed = input("Random seed (default: None (random)): ").strip()
+    streams = RandomStreams(int(seed) if seed else None)
+    print(f"Random seed: {streams.entropy}")
+
+    # Soft constraints weighted on top of the student conflict count (0 = ignored)
+    weights = ObjectiveWeights.for_registry(reg)
+    if input("Enable soft constraints (priority, room capacity, daily load)? [y/N]: ").strip().lower() == "y":
+        for name, prompt in (("priority_conflicts", "Priority-weighted conflict weight"),
+                             ("room_over_capacity", "Room over-capacity weight"),
+                             ("daily_overload", "Daily overload weight"),
+                             ("daily_gaps", "Daily gap weight")):
+            value = input(f"{prompt} (default: {getattr(weights, name)}): ").strip()
+            setattr(weights, name, float(value) if value else getattr(weights, name))
+        if weights.daily_overload:
+            max_daily = input(f"Max daily hours per student (default: {weights.max_daily_hours}): ").strip()
+            weights.max_daily_hours = int(max_daily) if max_daily else weights.max_daily_hours
+    if reg.oversized_meetings:
+        scored = (f"the room over-capacity weight {weights.room_over_capacity} scores the overflow" if weights.room_over_capacity
+                  else "the overflow is not scored; set a room over-capacity weight to penalize it")
+        print(f"Note: {len(reg.oversized_meetings)} meetings fit no classroom; they use the largest rooms and {scored}.")
+    objective = ScheduleObjective(reg, weights)
+    conflict_bound = conflict_lower_bound(reg)
+    lower_bound = objective_lower_bound(reg, weights, conflict_bound)
+    if lower_bound > 0:
+        print(f"Note: at least {lower_bound} is unavoidable (conflict bound {conflict_bound.value}"
+              f"{', clique of ' + str(len(conflict_bound.clique_courses)) + ' courses' if conflict_bound.clique else ''}); "
+              f"searches stop once they reach it.")
+
+    common_kwargs = {"time_budget": time_budget, "max_evaluations": max_evaluations,
+                     "history_size": history_size, "history_strategy": history_strategy,
+                     "objective_weights": weights, "seed": streams}
+
+    # Outputs: machine-readable exports, plots are optional (300-dpi rendering dominates short runs)
+    export_formats = input(f"Export formats, comma separated {list(EXPORT_FORMATS)} (default: json): ").strip()
+    export_formats = [f.strip() for f in export_formats.split(",") if f.strip()] if export_formats else ["json"]
+    render_plots = input("Render plots? [Y/n]: ").strip().lower() != "n"
+
+    # Hot-path instrumentation (off by default: nothing is patched unless enabled)
+    if input("Profile hot paths? [y/N]: ").strip().lower() == "y":
+        common_kwargs["profile"] = HotPathProfiler(algorithm_class.__name__, track_allocations=True)
+
+    # Search analytics: move outcomes and conflict distributions per iteration, saved as columns
+    if input("Record search telemetry? [y/N]: ").strip().lower() == "y":
+        every = input("Iterations per telemetry row (default: 1): ").strip()
+        common_kwargs["telemetry"] = SearchTelemetry(every=int(every) if every else 1)
+
+    # Checkpointing for the long-running algorithms (SA, Random Restart, GA)
+    if choice in (3, 5, 6):
+        checkpoint_path = input("Checkpoint file (default: None): ").strip()
+        if checkpoint_path:
+            resume = input("Resume from checkpoint if present? (y/N): ").strip().lower() == "y"
+            common_kwargs.update({"checkpoint_path": checkpoint_path, "resume": resume})
+
+    # Warm start from a previous JSON export, re-optimizing only what an enrollment change touched
+    if choice in (1, 2, 3, 4):
+        warm_start = input("Warm-start from schedule export (default: None): ").strip()
+        if warm_start:
+            previous = load_json_export(warm_start)
+            changes = input("Enrollment changes file (default: None): ").strip()
+            update = reg.apply_changes(*load_changes(changes)) if changes else None
+            objective = ScheduleObjective(reg, weights)
+            start, placed = carry_over(previous, reg, update, rng=streams.random)
+            movable = placed | update.affected if update is not None else None
+            print(f"Warm start: {len(start.where_is)} meetings carried over, "
+                  f"{'all' if movable is None else len(movable)} movable")
+            common_kwargs.update({"initial_schedule": start, "movable_meetings": movable})
 
     if choice == 1:  # Steepest Ascent
         max_iter = input("Max iterations (default: None): ").strip()
         max_iter = int(max_iter) if max_iter else None
         print(f"Running with max_iterations={max_iter}")
-        hc = algorithm_class(reg, max_iterations=max_iter)
+        hc = algorithm_class(reg, max_iterations=max_iter, **common_kwargs)
         
     elif choice == 2:  # Stochastic
         max_iter = input("Max iterations (default: None): ").strip()
         max_iter = int(max_iter) if max_iter else None
         print(f"Running with max_iterations={max_iter}")
-        hc = algorithm_class(reg, max_iterations=max_iter)
+        hc = algorithm_class(reg, max_iterations=max_iter, **common_kwargs)
         
     elif choice == 3:  # Simulated Annealing
-        initial_temp = input("Initial temperature (default: 1000): ").strip()
-        initial_temp = float(initial_temp) if initial_temp else 1000
+        initial_temp = input("Initial temperature (default: auto-calibrate): ").strip()
+        initial_temp = float(initial_temp) if initial_temp else None
+        
+        cooling_schedule = input("Cooling schedule [geometric/linear/logarithmic/lundy_mees/adaptive] (default: geometric): ").strip()
+        cooling_schedule = cooling_schedule if cooling_schedule else "geometric"
         
         cooling_rate = input("Cooling rate (default: 0.95): ").strip()
         cooling_rate = float(cooling_rate) if cooling_rate else 0.95
         
+        reheat_after = input("Reheat after N stuck events (default: None): ").strip()
+        reheat_after = int(reheat_after) if reheat_after else None
+        
         max_iter = input("Max iterations (default: None): ").strip()
         max_iter = int(max_iter) if max_iter else None
 
         random_func = input("Probability threshold value (default: None (Random)): ").strip()
         random_func = float(random_func) if random_func else None
 
-        print(f"Running with initial_temp={initial_temp}, cooling_rate={cooling_rate}, max_iterations={max_iter}")
-        hc = algorithm_class(reg, initial_temp=initial_temp, cooling_rate=cooling_rate, max_iterations=max_iter, random_func=random_func)
+        print(f"Running with initial_temp={initial_temp}, cooling_schedule={cooling_schedule}, cooling_rate={cooling_rate}, reheat_after={reheat_after}, max_iterations={max_iter}")
+        hc = algorithm_class(reg, initial_temp=initial_temp, cooling_rate=cooling_rate, max_iterations=max_iter, random_func=random_func,
+                             cooling_schedule=cooling_schedule, reheat_after=reheat_after, **common_kwargs)
         
     elif choice == 4:  # Sideways
         max_consec = input("Max consecutive sideways moves (default: 5): ").strip()
@@ -110,7 +235,7 @@ def main():
         max_iter = int(max_iter) if max_iter else None
         
         print(f"Running with max_consecutive={max_consec}, max_total={max_total}, max_iterations={max_iter}")
-        hc = algorithm_class(reg, max_consecutive_sideways=max_consec, max_total_sideways=max_total, max_iterations=max_iter)
+        hc = algorithm_class(reg, max_consecutive_sideways=max_consec, max_total_sideways=max_total, max_iterations=max_iter, **common_kwargs)
         
     elif choice == 5:  # Random Restart
         max_restarts = input("Max restarts (default: 10): ").strip()
@@ -120,7 +245,7 @@ def main():
         max_iter_per_restart = int(max_iter_per_restart) if max_iter_per_restart else None
         
         print(f"Running with max_restarts={max_restarts}, max_iterations_per_restart={max_iter_per_restart}")
-        hc = algorithm_class(reg, max_restarts=max_restarts, max_iterations_per_restart=max_iter_per_restart)
+        hc = algorithm_class(reg, max_restarts=max_restarts, max_iterations_per_restart=max_iter_per_restart, **common_kwargs)
         
     elif choice == 6:  # Genetic Algorithm
         pop_size = input("Population size (default: 50): ").strip()
@@ -132,8 +257,29 @@ def main():
         mut_rate = input("Mutation rate (default: 0.15): ").strip()
         mut_rate = float(mut_rate) if mut_rate else 0.15
         
-        print(f"Running with population_size={pop_size}, max_generations={max_iter}, mutation_rate={mut_rate}")
-        hc = algorithm_class(reg, population_size=pop_size, max_iteration=max_iter)
+        crossover_type = input("Crossover [one_point/uniform/course_block] (default: one_point): ").strip()
+        crossover_type = crossover_type if crossover_type else "one_point"
+        
+        ls_steps = input("Local search steps per child (default: 0 = off): ").strip()
+        ls_steps = int(ls_steps) if ls_steps else 0
+        
+        ls_workers = 1
+        if ls_steps > 0:
+            ls_workers = input("Local search worker processes (default: 1): ").strip()
+            ls_workers = int(ls_workers) if ls_workers else 1
+        
+        selection = input("Selection [tournament/rank/roulette] (default: tournament): ").strip()
+        selection = selection if selection else "tournament"
+        
+        replacement = input("Replacement [generational/elitist/steady_state] (default: elitist): ").strip()
+        replacement = replacement if replacement else "elitist"
+        
+        dedup = input("Reject duplicate individuals? [y/N]: ").strip().lower() == "y"
+        
+        print(f"Running with population_size={pop_size}, max_generations={max_iter}, mutation_rate={mut_rate}, crossover={crossover_type}, "
+              f"local_search_steps={ls_steps}, selection={selection}, replacement={replacement}, dedup={dedup}")
+        hc = algorithm_class(reg, population_size=pop_size, max_iteration=max_iter, crossover_type=crossover_type,
+                             local_search_steps=ls_steps, local_search_workers=ls_workers, replacement=replacement, dedup=dedup, selection=selection, **common_kwargs)
 
 
 
@@ -148,14 +294,16 @@ def main():
         # Display initial state
         print("\nInitial Schedule Table:")
         initial_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
         
         # Display final state
         print("\nFinal Schedule Table:")
         best_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
         print(f"\nFinal Objective Value: {best_score}")
-        print(f"\nPlot Score: {history}")
+        print(f"\nScore History: {describe_history(history)}")
         print(f"\nSearch Duration: {duration:.4f} seconds")
         print(f"\nTotal Iterations: {total_iterations}")
 
@@ -165,17 +313,20 @@ def main():
         # Display initial state
         print("\nInitial Schedule Table:")
         initial_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
         
         # Display final state
         print("\nFinal Schedule Table:")
         best_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
         print(f"\nFinal Objective Value: {best_score}")
-        print(f"\nPlot Score: {history}")
-        print(f"\nPlot Acceptance: {acceptance_history}")
+        print(f"\nScore History: {describe_history(history)}")
+        print(f"\nAcceptance History: {describe_history(acceptance_history)}")
         print(f"\nSearch Duration: {duration:.4f} seconds")
         print(f"Stuck Frequency: {stuck_count}")
+        print(f"Reheats: {hc.reheat_count}")
 
     elif choice == 4:  # Sideways
         initial_schedule, best_schedule, best_score, history, duration, total_iterations = hc.run()
@@ -183,14 +334,16 @@ def main():
         # Display initial state
         print("\nInitial Schedule Table:")
         initial_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
         
         # Display final state
         print("\nFinal Schedule Table:")
         best_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
         print(f"\nFinal Objective Value: {best_score}")
-        print(f"\nPlot Score: {history}")
+        print(f"\nScore History: {describe_history(history)}")
         print(f"\nSearch Duration: {duration:.4f} seconds")
         print(f"\nTotal Iterations: {total_iterations}")
 
@@ -200,14 +353,16 @@ def main():
         # Display initial state
         print("\nInitial Schedule Table:")
         initial_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
         
         # Display final state
         print("\nFinal Schedule Table:")
         best_schedule.print_schedule_table(reg)
-        plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Schedule', reg)
         print(f"\nFinal Objective Value: {best_score}")
-        print(f"\nPlot Score: {history}")
+        print(f"\nScore History: {describe_history(history)}")
         print(f"\nSearch Duration: {duration:.4f} seconds")
         print(f"\nTotal Restarts: {total_restarts}")
         print(f"\nIterations per Restart: {iterations_list}")
@@ -218,18 +373,62 @@ def main():
         # Display initial state
         print("\nInitial Best Schedule:")
         initial_schedule.display(reg)
-        plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
+        if render_plots:
+            plot_schedule_visualization(initial_schedule, f'{algorithm_name} - Initial Schedule', reg)
         
         # Display final state
         print("\nFinal Best Schedule:")
         best_schedule.display(reg)
-        plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Best', reg)
+        if render_plots:
+            plot_schedule_visualization(best_schedule, f'{algorithm_name} - Final Best', reg)
         
         print(f"\nFinal Objective Value: {best_score}")
         print(f"\nGenerations Run: {generations_run}")
-        print(f"\nSearch Duration: {duration:.4f} seconds")
-        print(f"\nConvergence History: {history[:10]}...")  # Show first 10
-
+        if hc.dedup:
+            print(f"\nDuplicates Rejected: {hc.duplicates_rejected}")
+        print(f"\nSearch Duration: {duration:.4f} seconds ({hc.generations_per_second:.2f} generations/s)")
+        print(f"\nConvergence History: {describe_history(history)}")
+
+
+    print("\nObjective Breakdown:")
+    for name, value in objective.get_detailed_breakdown(best_schedule).items():
+        print(f"  {name}: {value}")
+
+    if hc.profiler is not None:
+        print("\n" + hc.profiler.report().format())
+        flame_path = f'data/output/{algorithm_name.lower().replace(" ", "_")}_profile.folded'
+        hc.profiler.write_collapsed(flame_path)
+        print(f"Collapsed stacks (flamegraph input) saved to: {flame_path}")
+
+    if hc.telemetry is not None:
+        print("\n" + hc.telemetry.format())
+        telemetry_path = f'data/output/{algorithm_name.lower().replace(" ", "_")}_telemetry.npz'
+        hc.telemetry.save(telemetry_path)
+        print(f"Telemetry columns saved to: {telemetry_path}")
+
+    if hc.budget.stop_reason:
+        print(f"\nStopped early: {hc.budget.stop_reason} (best-so-far returned)")
+
+    # Save histories in compact binary form instead of dumping them to stdout
+    if choice == 5:
+        series = {f"restart_{i+1}": hist for i, hist in enumerate(history)}
+    elif choice == 3:
+        series = {"score": history, "acceptance": acceptance_history}
+    else:
+        series = {"score": history}
+    history_path = f'data/output/{algorithm_name.lower().replace(" ", "_")}_history.bin'
+    save_histories(history_path, series)
+    print(f"History saved to: {history_path}")
+
+    slug = algorithm_name.lower().replace(" ", "_")
+    for path in export_schedule(f'data/output/{slug}_schedule', best_schedule, reg, export_formats):
+        print(f"Schedule exported to: {path}")
+
+    if not render_plots:
+        print("\n" + "="*60)
+        print("OPTIMIZATION COMPLETED")
+        print("="*60)
+        return
 
     # Create plot
     print("\n" + "="*60)
@@ -242,10 +441,10 @@ def main():
         # Plot each restart as a separate line
         for i, hist in enumerate(history):
             if hist:  # Ensure hist is not empty
-                plt.plot(range(len(hist)), hist, 'o-', linewidth=2, markersize=4, label=f'Restart {i+1}')
+                plt.plot(history_x(hist), hist, 'o-', linewidth=2, markersize=4, label=f'Restart {i+1}')
     else:
         plot_history = history
-        plt.plot(range(len(plot_history)), plot_history, 'b-o', linewidth=2, markersize=4, label='Objective Function')
+        plt.plot(history_x(plot_history), plot_history, 'b-o', linewidth=2, markersize=4, label='Objective Function')
 
     plt.xlabel('Iteration' if choice != 6 else 'Generation', fontsize=12)
     plt.ylabel('Objective Function Value (Conflicts)', fontsize=12)
@@ -261,7 +460,7 @@ def main():
                 plt.annotate(f'Start R{i+1}: {hist[0]}', xy=(0, hist[0]), xytext=(10 + i*50, 10 + i*10),
                             textcoords='offset points', bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
                             arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
-                plt.annotate(f'End R{i+1}: {hist[-1]}', xy=(len(hist)-1, hist[-1]), xytext=(10 + i*50, -30 - i*10),
+                plt.annotate(f'End R{i+1}: {hist[-1]}', xy=(history_x(hist)[-1], hist[-1]), xytext=(10 + i*50, -30 - i*10),
                             textcoords='offset points', bbox=dict(boxstyle='round,pad=0.5', fc='lightblue', alpha=0.7),
                             arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
     else:
@@ -269,7 +468,7 @@ def main():
             plt.annotate(f'Start: {plot_history[0]}', xy=(0, plot_history[0]), xytext=(10, 10),
                         textcoords='offset points', bbox=dict(boxstyle='round,pad=0.5', fc='yellow', alpha=0.7),
                         arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
-            plt.annotate(f'End: {plot_history[-1]}', xy=(len(plot_history)-1, plot_history[-1]), xytext=(10, -30),
+            plt.annotate(f'End: {plot_history[-1]}', xy=(history_x(plot_history)[-1], plot_history[-1]), xytext=(10, -30),
                         textcoords='offset points', bbox=dict(boxstyle='round,pad=0.5', fc='lightblue', alpha=0.7),
                         arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0'))
 
@@ -294,7 +493,7 @@ def main():
     # Additional plot for Simulated Annealing
     if choice == 3:
         plt.figure(figsize=(10, 6))
-        plt.plot(range(len(acceptance_history)), acceptance_history, 'r-o', linewidth=2, markersize=4, label='Acceptance Probability')
+        plt.plot(history_x(acceptance_history), acceptance_history, 'r-o', linewidth=2, markersize=4, label='Acceptance Probability')
 
         plt.xlabel('Iteration', fontsize=12)
         plt.ylabel('Acceptance Probability', fontsize=12)
@@ -311,6 +510,126 @@ def main():
     print("OPTIMIZATION COMPLETED")
     print("="*60)
 
+def run_portfolio(reg):
+    """Race the default portfolio under one time budget and show the winner."""
+    time_budget = input("Total time budget in seconds (default: 60): ").strip()
+    time_budget = float(time_budget) if time_budget else 60.0
+
+    workers = input("Worker processes (default: auto): ").strip()
+    workers = int(workers) if workers else None
+
+    # Entrants tuned for this dataset (option 8) join the default portfolio
+    configs = list(DEFAULT_PORTFOLIO)
+    for name in TUNABLE:
+        tuned = tuned_solver_config(TUNED_CONFIGS_PATH, reg, name)
+        if tuned is not None:
+            configs.append(tuned)
+
+    solver = PortfolioSolver(reg, time_budget, configs=configs, workers=workers)
+    print(f"\nRacing {len(solver.configs)} configurations on {solver.workers} workers over {solver.n_rounds} rounds...")
+    result = solver.run()
+
+    for i, standings in enumerate(result.rounds):
+        print(f"Round {i+1}: " + ", ".join(f"{name}={score}" for name, score in sorted(standings.items(), key=lambda item: item[1])))
+    if result.best_schedule is None:
+        print("\nNo configuration produced a schedule.")
+        return
+    print("\nFinal Best Schedule:")
+    result.best_schedule.display(reg)
+    plot_schedule_visualization(result.best_schedule, f'Portfolio - Final Best ({result.best_config})', reg)
+    for path in export_schedule('data/output/portfolio_schedule', result.best_schedule, reg):
+        print(f"Schedule exported to: {path}")
+    print(f"\nWinner: {result.best_config}")
+    print(f"Final Objective Value: {result.best_score}")
+    print(f"Search Duration: {result.duration:.4f} seconds")
+
+def run_exact(reg):
+    """Solve a small instance with the CP-SAT backend and show the result."""
+    time_limit = input("Time limit in seconds (default: 10): ").strip()
+    time_limit = float(time_limit) if time_limit else 10.0
+
+    solver = ExactSolver(reg, time_budget=time_limit)
+    print(f"\nSolving exactly with {solver.workers} CP-SAT workers...")
+    _, best_schedule, best_score, history, duration, optimal = solver.run()
+    if best_schedule is None:
+        print(f"\nNo schedule found ({solver.status}).")
+        return
+    print("\nFinal Best Schedule:")
+    best_schedule.display(reg)
+    plot_schedule_visualization(best_schedule, 'Exact - Final Best', reg)
+    for path in export_schedule('data/output/exact_schedule', best_schedule, reg):
+        print(f"Schedule exported to: {path}")
+    print(f"\nFinal Objective Value: {best_score} ({'proven optimal' if optimal else solver.status.lower()})")
+    print(f"Improving solutions: {history}")
+    print(f"Search Duration: {duration:.4f} seconds")
+
+def run_decomposition(reg):
+    """Solve conflict-graph clusters in parallel, merge and repair, then show the result."""
+    time_budget = input("Total time budget in seconds (default: 60): ").strip()
+    time_budget = float(time_budget) if time_budget else 60.0
+
+    n_clusters = input("Clusters (default: auto): ").strip()
+    n_clusters = int(n_clusters) if n_clusters else None
+
+    workers = input("Worker processes (default: auto): ").strip()
+    workers = int(workers) if workers else None
+
+    solver = DecompositionSolver(reg, time_budget, n_clusters=n_clusters, workers=workers)
+    print(f"\nSolving {solver.n_clusters} clusters on {solver.workers} workers...")
+    result = solver.run()
+
+    for i, (courses, score) in enumerate(zip(result.clusters, result.cluster_scores), 1):
+        meetings = sum(len(reg.meetings_of_course[code]) for code in courses)
+        print(f"Cluster {i}: {len(courses)} courses, {meetings} meetings, score {score}")
+    print(f"Shared students between clusters: {result.cut_weight}")
+    print(f"Merged score {result.merged_score}, {result.repaired_meetings} boundary meetings movable in repair")
+    print("\nFinal Best Schedule:")
+    result.best_schedule.display(reg)
+    plot_schedule_visualization(result.best_schedule, 'Decomposition - Final Best', reg)
+    for path in export_schedule('data/output/decomposition_schedule', result.best_schedule, reg):
+        print(f"Schedule exported to: {path}")
+    print(f"\nFinal Objective Value: {result.best_score}")
+    print(f"Search Duration: {result.duration:.4f} seconds")
+
+def run_tuning(reg):
+    """Race hyperparameter candidates for one algorithm and store the winner for this dataset."""
+    names = list(TUNABLE)
+    for i, name in enumerate(names, 1):
+        print(f"{i}. {name}")
+    index = input(f"Algorithm to tune (1-{len(names)}, default: 1): ").strip()
+    algorithm = names[int(index) - 1] if index else names[0]
+
+    trial_time = input("Seconds per trial (default: 5): ").strip()
+    trial_time = float(trial_time) if trial_time else 5.0
+
+    n_candidates = input("Candidate parameter sets (default: 16): ").strip()
+    n_candidates = int(n_candidates) if n_candidates else 16
+
+    tuner = Tuner(reg, algorithm, trial_time=trial_time, n_candidates=n_candidates, cache_path=TUNING_CACHE_PATH)
+    print(f"\nTuning {algorithm} on {tuner.workers} workers...")
+    result = tuner.run()
+
+    for params, mean, repeats in result.standings[:5]:
+        print(f"  mean {mean:.2f} over {repeats} runs: {params}")
+    save_tuned(TUNED_CONFIGS_PATH, reg, algorithm, result.best_params, result.mean_score)
+    print(f"\nBest parameters: {result.best_params} (mean score {result.mean_score:.2f}, {result.trials_run} new trials)")
+    print(f"Saved to: {TUNED_CONFIGS_PATH}")
+
+def history_x(history):
+    """X values (iteration numbers) for plotting a history list or HistoryRecorder."""
+    if isinstance(history, HistoryRecorder):
+        return history.iterations()
+    return list(range(len(history)))
+
+def describe_history(history) -> str:
+    """Short one-line summary of a history instead of printing it whole."""
+    if not len(history):
+        return "empty"
+    if isinstance(history[0], (list, HistoryRecorder)):
+        return f"{len(history)} series, final values {[h[-1] for h in history if len(h)]}"
+    values = list(history)
+    return f"{len(values)} points, start {values[0]}, end {values[-1]}, min {min(values)}"
+
 def plot_schedule_visualization(schedule, title, registry, save_path=None):
     """
     Create a matplotlib table visualization showing course codes per time slot.
@@ -0,0 +1,494 @@
+"""
+Local scheduling service: keeps registries warm and runs solve jobs in a process pool.
+
+    python src/server.py [--host 127.0.0.1] [--port 8765] [--unix PATH] [--workers N]
+
+Endpoints (JSON bodies and responses unless noted):
+    GET    /health
+    POST   /datasets                    Dataset in the input format, or {"path": ...} -> {"hash", counts}
+    GET    /datasets
+    POST   /jobs                        {"dataset": hash, "algorithm", "params", "run_params",
+                                         "objective_weights", "seed", "formats"} -> 202 {"id"}
+    GET    /jobs
+    GET    /jobs/<id>                   Status and result
+    GET    /jobs/<id>/events            Progress events as newline-delimited JSON until the job ends
+    GET    /jobs/<id>/exports/<file>    Export file of a finished job
+    DELETE /jobs/<id>                   Cancel
+"""
+import argparse
+import asyncio
+import collections
+import hashlib
+import inspect
+import json
+import math
+import multiprocessing
+import numbers
+import os
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from core.registry import Registry
+from core.objective import ObjectiveWeights
+from algorithm.budget import CancellationToken
+from algorithm.hill_climbing_steepest_ascent import SteepestAscentHillClimbing
+from algorithm.hill_climbing_stochastic import StochasticHillClimbing
+from algorithm.stimulated_annealing import SimulatedAnnealing
+from algorithm.hill_climbing_sideways import HillClimbingSidewaysMove
+from algorithm.hill_climbing_random_restart import RandomRestartHillClimbing
+from algorithm.genetic_algorithm import Genetic_Algorithm
+from algorithm.exact import ExactSolver, auto_config
+from utils.schedule_export import EXPORT_FORMATS, export_schedule
+
+SERVICE_DIR = "data/output/service"
+DATASET_KEYS = {"kelas_mata_kuliah", "ruangan", "mahasiswa"}    # Top-level keys of the input format
+
+# Algorithms a job may name; "auto" picks the exact backend for small instances (see algorithm.exact)
+ALGORITHMS: Dict[str, Optional[type]] = {
+    "SteepestAscentHillClimbing": SteepestAscentHillClimbing,
+    "StochasticHillClimbing": StochasticHillClimbing,
+    "SimulatedAnnealing": SimulatedAnnealing,
+    "HillClimbingSidewaysMove": HillClimbingSidewaysMove,
+    "RandomRestartHillClimbing": RandomRestartHillClimbing,
+    "Genetic_Algorithm": Genetic_Algorithm,
+    "ExactSolver": ExactSolver,
+    "auto": None,
+}
+
+DEFAULT_PROGRESS_EVERY = 1000       # Iterations between progress events (each one is an IPC round trip)
+EVENT_BUFFER = 1000                 # Events kept per job for late subscribers
+MAX_BODY = 64 * 1024 * 1024         # Largest accepted request body
+WORKER_REGISTRIES = 4               # Registries kept warm in every worker process
+
+_CONTENT_TYPES = {".json": "application/json", ".csv": "text/csv", ".bin": "application/octet-stream"}
+_REASONS = {200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _json_object(data: bytes) -> Dict[str, Any]:
+    """Parse a request body that must be a JSON object."""
+    value = json.loads(data)
+    if not isinstance(value, dict):
+        raise HTTPError(400, "Request body must be a JSON object")
+    return value
+
+
+def _finite(value: Any) -> Any:
+    # Infinity and NaN are not valid JSON: send them as null
+    if isinstance(value, dict):
+        return {key: _finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_finite(item) for item in value]
+    if isinstance(value, numbers.Real) and not isinstance(value, numbers.Integral):
+        return float(value) if math.isfinite(value) else None
+    return value
+
+
+def _dumps(payload: Any) -> bytes:
+    return json.dumps(_finite(payload), default=float, allow_nan=False).encode()
+
+
+def _algorithm_class(name: str, registry: Registry, weights: ObjectiveWeights) -> type:
+    if name == "auto":
+        return auto_config(registry, weights).algorithm
+    return ALGORITHMS[name]
+
+
+# ---------- Worker side ----------
+_registries: "collections.OrderedDict[str, Registry]" = collections.OrderedDict()
+
+
+def _worker_registry(digest: str, path: str) -> Registry:
+    # Registries stay warm per worker, keyed by dataset hash, so repeated jobs skip parsing and indexing
+    registry = _registries.pop(digest, None)
+    if registry is None:
+        registry = Registry()
+        registry.load_from_json(path)
+    _registries[digest] = registry
+    while len(_registries) > WORKER_REGISTRIES:
+        _registries.popitem(last=False)
+    return registry
+
+
+def _solve(job_id: str, digest: str, path: str, spec: Dict[str, Any], output_prefix: str,
+           events: Any, cancel_event: Any) -> Dict[str, Any]:
+    if cancel_event.is_set():
+        return {"best_score": None, "duration": 0.0, "exports": [], "stop_reason": "cancelled"}
+    registry = _worker_registry(digest, path)
+    events.put((job_id, "started", None))
+    weights = ObjectiveWeights.for_registry(registry, **spec.get("objective_weights", {}))
+    algorithm = _algorithm_class(spec["algorithm"], registry, weights)
+    accepted = inspect.signature(algorithm.__init__).parameters
+    params = dict(spec.get("params", {}), objective_weights=weights)
+    if "seed" in spec:
+        params["seed"] = spec["seed"]
+    if "cancel_token" in accepted:
+        params["cancel_token"] = CancellationToken(cancel_event)
+    if "on_progress" in accepted:
+        params.setdefault("progress_every", DEFAULT_PROGRESS_EVERY)
+        params["on_progress"] = lambda event: events.put((job_id, "progress", asdict(event)))
+    params = {name: value for name, value in params.items() if name in accepted}
+
+    start = time.monotonic()
+    solver = algorithm(registry, **params)
+    result = solver.run(**spec.get("run_params", {}))
+    duration = time.monotonic() - start
+    best, best_score = result[1], result[2]
+    exports: List[str] = []
+    if best is not None:
+        os.makedirs(os.path.dirname(output_prefix), exist_ok=True)
+        exports = [os.path.basename(p) for p in export_schedule(output_prefix, best, registry, spec.get("formats", ["json"]))]
+    budget = getattr(solver, "budget", None)
+    return {"algorithm": algorithm.__name__, "best_score": float(best_score) if best is not None else None, "duration": duration, "exports": exports,
+            "stop_reason": budget.stop_reason if budget is not None else getattr(solver, "status", None)}
+
+
+# ---------- Service ----------
+@dataclass
+class Job:
+    """One solve request and everything the service knows about it."""
+    id: str
+    dataset: str
+    spec: Dict[str, Any]
+    cancel_event: Any
+    status: str = "queued"                                      # queued, running, done, failed, cancelled
+    created: float = field(default_factory=time.time)
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    events: Deque[Dict[str, Any]] = field(default_factory=lambda: collections.deque(maxlen=EVENT_BUFFER))
+    subscribers: List[asyncio.Queue] = field(default_factory=list)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    def describe(self) -> Dict[str, Any]:
+        return {"id": self.id, "dataset": self.dataset, "algorithm": self.spec["algorithm"], "status": self.status,
+                "created": self.created, "started": self.started, "finished": self.finished,
+                "result": self.result, "error": self.error}
+
+
+class SchedulingService:
+    """
+    Runs solve jobs on a bounded process pool and serves them over a small HTTP API.
+
+    Datasets are stored once under their SHA-256 hash; the service and every worker keep
+    the parsed Registry in memory, so a job costs only its solve time once its worker has
+    seen the dataset. Workers report progress through a manager queue that a pump thread
+    forwards to the event loop, in order, followed by the job's outcome.
+    """
+
+    def __init__(self, workers: Optional[int] = None, service_dir: str = SERVICE_DIR, registry_cache_size: int = 8):
+        """
+        Args:
+            workers: Solver processes (default: os.cpu_count())
+            service_dir: Stored datasets and job exports go below this directory
+            registry_cache_size: Registries kept warm in the service process
+        """
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.dataset_dir = os.path.join(service_dir, "datasets")
+        self.job_dir = os.path.join(service_dir, "jobs")
+        self.registry_cache_size = registry_cache_size
+        self.registries: "collections.OrderedDict[str, Registry]" = collections.OrderedDict()
+        self.jobs: Dict[str, Job] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # The service runs an event loop and a pump thread, which must not be forked
+        self._context = multiprocessing.get_context("spawn")
+        self._manager = None
+        self._events = None
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pump: Optional[threading.Thread] = None
+
+    # ----- Lifecycle -----
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start the pool and listen on TCP (or on a Unix socket if unix_path is given)."""
+        os.makedirs(self.dataset_dir, exist_ok=True)
+        os.makedirs(self.job_dir, exist_ok=True)
+        self.loop = asyncio.get_running_loop()
+        self._manager = self._context.Manager()
+        self._events = self._manager.Queue()
+        self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=self._context)
+        self._pump = threading.Thread(target=self._pump_events, daemon=True)
+        self._pump.start()
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self._handle, path=unix_path)
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def close(self) -> None:
+        for job in self.jobs.values():
+            if not job.done:
+                job.cancel_event.set()
+        if self._pool is not None:
+            await self.loop.run_in_executor(None, self._pool.shutdown)
+        if self._events is not None:
+            self._events.put(None)
+            self._pump.join()
+            self._manager.shutdown()
+
+    # ----- Datasets -----
+    def _dataset_path(self, digest: str) -> str:
+        return os.path.join(self.dataset_dir, f"{digest}.json")
+
+    async def add_dataset(self, data: bytes) -> Dict[str, Any]:
+        """Store a dataset under its hash and load it (a no-op for a known dataset)."""
+        missing = DATASET_KEYS - set(_json_object(data))
+        if missing:
+            raise HTTPError(400, f"Dataset misses {sorted(missing)}")
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._dataset_path(digest)
+        if not os.path.exists(path):
+            with open(path, "wb") as file:
+                file.write(data)
+        try:
+            registry = await self.registry(digest)
+        except Exception as error:
+            os.remove(path)
+            raise HTTPError(400, f"Invalid dataset: {error}")
+        return self._describe_dataset(digest, registry)
+
+    async def registry(self, digest: str) -> Registry:
+        """The warm Registry of a stored dataset, loading it off the event loop when needed."""
+        registry = self.registries.pop(digest, None)
+        if registry is None:
+            path = self._dataset_path(digest)
+            if not os.path.exists(path):
+                raise HTTPError(404, f"Unknown dataset {digest}")
+            registry = Registry()
+            await self.loop.run_in_executor(None, registry.load_from_json, path)
+        self.registries[digest] = registry
+        while len(self.registries) > self.registry_cache_size:
+            self.registries.popitem(last=False)
+        return registry
+
+    @staticmethod
+    def _describe_dataset(digest: str, registry: Registry) -> Dict[str, Any]:
+        return {"hash": digest, "courses": len(registry.courses), "classrooms": len(registry.classrooms),
+                "students": len(registry.students), "meetings": len(registry.meetings)}
+
+    # ----- Jobs -----
+    async def submit(self, spec: Dict[str, Any]) -> Job:
+        """Validate a job request and queue it on the pool."""
+        digest = spec.get("dataset")
+        if not isinstance(digest, str):
+            raise HTTPError(400, "dataset (hash from POST /datasets) is required")
+        registry = await self.registry(digest)
+        spec = dict(spec, algorithm=spec.get("algorithm", "auto"))
+        if spec["algorithm"] not in ALGORITHMS:
+            raise HTTPError(400, f"Unknown algorithm {spec['algorithm']}, expected one of {sorted(ALGORITHMS)}")
+        unknown = set(spec.get("formats", ["json"])) - set(EXPORT_FORMATS)
+        if unknown:
+            raise HTTPError(400, f"Unknown export formats {sorted(unknown)}")
+        try:
+            weights = ObjectiveWeights.for_registry(registry, **spec.get("objective_weights", {}))
+            algorithm = _algorithm_class(spec["algorithm"], registry, weights)
+            inspect.signature(algorithm.__init__).bind(None, registry, **spec.get("params", {}))
+        except TypeError as error:
+            raise HTTPError(400, f"Invalid parameters: {error}")
+
+        job = Job(uuid.uuid4().hex[:12], digest, spec, self._manager.Event())
+        self.jobs[job.id] = job
+        self.loop.create_task(self._run(job))
+        return job
+
+    async def _run(self, job: Job) -> None:
+        prefix = os.path.join(self.job_dir, job.id, "schedule")
+        try:
+            result = await self.loop.run_in_executor(
+                self._pool, _solve, job.id, job.dataset, self._dataset_path(job.dataset), job.spec, prefix,
+                self._events, job.cancel_event)
+            outcome = ("done", result)
+        except Exception as error:
+            outcome = ("failed", f"{type(error).__name__}: {error}")
+        # Through the same queue, so the outcome follows every progress event of the job
+        await self.loop.run_in_executor(None, self._events.put, (job.id, *outcome))
+
+    def cancel(self, job: Job) -> None:
+        if not job.done:
+            job.cancel_event.set()
+
+    def _pump_events(self) -> None:
+        while True:
+            message = self._events.get()
+            if message is None:
+                return
+            self.loop.call_soon_threadsafe(self._dispatch, message)
+
+    def _dispatch(self, message: Tuple[str, str, Any]) -> None:
+        job_id, kind, payload = message
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        if kind == "started":
+            job.status, job.started = "running", time.time()
+            event = {"type": "started"}
+        elif kind == "progress":
+            event = dict(payload, type="progress")
+        else:
+            job.finished = time.time()
+            if kind == "done":
+                job.status = "cancelled" if job.cancel_event.is_set() else "done"
+                job.result = payload
+            else:
+                job.status, job.error = "failed", payload
+            event = dict(job.describe(), type=job.status)
+        job.events.append(event)
+        for queue in job.subscribers:
+            queue.put_nowait(event)
+
+    # ----- HTTP -----
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            method, target, _ = (await reader.readline()).decode("latin-1").split(" ", 2)
+            headers: Dict[str, str] = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            if length > MAX_BODY:
+                raise HTTPError(413, f"Body larger than {MAX_BODY} bytes")
+            body = await reader.readexactly(length)
+            await self._route(method, urlsplit(target).path.rstrip("/") or "/", body, writer)
+        except HTTPError as error:
+            await self._send_json(writer, error.status, {"error": error.message})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except (ValueError, OSError) as error:
+            await self._send_json(writer, 400, {"error": f"Malformed request: {error}"})
+        except Exception as error:
+            traceback.print_exc()
+            try:
+                await self._send_json(writer, 500, {"error": f"Internal error: {error}"})
+            except Exception:
+                pass    # The connection is gone, or the response had already started
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        parts = path.strip("/").split("/")
+        if path == "/health":
+            await self._send_json(writer, 200, {"status": "ok", "workers": self.workers, "jobs": len(self.jobs)})
+        elif parts == ["datasets"] and method == "POST":
+            request = _json_object(body)
+            if set(request) == {"path"}:
+                with open(request["path"], "rb") as file:
+                    body = file.read()
+            await self._send_json(writer, 200, await self.add_dataset(body))
+        elif parts == ["datasets"] and method == "GET":
+            await self._send_json(writer, 200, [self._describe_dataset(digest, registry) for digest, registry in self.registries.items()])
+        elif parts == ["jobs"] and method == "POST":
+            job = await self.submit(_json_object(body))
+            await self._send_json(writer, 202, {"id": job.id, "status": job.status})
+        elif parts == ["jobs"] and method == "GET":
+            await self._send_json(writer, 200, [job.describe() for job in self.jobs.values()])
+        elif len(parts) >= 2 and parts[0] == "jobs":
+            job = self.jobs.get(parts[1])
+            if job is None:
+                raise HTTPError(404, f"Unknown job {parts[1]}")
+            if len(parts) == 2 and method == "GET":
+                await self._send_json(writer, 200, job.describe())
+            elif len(parts) == 2 and method == "DELETE":
+                self.cancel(job)
+                await self._send_json(writer, 202, {"id": job.id, "status": job.status})
+            elif parts[2:] == ["events"] and method == "GET":
+                await self._stream_events(job, writer)
+            elif len(parts) == 4 and parts[2] == "exports" and method == "GET":
+                await self._send_export(job, parts[3], writer)
+            else:
+                raise HTTPError(405 if len(parts) <= 4 else 404, f"{method} {path} is not supported")
+        else:
+            raise HTTPError(404, f"{method} {path} is not supported")
+
+    async def _stream_events(self, job: Job, writer: asyncio.StreamWriter) -> None:
+        # Replay the buffer, then follow live events; subscribing before the first await keeps them gapless
+        queue: asyncio.Queue = asyncio.Queue()
+        backlog = list(job.events)
+        finished = job.done
+        if not finished:
+            job.subscribers.append(queue)
+        try:
+            await self._send_head(writer, 200, "application/x-ndjson", chunked=True)
+            for event in backlog:
+                await self._send_chunk(writer, event)
+            while not finished:
+                event = await queue.get()
+                await self._send_chunk(writer, event)
+                finished = event["type"] in ("done", "failed", "cancelled")
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            if queue in job.subscribers:
+                job.subscribers.remove(queue)
+
+    async def _send_export(self, job: Job, name: str, writer: asyncio.StreamWriter) -> None:
+        if job.result is None or name not in job.result["exports"]:
+            raise HTTPError(404 if job.done else 409, f"No export {name} for job {job.id}")
+        with open(os.path.join(self.job_dir, job.id, name), "rb") as file:
+            data = file.read()
+        await self._send_head(writer, 200, _CONTENT_TYPES.get(os.path.splitext(name)[1], "application/octet-stream"), len(data))
+        writer.write(data)
+        await writer.drain()
+
+    @staticmethod
+    async def _send_head(writer: asyncio.StreamWriter, status: int, content_type: str,
+                         length: Optional[int] = None, chunked: bool = False) -> None:
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}", f"Content-Type: {content_type}", "Connection: close"]
+        head.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {length}")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1"))
+        await writer.drain()
+
+    @staticmethod
+    async def _send_chunk(writer: asyncio.StreamWriter, event: Dict[str, Any]) -> None:
+        data = _dumps(event) + b"\n"
+        writer.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        await writer.drain()
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Any) -> None:
+        data = _dumps(payload)
+        await self._send_head(writer, status, "application/json", len(data))
+        writer.write(data)
+        await writer.drain()
+
+
+async def serve(host: str, port: int, unix_path: Optional[str], workers: Optional[int]) -> None:
+    service = SchedulingService(workers)
+    server = await service.start(host, port, unix_path)
+    print(f"Scheduling service on {unix_path or f'http://{host}:{port}'} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local scheduling service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, help="Solver processes (default: CPU count)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
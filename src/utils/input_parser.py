@@ -1,6 +1,6 @@
 import json
 import os
-from core.models import Classroom, Course, Student
+from core.models import Classroom, Course, Student, DAY
 
 def load_json(file_path: str):
     """
@@ -66,4 +66,61 @@ def load_json(file_path: str):
         return None, None, None
     except KeyError as e:
         print(f"Error: Missing required key in JSON: {e}")
-        return None, None, None
\ No newline at end of file
+        return None, None, None
+
+
+def load_changes(file_path: str):
+    """
+    Parse an enrollment change file for incremental re-optimization.
+    Entries of "kelas_mata_kuliah" and "mahasiswa" use the input format and are added
+    or replace the existing ones; "hapus_kelas_mata_kuliah" and "hapus_mahasiswa" list
+    course codes and NIMs to remove. Every key is optional.
+
+    Args:
+        file_path: Path to the JSON change file
+
+    Returns:
+        tuple: (courses_dict, removed_course_codes, students_dict, removed_nims)
+    """
+    with open(file_path, 'r') as file:
+        data_json = json.load(file)
+
+    courses = {}
+    for course in data_json.get("kelas_mata_kuliah", []):
+        code = course["kode"]
+        courses[code] = Course(code, course["jumlah_mahasiswa"], course["sks"])
+
+    students = {}
+    for student in data_json.get("mahasiswa", []):
+        nim = student["nim"]
+        students[nim] = Student(nim, student["daftar_mk"], student["prioritas"])
+
+    removed_courses = list(data_json.get("hapus_kelas_mata_kuliah", []))
+    removed_students = list(data_json.get("hapus_mahasiswa", []))
+    print(f"Loaded changes from {os.path.basename(file_path)}: "
+          f"{len(courses)} courses, {len(students)} students updated, "
+          f"{len(removed_courses)} courses, {len(removed_students)} students removed")
+    return courses, removed_courses, students, removed_students
+
+def load_pins(file_path: str):
+    """
+    Parse the optional "jadwal_tetap" (fixed schedule) entries of an input file.
+    Each entry names a course ("kode") and any of "hari" (day name, e.g. "Monday"),
+    "jam" (start hour) and "ruangan" (room code); "pertemuan" (1-based meeting
+    number) restricts the pin to one meeting, otherwise it applies to all of them.
+
+    Args:
+        file_path: Path to the JSON input file
+
+    Returns:
+        list: (course_code, meeting_index or None, DAY or None, hour or None, room or None) tuples
+    """
+    with open(file_path, 'r') as file:
+        data_json = json.load(file)
+
+    pins = []
+    for entry in data_json.get("jadwal_tetap", []):
+        index = entry.get("pertemuan")
+        day = DAY(entry["hari"]) if "hari" in entry else None
+        pins.append((entry["kode"], index - 1 if index is not None else None, day, entry.get("jam"), entry.get("ruangan")))
+    return pins
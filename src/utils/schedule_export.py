@@ -0,0 +1,236 @@
+import csv
+import json
+import struct
+from array import array
+from typing import Dict, List, Sequence, Tuple, TYPE_CHECKING
+from core.models import DAY
+from core.schedule import Schedule
+
+if TYPE_CHECKING:
+    from core.registry import Registry
+
+EXPORT_FORMATS = ("json", "csv", "bin")
+
+_MAGIC = b"SCHD"
+_VERSION = 1
+_DAYS = list(DAY)
+
+# One exported placement: (meeting_id, course_code, day, hour, room_code)
+Placement = Tuple[int, str, DAY, int, str]
+
+
+def collect(schedule: Schedule, registry: 'Registry') -> Tuple[List[Placement], Dict[str, List[Placement]], Dict[str, List[Placement]]]:
+    """
+    Gather placements, per-room calendars and per-student timetables.
+    One pass over schedule.where_is builds the placements and room calendars; student
+    timetables look their meetings up through registry.meetings_of_student.
+    Everything is ordered by (day, hour).
+
+    Returns:
+        (placements, room calendars by room code, student timetables by NIM)
+    """
+    day_order = {day: i for i, day in enumerate(_DAYS)}
+    meetings = registry.meetings
+    where_is = schedule.where_is
+
+    placements: List[Placement] = []
+    rooms: Dict[str, List[Placement]] = {code: [] for code in schedule.classroom_codes}
+    for mid, (day, hour, room) in where_is.items():
+        placement = (mid, meetings[mid].course_code, day, hour, room)
+        placements.append(placement)
+        rooms[room].append(placement)
+
+    def key(placement: Placement) -> Tuple[int, int, str]:
+        return day_order[placement[2]], placement[3], placement[4]
+
+    placements.sort(key=key)
+    for calendar in rooms.values():
+        calendar.sort(key=key)
+
+    students: Dict[str, List[Placement]] = {}
+    for nim, mids in registry.meetings_of_student.items():
+        timetable = []
+        for mid in mids:
+            position = where_is.get(mid)
+            if position is not None:
+                day, hour, room = position
+                timetable.append((mid, meetings[mid].course_code, day, hour, room))
+        timetable.sort(key=key)
+        students[nim] = timetable
+    return placements, rooms, students
+
+
+# ---------- JSON ----------
+def export_json(file_path: str, schedule: Schedule, registry: 'Registry') -> None:
+    """
+    Write the schedule as JSON: placements, room calendars and student timetables.
+    Entries are written one by one, so no second copy of the document is built in memory.
+    """
+    placements, rooms, students = collect(schedule, registry)
+
+    def entry(placement: Placement) -> str:
+        mid, course, day, hour, room = placement
+        return json.dumps({"meeting_id": mid, "course": course, "day": day.value, "hour": hour, "room": room})
+
+    def write_calendars(file, calendars: Dict[str, List[Placement]]) -> None:
+        for i, (owner, calendar) in enumerate(calendars.items()):
+            file.write(",\n  " if i else "\n  ")
+            file.write(f"{json.dumps(owner)}: [" + ", ".join(entry(p) for p in calendar) + "]")
+        file.write("\n }")
+
+    with open(file_path, "w") as file:
+        file.write(f'{{"version": {_VERSION},\n')
+        file.write(f' "days": {json.dumps([day.value for day in _DAYS if day in schedule._day_set])},\n')
+        file.write(f' "hours": {json.dumps(sorted(schedule.hours))},\n')
+        file.write(f' "rooms": {json.dumps(schedule.classroom_codes)},\n')
+        file.write(' "meetings": [')
+        file.write(",".join("\n  " + entry(p) for p in placements))
+        file.write('\n ],\n "room_calendars": {')
+        write_calendars(file, rooms)
+        file.write(',\n "student_timetables": {')
+        write_calendars(file, students)
+        file.write("\n}\n")
+
+
+def load_json_export(file_path: str) -> Schedule:
+    """Rebuild a Schedule from an export_json() file."""
+    with open(file_path) as file:
+        data = json.load(file)
+    schedule = Schedule([DAY(day) for day in data["days"]], data["hours"], data["rooms"])
+    for placement in data["meetings"]:
+        schedule.place(placement["meeting_id"], DAY(placement["day"]), placement["hour"], placement["room"])
+    return schedule
+
+
+# ---------- CSV ----------
+def export_csv(file_prefix: str, schedule: Schedule, registry: 'Registry') -> List[str]:
+    """
+    Write three CSV files: <prefix>_meetings.csv, <prefix>_rooms.csv and <prefix>_students.csv.
+
+    Returns:
+        Paths of the written files
+    """
+    placements, rooms, students = collect(schedule, registry)
+    header = ["meeting_id", "course", "day", "hour", "room"]
+    paths = []
+    for suffix, owner_column, groups in (("meetings", None, {None: placements}),
+                                         ("rooms", "room_code", rooms),
+                                         ("students", "nim", students)):
+        path = f"{file_prefix}_{suffix}.csv"
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(([owner_column] if owner_column else []) + header)
+            for owner, group in groups.items():
+                prefix = [owner] if owner_column else []
+                writer.writerows(prefix + [mid, course, day.value, hour, room] for mid, course, day, hour, room in group)
+        paths.append(path)
+    return paths
+
+
+# ---------- Binary ----------
+def _write_strings(file, strings: Sequence[str]) -> None:
+    file.write(struct.pack("<I", len(strings)))
+    for s in strings:
+        encoded = s.encode("utf-8")
+        file.write(struct.pack("<H", len(encoded)) + encoded)
+
+
+def _read_strings(data: bytes, offset: int) -> Tuple[List[str], int]:
+    (count,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    strings = []
+    for _ in range(count):
+        (length,) = struct.unpack_from("<H", data, offset)
+        offset += 2
+        strings.append(data[offset:offset + length].decode("utf-8"))
+        offset += length
+    return strings, offset
+
+
+def save_binary(file_path: str, schedule: Schedule, registry: 'Registry') -> None:
+    """
+    Write the placements in a compact binary file.
+    Layout: magic, version, string tables (day names, room codes, course codes), the
+    hours as int32, then one int32 record (meeting_id, course, day, hour, room) per
+    placed meeting, the last three as indices into the tables.
+    """
+    days = [day for day in _DAYS if day in schedule._day_set]
+    day_index = {day: i for i, day in enumerate(days)}
+    room_index = {code: i for i, code in enumerate(schedule.classroom_codes)}
+    course_index: Dict[str, int] = {}
+    records = array("i")
+    for mid, (day, hour, room) in schedule.where_is.items():
+        course = registry.meetings[mid].course_code
+        records.extend((mid, course_index.setdefault(course, len(course_index)), day_index[day], hour, room_index[room]))
+
+    with open(file_path, "wb") as file:
+        file.write(_MAGIC + struct.pack("<B", _VERSION))
+        _write_strings(file, [day.name for day in days])
+        _write_strings(file, schedule.classroom_codes)
+        _write_strings(file, list(course_index))
+        hours = sorted(schedule.hours)
+        file.write(struct.pack("<I", len(hours)) + array("i", hours).tobytes())
+        file.write(struct.pack("<I", len(records) // 5) + records.tobytes())
+
+
+def load_binary(file_path: str) -> Tuple[Schedule, Dict[int, str]]:
+    """
+    Read a file written by save_binary().
+
+    Returns:
+        (rebuilt Schedule, course code of every placed meeting)
+    """
+    with open(file_path, "rb") as file:
+        data = file.read()
+    if data[:4] != _MAGIC:
+        raise ValueError(f"{file_path} is not a schedule file")
+    (version,) = struct.unpack_from("<B", data, 4)
+    if version != _VERSION:
+        raise ValueError(f"Unsupported schedule file version: {version}")
+
+    day_names, offset = _read_strings(data, 5)
+    rooms, offset = _read_strings(data, offset)
+    courses, offset = _read_strings(data, offset)
+    (n_hours,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    hours = array("i", data[offset:offset + 4 * n_hours]).tolist()
+    offset += 4 * n_hours
+    (n_records,) = struct.unpack_from("<I", data, offset)
+    offset += 4
+    records = array("i", data[offset:offset + 20 * n_records])
+
+    days = [DAY[name] for name in day_names]
+    schedule = Schedule(days, hours, rooms)
+    course_of_meeting = {}
+    for k in range(0, len(records), 5):
+        mid, course, day, hour, room = records[k:k + 5]
+        schedule.place(mid, days[day], hour, rooms[room])
+        course_of_meeting[mid] = courses[course]
+    return schedule, course_of_meeting
+
+
+def export_schedule(file_prefix: str, schedule: Schedule, registry: 'Registry',
+                    formats: Sequence[str] = EXPORT_FORMATS) -> List[str]:
+    """
+    Write the schedule in every requested format.
+
+    Args:
+        file_prefix: Output path without extension
+        formats: Subset of EXPORT_FORMATS
+
+    Returns:
+        Paths of the written files
+    """
+    unknown = set(formats) - set(EXPORT_FORMATS)
+    if unknown:
+        raise ValueError(f"Unknown export formats: {sorted(unknown)}")
+    paths = []
+    if "json" in formats:
+        export_json(f"{file_prefix}.json", schedule, registry)
+        paths.append(f"{file_prefix}.json")
+    if "csv" in formats:
+        paths.extend(export_csv(file_prefix, schedule, registry))
+    if "bin" in formats:
+        save_binary(f"{file_prefix}.bin", schedule, registry)
+        paths.append(f"{file_prefix}.bin")
+    return paths